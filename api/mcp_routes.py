@@ -4,8 +4,10 @@ Handles WebSocket and REST endpoints for MCP client functionality
 """
 import asyncio
 import json
+import uuid
 import logging
-from flask import Blueprint, request, jsonify, session
+import threading
+from flask import Blueprint, request, jsonify, session, current_app
 from flask_socketio import emit, join_room, leave_room
 from datetime import datetime
 import sys
@@ -15,32 +17,62 @@ from pathlib import Path
 sys.path.append(str(Path(__file__).parent.parent))
 
 from utils.mcp_client import MCPClientManager
-from utils.strands_mcp_agent import StrandsMCPAgent
+from utils.async_runner import get_loop_runner
+from utils.config_repository import get_config_repository
+from utils.startup_profiler import startup_phase
+from utils.stream_coalescer import TextDeltaCoalescer
+from utils.prometheus_metrics import get_app_metrics
+from utils.event_bus import bridge_to_socketio
 
 logger = logging.getLogger(__name__)
 
-# Singleton pattern for managers
+# Singleton pattern for managers, built on first use
 _mcp_manager = None
 _strands_agent = None
+_init_lock = threading.RLock()
+_socketio = None  # Set by register_socketio_handlers; manager events are forwarded to its mcp_client room
+_bridged: set = set()
+
+def _bridge_events(source, name: str):
+    """Forward a manager's event bus to the mcp_client Socket.IO room, once"""
+    if _socketio is None or source is None or id(source) in _bridged:
+        return
+    _bridged.add(id(source))
+    bridge_to_socketio(source.event_bus, _socketio, room='mcp_client', source=name)
 
 def get_mcp_manager():
     """Get or create MCP manager singleton"""
     global _mcp_manager
     if _mcp_manager is None:
-        _mcp_manager = MCPClientManager()
+        with _init_lock:
+            if _mcp_manager is None:
+                with startup_phase("create MCP client manager"):
+                    manager = MCPClientManager()
+                    get_app_metrics().bind_manager(manager)
+                    _bridge_events(manager, 'mcp_client')
+                    _mcp_manager = manager
     return _mcp_manager
 
 def get_strands_mcp_agent():
     """Get or create Strands MCP agent singleton"""
     global _strands_agent
     if _strands_agent is None:
-        _strands_agent = StrandsMCPAgent()
+        with _init_lock:
+            if _strands_agent is None:
+                with startup_phase("create Strands MCP agent"):
+                    # Deferred import: strands pulls in boto3 and the Bedrock model stack
+                    with startup_phase("import strands agent"):
+                        from utils.strands_mcp_agent import StrandsMCPAgent
+                    agent = StrandsMCPAgent()
+                    get_app_metrics().bind_agent(agent)
+                    _bridge_events(agent, 'strands')
+                    _strands_agent = agent
     return _strands_agent
 
 def run_async_safely(coro, timeout=30.0):
-    """Safely run async coroutine in sync context"""
+    """Run an async coroutine on the shared background loop from sync context"""
     try:
-        return asyncio.run(asyncio.wait_for(coro, timeout=timeout))
+        return get_loop_runner().run(coro, timeout=timeout)
     except asyncio.TimeoutError:
         logger.error(f"Async operation timed out after {timeout} seconds")
         raise
@@ -48,14 +80,43 @@ def run_async_safely(coro, timeout=30.0):
         logger.error(f"Async operation failed: {str(e)}")
         raise
 
+def get_conversation_id():
+    """Get the conversation id for the current browser session, creating one if needed"""
+    if 'conversation_id' not in session:
+        session['conversation_id'] = uuid.uuid4().hex
+    return session['conversation_id']
+
+def submit_background(coro, description):
+    """Schedule a coroutine on the shared loop without waiting, logging any failure"""
+    def log_failure(future):
+        if not future.cancelled() and future.exception():
+            logger.error(f"Error {description}: {str(future.exception())}")
+    
+    future = get_loop_runner().submit(coro)
+    future.add_done_callback(log_failure)
+    return future
+
+def shutdown_mcp():
+    """Close MCP sessions and stop the shared event loop"""
+    runner = get_loop_runner()
+    try:
+        if _strands_agent is not None:
+            runner.run(_strands_agent.cleanup(), timeout=10.0)
+        if _mcp_manager is not None:
+            runner.run(_mcp_manager.cleanup(), timeout=10.0)
+    except Exception as e:
+        logger.error(f"Error closing MCP sessions: {str(e)}")
+    finally:
+        runner.shutdown()
+
 # Create Blueprint
 mcp_bp = Blueprint('mcp', __name__)
 
-# Initialize Strands MCP agent
-strands_agent = get_strands_mcp_agent()
+# The Strands MCP agent and the original MCP manager are created on first use
+# (or by the warmup in initialize_mcp_servers) via their getters
 
-# Keep original MCP manager for compatibility
-mcp_manager = get_mcp_manager()
+# In-memory MCP server config shared with both managers
+config_repository = get_config_repository()
 
 # REST API Routes
 
@@ -63,17 +124,12 @@ mcp_manager = get_mcp_manager()
 def get_servers():
     """Get all MCP servers and their status from Strands agent"""
     try:
-        status = strands_agent.get_server_status()
+        status = get_strands_mcp_agent().get_server_status()
         # Convert to expected format for backward compatibility
         servers_list = []
         
-        # Load full configuration details from file
-        config_path = Path("data/mcp_servers.json")
-        full_configs = {}
-        if config_path.exists():
-            with open(config_path, 'r') as f:
-                config_data = json.load(f)
-                full_configs = config_data.get('active_servers', {})
+        # Full configuration details from the in-memory config
+        full_configs = config_repository.get_servers()
         
         for server_id, server_info in status.get('servers', {}).items():
             # Merge status with full config
@@ -113,19 +169,9 @@ def get_servers():
 def get_server_configs():
     """Get detailed configuration for all servers"""
     try:
-        config_path = Path("data/mcp_servers.json")
-        if not config_path.exists():
-            return jsonify({
-                'success': True,
-                'configs': {}
-            })
-        
-        with open(config_path, 'r') as f:
-            config_data = json.load(f)
-        
         return jsonify({
             'success': True,
-            'configs': config_data.get('active_servers', {})
+            'configs': config_repository.get_servers()
         })
     except Exception as e:
         logger.error(f"Error getting server configs: {str(e)}")
@@ -138,21 +184,8 @@ def get_server_configs():
 def get_available_servers():
     """Get available MCP servers for agent builder (without connecting)"""
     try:
-        # Load server configurations from file
-        from pathlib import Path
-        config_path = Path("data/mcp_servers.json")
-        
-        if not config_path.exists():
-            return jsonify({
-                'success': True,
-                'servers': []
-            })
-        
-        with open(config_path, 'r') as f:
-            config = json.load(f)
-        
         servers_list = []
-        for server_id, server_info in config.get('active_servers', {}).items():
+        for server_id, server_info in config_repository.get_servers().items():
             if server_info.get('enabled', True):
                 servers_list.append({
                     'id': server_id,
@@ -190,10 +223,8 @@ def add_server():
                 }), 400
         
         # Add the server to configuration
-        server_id = mcp_manager.add_server(data)
-        
-        # Reload configurations in Strands agent
-        strands_agent.load_mcp_server_configs()
+        # The Strands agent picks up the change from the shared config repository
+        server_id = get_mcp_manager().add_server(data)
         
         # Don't auto-connect - let the UI handle connection
         return jsonify({
@@ -225,7 +256,8 @@ def update_server(server_id):
                 }), 400
         
         # Update the server configuration
-        success = mcp_manager.update_server(server_id, data)
+        # The Strands agent picks up the change from the shared config repository
+        success = get_mcp_manager().update_server(server_id, data)
         
         if not success:
             return jsonify({
@@ -233,9 +265,6 @@ def update_server(server_id):
                 'error': 'Server not found'
             }), 404
         
-        # Reload configurations in Strands agent
-        strands_agent.load_mcp_server_configs()
-        
         return jsonify({
             'success': True,
             'message': f"Server '{data['name']}' updated successfully"
@@ -252,15 +281,13 @@ def update_server(server_id):
 def remove_server(server_id):
     """Remove an MCP server"""
     try:
+        strands_agent = get_strands_mcp_agent()
         # Disconnect first if connected
         if server_id in strands_agent.mcp_clients:
             run_async_safely(strands_agent.disconnect_server(server_id))
         
-        # Remove from configuration
-        mcp_manager.remove_server(server_id)
-        
-        # Reload configurations
-        strands_agent.load_mcp_server_configs()
+        # Remove from configuration; the Strands agent follows the shared config repository
+        get_mcp_manager().remove_server(server_id)
         
         return jsonify({
             'success': True,
@@ -277,8 +304,10 @@ def remove_server(server_id):
 def connect_server(server_id):
     """Connect to an MCP server"""
     try:
-        # Connect using Strands agent
-        connected = run_async_safely(strands_agent.connect_server(server_id), timeout=30.0)
+        strands_agent = get_strands_mcp_agent()
+        # Connect using Strands agent, allowing the server's startup and tool listing timeouts
+        timeout = strands_agent.timeouts.connection(server_id) + strands_agent.timeouts.list_tools(server_id)
+        connected = run_async_safely(strands_agent.connect_server(server_id), timeout=timeout)
         
         if connected:
             # Get updated status
@@ -297,7 +326,7 @@ def connect_server(server_id):
     except asyncio.TimeoutError:
         return jsonify({
             'success': False,
-            'error': 'Connection timed out after 30 seconds'
+            'error': f'Connection timed out after {timeout} seconds'
         }), 408
     except Exception as e:
         logger.error(f"Error connecting to server: {str(e)}")
@@ -306,12 +335,52 @@ def connect_server(server_id):
             'error': str(e)
         }), 500
 
+@mcp_bp.route('/servers/connect', methods=['POST'])
+def connect_servers():
+    """Connect several MCP servers concurrently (all auto_connect servers by default)"""
+    try:
+        strands_agent = get_strands_mcp_agent()
+        data = request.get_json(silent=True) or {}
+        server_ids = data.get('server_ids')
+        max_concurrency = data.get('max_concurrency')
+        
+        # Allow one connection timeout per batch of concurrent connections
+        pending = len(server_ids) if server_ids is not None else len(strands_agent.mcp_servers)
+        limit = max(1, int(max_concurrency or strands_agent.settings['max_concurrent_connections']))
+        connection_timeout = strands_agent.timeouts.connection() + strands_agent.timeouts.list_tools()
+        timeout = connection_timeout * max(1, -(-pending // limit))
+        
+        results = run_async_safely(
+            strands_agent.connect_servers(server_ids, max_concurrency=max_concurrency),
+            timeout=timeout
+        )
+        connected = sum(1 for result in results.values() if result['success'])
+        
+        return jsonify({
+            'success': True,
+            'results': results,
+            'connected': connected,
+            'failed': len(results) - connected
+        })
+        
+    except asyncio.TimeoutError:
+        return jsonify({
+            'success': False,
+            'error': f'Bulk connection timed out after {timeout:.0f} seconds'
+        }), 408
+    except Exception as e:
+        logger.error(f"Error connecting servers: {str(e)}")
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
 @mcp_bp.route('/servers/<server_id>/disconnect', methods=['POST'])
 def disconnect_server(server_id):
     """Disconnect from an MCP server"""
     try:
         # Disconnect using Strands agent
-        disconnected = run_async_safely(strands_agent.disconnect_server(server_id))
+        disconnected = run_async_safely(get_strands_mcp_agent().disconnect_server(server_id))
         
         if disconnected:
             return jsonify({
@@ -335,7 +404,7 @@ def disconnect_server(server_id):
 def get_server_status(server_id):
     """Get detailed status of a specific server from Strands agent"""
     try:
-        status = strands_agent.get_server_status(server_id)
+        status = get_strands_mcp_agent().get_server_status(server_id)
         if 'error' in status:
             return jsonify({
                 'success': False,
@@ -358,7 +427,7 @@ def get_tools():
     """Get all available tools from Strands agent"""
     try:
         # Get tools asynchronously
-        tools = run_async_safely(strands_agent.get_available_tools())
+        tools = run_async_safely(get_strands_mcp_agent().get_available_tools())
         return jsonify({
             'success': True,
             'tools': tools
@@ -370,14 +439,30 @@ def get_tools():
             'error': str(e)
         }), 500
 
+# HTTP status for direct execution failures that are the caller's to fix
+EXECUTE_ERROR_STATUS = {
+    'ToolNotFound': 404,
+    'AmbiguousTool': 400,
+    'ServerNotConnected': 409,
+    'Timeout': 408
+}
+
 @mcp_bp.route('/tools/execute', methods=['POST'])
 def execute_tool():
-    """Execute a tool via chat with Strands agent (tools are executed automatically)"""
+    """Execute a tool
+    
+    mode 'direct' (default) calls the tool over its live MCP session (or
+    in-process for Strands tools) and returns its content, structured
+    content, duration and error class. mode 'llm' is the legacy path that
+    asks the Strands agent to call the tool through chat.
+    """
     try:
         data = request.json
         tool_name = data.get('tool_name')
         arguments = data.get('arguments', {})
-        timeout = data.get('timeout', 60.0)
+        server_id = data.get('server_id')
+        timeout = data.get('timeout')  # Defaults to the tool's timeout from the timeout policy
+        mode = data.get('mode', 'direct')
         
         if not tool_name:
             return jsonify({
@@ -385,10 +470,33 @@ def execute_tool():
                 'error': 'Missing tool_name'
             }), 400
         
+        strands_agent = get_strands_mcp_agent()
+        
+        if mode == 'direct':
+            # Allow time for resolving the tool (and opening a session) on top of the call itself
+            budget = timeout or strands_agent.timeouts.longest_tool_timeout(tool_name, server_id)
+            result = run_async_safely(
+                strands_agent.execute_tool(tool_name, arguments, server_id=server_id, timeout=timeout),
+                timeout=budget + 10.0
+            )
+            return jsonify({
+                'success': result['success'],
+                'mode': mode,
+                'result': result,
+                'error': result['error']
+            }), EXECUTE_ERROR_STATUS.get(result['error_class'], 200)
+        
+        if mode != 'llm':
+            return jsonify({
+                'success': False,
+                'error': f"Unknown mode: {mode}"
+            }), 400
+        
         # Create a message that will trigger the tool execution
         tool_message = f"Please use the {tool_name} tool with these parameters: {json.dumps(arguments)}"
         
         # Execute via chat (Strands will handle tool execution automatically)
+        timeout = timeout or strands_agent.timeouts.longest_tool_timeout(tool_name, server_id)
         result = run_async_safely(
             strands_agent.chat(
                 message=tool_message,
@@ -399,6 +507,7 @@ def execute_tool():
         
         return jsonify({
             'success': result.get('success', False),
+            'mode': mode,
             'result': result
         })
         
@@ -434,12 +543,13 @@ def chat():
         
         # Send message to Strands agent
         response = run_async_safely(
-            strands_agent.chat(
+            get_strands_mcp_agent().chat(
                 message=message,
                 system_prompt=system_prompt,
                 temperature=temperature,
                 max_tokens=max_tokens,
-                use_tools=use_tools
+                use_tools=use_tools,
+                conversation_id=get_conversation_id()
             ),
             timeout=timeout
         )
@@ -462,7 +572,7 @@ def chat():
 def clear_chat():
     """Clear the chat history"""
     try:
-        strands_agent.clear_history()
+        get_strands_mcp_agent().clear_history(get_conversation_id())
         return jsonify({
             'success': True,
             'message': 'Chat history cleared'
@@ -478,7 +588,7 @@ def clear_chat():
 def get_chat_stats():
     """Get chat conversation statistics"""
     try:
-        stats = strands_agent.get_conversation_stats()
+        stats = get_strands_mcp_agent().get_conversation_stats(get_conversation_id())
         return jsonify({
             'success': True,
             'stats': stats
@@ -494,7 +604,7 @@ def get_chat_stats():
 def get_strands_tools():
     """Get all available Strands tools with their status"""
     try:
-        status = strands_agent.get_strands_tools_status()
+        status = get_strands_mcp_agent().get_strands_tools_status()
         return jsonify({
             'success': True,
             'tools': status
@@ -510,7 +620,7 @@ def get_strands_tools():
 def get_enabled_strands_tools():
     """Get currently enabled Strands tools"""
     try:
-        status = strands_agent.get_strands_tools_status()
+        status = get_strands_mcp_agent().get_strands_tools_status()
         enabled_tools = []
         
         for category, cat_info in status.get('categories', {}).items():
@@ -550,7 +660,7 @@ def toggle_strands_tool():
                 'error': 'Missing tool_id or category'
             }), 400
         
-        success = strands_agent.toggle_strands_tool(tool_id, category, enabled)
+        success = get_strands_mcp_agent().toggle_strands_tool(tool_id, category, enabled)
         
         if success:
             return jsonify({
@@ -583,7 +693,7 @@ def bulk_update_strands_tools():
                 'error': 'No updates provided'
             }), 400
         
-        results = strands_agent.bulk_update_strands_tools(updates)
+        results = get_strands_mcp_agent().bulk_update_strands_tools(updates)
         
         return jsonify({
             'success': True,
@@ -600,16 +710,27 @@ def bulk_update_strands_tools():
 
 @mcp_bp.route('/history', methods=['GET'])
 def get_tool_history():
-    """Get tool execution history"""
+    """Get tool execution history
+
+    Optional filters: server_id, tool_name, status. Pages go backwards in time;
+    pass the returned next_cursor as `cursor` to get the previous page.
+    """
     try:
-        history = mcp_manager.tool_call_history
-        # Limit to last 50 calls
-        recent_history = history[-50:] if len(history) > 50 else history
+        history = get_mcp_manager().tool_call_history
+        page = history.query(
+            server_id=request.args.get('server_id'),
+            tool_name=request.args.get('tool_name'),
+            status=request.args.get('status'),
+            cursor=request.args.get('cursor', type=int),
+            limit=min(request.args.get('limit', 50, type=int), 500)
+        )
         
         return jsonify({
             'success': True,
-            'history': recent_history,
-            'total_calls': len(history)
+            'history': page['history'],
+            'next_cursor': page['next_cursor'],
+            'total_calls': history.total_calls,
+            'stats': history.get_stats()
         })
     except Exception as e:
         logger.error(f"Error getting tool history: {str(e)}")
@@ -618,19 +739,97 @@ def get_tool_history():
             'error': str(e)
         }), 500
 
+@mcp_bp.route('/metrics', methods=['GET'])
+def get_latency_metrics():
+    """Get chat pipeline latency histograms per stage
+
+    Stages: prompt_build, mcp_context_entry, list_tools (per server),
+    agent_construction, time_to_first_token, model_call, tool_call (per tool)
+    and total (per mode). Also reports event bus queue depth, drops and
+    per-subscriber delivery lag.
+    """
+    try:
+        strands_agent = get_strands_mcp_agent()
+        event_buses = {'strands': strands_agent.event_bus.get_stats()}
+        if _mcp_manager is not None:
+            event_buses['mcp_client'] = _mcp_manager.event_bus.get_stats()
+        return jsonify({
+            'success': True,
+            'latency': strands_agent.latency_metrics.snapshot(),
+            'event_buses': event_buses,
+            'tool_cache': strands_agent.tool_result_cache.get_stats(),
+            'tool_coalescing': strands_agent.single_flight.get_stats()
+        })
+    except Exception as e:
+        logger.error(f"Error getting metrics: {str(e)}")
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+@mcp_bp.route('/history/journal', methods=['GET'])
+def query_tool_journal():
+    """Query the durable tool call journal
+
+    Optional filters: server_id, tool_name, status, source ('mcp_client' or
+    'strands'), since/until (ISO timestamps) and limit.
+    """
+    try:
+        journal = get_mcp_manager().tool_journal
+        records = journal.query(
+            server_id=request.args.get('server_id'),
+            tool_name=request.args.get('tool_name'),
+            status=request.args.get('status'),
+            source=request.args.get('source'),
+            since=request.args.get('since'),
+            until=request.args.get('until'),
+            limit=min(request.args.get('limit', 100, type=int), 1000)
+        )
+        
+        return jsonify({
+            'success': True,
+            'history': records,
+            'stats': journal.get_stats()
+        })
+    except Exception as e:
+        logger.error(f"Error querying tool journal: {str(e)}")
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+@mcp_bp.route('/history/journal/compact', methods=['POST'])
+def compact_tool_journal():
+    """Compact the tool call journal to the latest snapshot per call"""
+    try:
+        journal = get_mcp_manager().tool_journal
+        if not journal.compact():
+            return jsonify({
+                'success': False,
+                'error': 'Journal compaction timed out'
+            }), 504
+        
+        return jsonify({
+            'success': True,
+            'stats': journal.get_stats()
+        })
+    except Exception as e:
+        logger.error(f"Error compacting tool journal: {str(e)}")
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
 @mcp_bp.route('/model', methods=['GET', 'POST'])
 def handle_model():
     """Get or set the model ID"""
-    global strands_agent
-    
     if request.method == 'POST':
         data = request.get_json()
         model_id = data.get('model', 'amazon.nova-lite-v1:0')
         
         try:
             # Update the model in Strands agent
-            if strands_agent:
-                strands_agent.update_model(model_id)
+            get_strands_mcp_agent().update_model(model_id)
             
             # Store in session
             session['selected_model'] = model_id
@@ -688,6 +887,7 @@ def handle_system_prompt():
 def test_connection():
     """Test the connection to Strands agent"""
     try:
+        strands_agent = get_strands_mcp_agent()
         connected = run_async_safely(strands_agent.test_connection(), timeout=15.0)
         server_status = strands_agent.get_server_status()
         
@@ -713,6 +913,11 @@ def test_connection():
 # WebSocket handlers for real-time features
 def register_socketio_handlers(socketio):
     """Register Socket.IO event handlers for MCP client"""
+    global _socketio
+    with _init_lock:
+        _socketio = socketio
+        _bridge_events(_mcp_manager, 'mcp_client')
+        _bridge_events(_strands_agent, 'strands')
     
     @socketio.on('mcp_join')
     def handle_mcp_join(data):
@@ -731,6 +936,7 @@ def register_socketio_handlers(socketio):
     @socketio.on('mcp_chat_stream')
     def handle_chat_stream(data):
         """Stream chat responses with Strands agent MCP support"""
+        strands_agent = get_strands_mcp_agent()
         message = data.get('message')
         use_tools = data.get('use_tools', True)
         system_prompt = data.get('system_prompt')
@@ -739,11 +945,28 @@ def register_socketio_handlers(socketio):
         model = data.get('model', 'amazon.nova-lite-v1:0')
         room = request.sid
         
+        # Share the HTTP session's conversation so /chat/clear and /chat/stats
+        # see the same history; fall back to the socket id. Never take the id
+        # from the client payload, which would expose other sessions' history
+        conversation_id = session.get('conversation_id') or request.sid
+        
         # Update model if different
-        if model and strands_agent and model != strands_agent.current_model_id:
+        if model and model != strands_agent.current_model_id:
             strands_agent.update_model(model)
         
+        # Coalesce text deltas into fewer frames; other chunks flush and go out immediately
+        batch_window_ms = current_app.config.get('STREAM_BATCH_WINDOW_MS', 30.0)
+        batch_max_bytes = current_app.config.get('STREAM_BATCH_MAX_BYTES', 4096)
+        
+        app_metrics = get_app_metrics()
+        
         async def stream_response():
+            app_metrics.active_streams.inc()
+            coalescer = TextDeltaCoalescer(
+                lambda chunk: socketio.emit('mcp_chat_chunk', chunk, room=room),
+                window_ms=batch_window_ms,
+                max_bytes=batch_max_bytes
+            )
             try:
                 # Stream using Strands agent
                 async for chunk in strands_agent.stream_chat(
@@ -751,30 +974,29 @@ def register_socketio_handlers(socketio):
                     system_prompt=system_prompt,
                     temperature=temperature,
                     max_tokens=max_tokens,
-                    use_tools=use_tools
+                    use_tools=use_tools,
+                    conversation_id=conversation_id
                 ):
-                    socketio.emit('mcp_chat_chunk', chunk, room=room)
+                    coalescer.push(chunk)
+                coalescer.close()
                     
             except Exception as e:
+                coalescer.close()
                 logger.error(f"Error in chat stream: {str(e)}")
                 socketio.emit('mcp_chat_error', {
                     'error': str(e),
                     'timestamp': datetime.now().isoformat()
                 }, room=room)
+            finally:
+                app_metrics.active_streams.dec()
         
-        # Run async function safely
-        def run_stream():
-            try:
-                asyncio.run(stream_response())
-            except Exception as e:
-                logger.error(f"Error running stream: {str(e)}")
-        
-        # Run in background thread
-        socketio.start_background_task(run_stream)
+        # Run on the shared background loop
+        submit_background(stream_response(), 'running stream')
     
     @socketio.on('mcp_connect_server')
     def handle_connect_server(data):
         """Connect to MCP server via WebSocket"""
+        strands_agent = get_strands_mcp_agent()
         server_id = data.get('server_id')
         room = request.sid
         
@@ -803,14 +1025,46 @@ def register_socketio_handlers(socketio):
                     'timestamp': datetime.now().isoformat()
                 }, room=room)
         
-        # Run async function
-        def run_connect():
+        # Run on the shared background loop
+        submit_background(connect_async(), 'connecting server')
+    
+    @socketio.on('mcp_connect_servers')
+    def handle_connect_servers(data):
+        """Connect several MCP servers concurrently, reporting each as it finishes"""
+        data = data or {}
+        server_ids = data.get('server_ids')
+        max_concurrency = data.get('max_concurrency')
+        room = request.sid
+        
+        def report_progress(server_id, result):
+            event = 'mcp_server_connected' if result['success'] else 'mcp_server_error'
+            socketio.emit(event, {
+                'server_id': server_id,
+                **result,
+                'timestamp': datetime.now().isoformat()
+            }, room=room)
+        
+        async def connect_all_async():
             try:
-                asyncio.run(connect_async())
+                results = await get_strands_mcp_agent().connect_servers(
+                    server_ids, max_concurrency=max_concurrency, on_result=report_progress
+                )
+                connected = sum(1 for result in results.values() if result['success'])
+                socketio.emit('mcp_servers_connect_complete', {
+                    'connected': connected,
+                    'failed': len(results) - connected,
+                    'results': results,
+                    'timestamp': datetime.now().isoformat()
+                }, room=room)
+                
             except Exception as e:
-                logger.error(f"Error connecting server: {str(e)}")
+                socketio.emit('mcp_server_error', {
+                    'error': str(e),
+                    'timestamp': datetime.now().isoformat()
+                }, room=room)
         
-        socketio.start_background_task(run_connect)
+        # Run on the shared background loop
+        submit_background(connect_all_async(), 'connecting servers')
     
     @socketio.on('mcp_disconnect_server')
     def handle_disconnect_server(data):
@@ -820,7 +1074,7 @@ def register_socketio_handlers(socketio):
         
         async def disconnect_async():
             try:
-                disconnected = await strands_agent.disconnect_server(server_id)
+                disconnected = await get_strands_mcp_agent().disconnect_server(server_id)
                 
                 if disconnected:
                     socketio.emit('mcp_server_disconnected', {
@@ -841,21 +1095,37 @@ def register_socketio_handlers(socketio):
                     'timestamp': datetime.now().isoformat()
                 }, room=room)
         
-        # Run async function
-        def run_disconnect():
-            try:
-                asyncio.run(disconnect_async())
-            except Exception as e:
-                logger.error(f"Error disconnecting server: {str(e)}")
-        
-        socketio.start_background_task(run_disconnect)
+        # Run on the shared background loop
+        submit_background(disconnect_async(), 'disconnecting server')
 
 # No auto-initialization - servers will be connected manually via UI
-def initialize_mcp_servers():
-    """Initialize Strands MCP agent (servers NOT auto-connected)"""
-    try:
-        # Just log the status - no auto-connection
-        server_status = strands_agent.get_server_status()
-        logger.info(f"Strands MCP agent initialized with {server_status.get('total_servers', 0)} server configurations")
-    except Exception as e:
-        logger.error(f"Failed to get Strands agent status: {str(e)}")
\ No newline at end of file
+def initialize_mcp_servers(mode='eager'):
+    """Initialize Strands MCP agent (servers NOT auto-connected)
+    
+    mode is 'eager' (build now), 'background' (build in a warmup thread so the
+    app can serve requests meanwhile) or 'lazy' (build on first use).
+    """
+    if mode == 'lazy':
+        logger.info("Strands MCP agent will be initialized on first use")
+        return None
+    
+    def warm_up():
+        try:
+            get_mcp_manager()
+            strands_agent = get_strands_mcp_agent()
+            with startup_phase("warm up Strands agent"):
+                strands_agent.warm_up()
+            
+            # Just log the status - no auto-connection
+            server_status = strands_agent.get_server_status()
+            logger.info(f"Strands MCP agent initialized with {server_status.get('total_servers', 0)} server configurations")
+        except Exception as e:
+            logger.error(f"Failed to initialize Strands agent: {str(e)}")
+    
+    if mode == 'background':
+        thread = threading.Thread(target=warm_up, name="mcp-warmup", daemon=True)
+        thread.start()
+        return thread
+    
+    warm_up()
+    return None
\ No newline at end of file
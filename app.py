@@ -4,16 +4,24 @@ A minimal Flask app for demonstrating Model Context Protocol capabilities
 """
 import os
 import sys
+import atexit
 import logging
 from pathlib import Path
-from flask import Flask, render_template, request
-from flask_cors import CORS
-from flask_socketio import SocketIO, emit
-from flask_session import Session
 
 # Add current directory to path
 sys.path.insert(0, str(Path(__file__).parent))
 
+# With --profile-startup, time every import and init phase from here on
+from utils.startup_profiler import start_profiling, get_profiler, startup_phase
+if '--profile-startup' in sys.argv:
+    start_profiling()
+
+with startup_phase("import Flask stack"):
+    from flask import Flask, Response, render_template, request
+    from flask_cors import CORS
+    from flask_socketio import SocketIO, emit
+    from flask_session import Session
+
 from config import get_config
 
 # Set up logging
@@ -32,24 +40,30 @@ logging.getLogger('werkzeug').setLevel(logging.WARNING)
 app = Flask(__name__)
 
 # Load configuration
-config = get_config()
-config.init_app(app)
+with startup_phase("configure app"):
+    config = get_config()
+    config.init_app(app)
 
 # Initialize extensions
-CORS(app)
-Session(app)
-socketio = SocketIO(
-    app, 
-    cors_allowed_origins="*",
-    async_mode='threading',
-    ping_timeout=60,
-    ping_interval=25,
-    logger=True,
-    engineio_logger=False
-)
+with startup_phase("initialize extensions"):
+    CORS(app)
+    Session(app)
+    socketio = SocketIO(
+        app, 
+        cors_allowed_origins="*",
+        async_mode='threading',
+        ping_timeout=60,
+        ping_interval=25,
+        logger=True,
+        engineio_logger=False
+    )
 
 # Import API blueprints
-from api.mcp_routes import mcp_bp, register_socketio_handlers, initialize_mcp_servers
+with startup_phase("import MCP routes"):
+    from api.mcp_routes import (
+        mcp_bp, register_socketio_handlers, initialize_mcp_servers, shutdown_mcp, get_conversation_id
+    )
+    from utils.prometheus_metrics import get_app_metrics
 
 # Register blueprints
 app.register_blueprint(mcp_bp, url_prefix='/api/mcp')
@@ -57,11 +71,25 @@ app.register_blueprint(mcp_bp, url_prefix='/api/mcp')
 # Register socketio handlers
 register_socketio_handlers(socketio)
 
+# Close MCP sessions and the shared event loop on exit
+atexit.register(shutdown_mcp)
+
 # Main routes
 @app.route('/')
 def index():
     """Main MCP Demo interface"""
-    return render_template('index.html')
+    # Assign the conversation before the Socket.IO handshake copies the session
+    get_conversation_id()
+    stream_config = {
+        'renderMode': app.config.get('STREAM_RENDER_MODE', 'frame'),
+        'debug': app.config.get('STREAM_DEBUG_LOG', False)
+    }
+    return render_template('index.html', stream_config=stream_config)
+
+@app.route('/metrics')
+def metrics():
+    """Prometheus metrics for MCP servers, tool calls and Bedrock requests"""
+    return Response(get_app_metrics().render(), content_type='text/plain; version=0.0.4; charset=utf-8')
 
 # WebSocket events
 @socketio.on('connect')
@@ -88,13 +116,22 @@ def internal_error(error):
     return render_template('error.html', error="Internal server error"), 500
 
 if __name__ == '__main__':
+    # Profiling measures a full initialization, otherwise honour MCP_INIT_MODE
+    profiler = get_profiler()
+    init_mode = 'eager' if profiler else app.config.get('MCP_INIT_MODE', 'background')
+    
     # Initialize MCP servers on startup
     with app.app_context():
         try:
-            initialize_mcp_servers()
+            with startup_phase("initialize MCP agent"):
+                initialize_mcp_servers(init_mode)
         except Exception as e:
             logger.warning(f"Failed to initialize MCP servers on startup: {e}")
     
+    if profiler:
+        profiler.uninstall()
+        print(profiler.report(), flush=True)
+    
     # Run the application
     port = int(os.environ.get('PORT', 5000))
     debug = os.environ.get('DEBUG', 'True').lower() == 'true'
@@ -105,5 +142,5 @@ if __name__ == '__main__':
         host='0.0.0.0',
         port=port,
         debug=debug,
-        use_reloader=debug
+        use_reloader=debug and not profiler
     )
@@ -8,6 +8,8 @@ from dotenv import load_dotenv
 # Load environment variables from .env file
 load_dotenv()
 
+from utils.mcp_settings import DEFAULT_SETTINGS as MCP_DEFAULT_SETTINGS
+
 class Config:
     """Base configuration for MCP Demo"""
     
@@ -27,8 +29,20 @@ class Config:
     
     # MCP Configuration
     MCP_CONFIG_PATH = Path('./data/mcp_servers.json')
-    MCP_CONNECTION_TIMEOUT = float(os.getenv('MCP_CONNECTION_TIMEOUT', '30.0'))
-    MCP_TOOL_TIMEOUT = float(os.getenv('MCP_TOOL_TIMEOUT', '60.0'))
+    # Fallbacks for settings the config file doesn't set (read from the environment in utils.mcp_settings)
+    MCP_CONNECTION_TIMEOUT = MCP_DEFAULT_SETTINGS['connection_timeout']
+    MCP_TOOL_TIMEOUT = MCP_DEFAULT_SETTINGS['tool_timeout']
+    # When to build the Strands agent and Bedrock client:
+    # 'eager' at startup, 'background' in a warmup thread, 'lazy' on first request
+    MCP_INIT_MODE = os.getenv('MCP_INIT_MODE', 'background')
+    
+    # Chat streaming: text deltas are coalesced server-side for up to this many
+    # milliseconds or bytes per Socket.IO frame (0 ms sends every delta)
+    STREAM_BATCH_WINDOW_MS = float(os.getenv('STREAM_BATCH_WINDOW_MS', '30'))
+    STREAM_BATCH_MAX_BYTES = int(os.getenv('STREAM_BATCH_MAX_BYTES', '4096'))
+    # Client renderer: 'frame' redraws at most once per animation frame, 'immediate' on every chunk
+    STREAM_RENDER_MODE = os.getenv('STREAM_RENDER_MODE', 'frame')
+    STREAM_DEBUG_LOG = os.getenv('STREAM_DEBUG_LOG', 'False').lower() == 'true'
     
     # AWS Configuration for Bedrock
     AWS_REGION = os.getenv('AWS_DEFAULT_REGION', 'us-east-1')
@@ -60,19 +74,11 @@ class Config:
         
         # Ensure MCP config file exists
         if not cls.MCP_CONFIG_PATH.exists():
-            # Create default configuration
             import json
+            # Settings left out fall back to utils.mcp_settings.DEFAULT_SETTINGS
             default_config = {
                 "active_servers": {},
-                "settings": {
-                    "auto_reconnect": True,
-                    "connection_timeout": 30.0,
-                    "tool_timeout": 60.0,
-                    "session_init_timeout": 15.0,
-                    "list_tools_timeout": 10.0,
-                    "max_concurrent_tools": 5,
-                    "log_tool_calls": True
-                }
+                "settings": {}
             }
             cls.MCP_CONFIG_PATH.parent.mkdir(exist_ok=True)
             with open(cls.MCP_CONFIG_PATH, 'w') as f:
@@ -13,6 +13,7 @@ let currentStreamContainer = null;
 let currentReasoningBlock = null;
 let currentToolSelectionBlock = null;
 let currentToolExecutionBlock = null;
+let toolExecutionBlocks = {}; // Tool cards by tool_id; parallel calls finish out of order
 let currentResponseBlock = null;
 let currentToolExecutionPopup = null;
 let streamBuffer = '';
@@ -28,6 +29,11 @@ let currentParseMode = 'normal'; // 'normal', 'thinking'
 let thinkingBuffer = ''; // Accumulates thinking content
 let responseBuffer = ''; // Accumulates response content
 
+// Stream rendering, configured server-side via STREAM_RENDER_MODE / STREAM_DEBUG_LOG
+const streamConfig = Object.assign({ renderMode: 'frame', debug: false }, window.MCP_STREAM_CONFIG || {});
+let pendingResponseRender = null; // Latest response content waiting for the next animation frame
+let scrollScheduled = false;
+
 // Initialize on page load
 document.addEventListener('DOMContentLoaded', function() {
     try {
@@ -389,6 +395,7 @@ async function sendMessage() {
     currentReasoningBlock = null;
     currentToolSelectionBlock = null;
     currentToolExecutionBlock = null;
+    toolExecutionBlocks = {};
     currentResponseBlock = null;
     
     // Send via WebSocket
@@ -474,7 +481,7 @@ function processMessageBuffer(container) {
                 } else {
                     container.appendChild(currentReasoningBlock);
                 }
-                container.scrollTop = container.scrollHeight;
+                scrollToBottom(container);
             }
             
             // Continue processing remaining buffer
@@ -591,7 +598,47 @@ function updateThinkingCard(content, isComplete) {
     }
 }
 
+function streamDebug(...args) {
+    if (streamConfig.debug) {
+        console.log(...args);
+    }
+}
+
+function scrollToBottom(container) {
+    if (streamConfig.renderMode !== 'frame') {
+        container.scrollTop = container.scrollHeight;
+        return;
+    }
+    // At most one layout-forcing scroll per animation frame
+    if (scrollScheduled) return;
+    scrollScheduled = true;
+    requestAnimationFrame(() => {
+        scrollScheduled = false;
+        container.scrollTop = container.scrollHeight;
+    });
+}
+
 function updateResponseDisplay(content, container) {
+    if (streamConfig.renderMode !== 'frame') {
+        renderResponseDisplay(content, container);
+        return;
+    }
+    // Re-render the markdown once per frame with the latest content
+    const scheduled = pendingResponseRender !== null;
+    pendingResponseRender = { content, container };
+    if (!scheduled) {
+        requestAnimationFrame(flushResponseRender);
+    }
+}
+
+function flushResponseRender() {
+    if (!pendingResponseRender) return;
+    const { content, container } = pendingResponseRender;
+    pendingResponseRender = null;
+    renderResponseDisplay(content, container);
+}
+
+function renderResponseDisplay(content, container) {
     // Ensure we have an agent response container
     if (!currentStreamContainer) {
         currentStreamContainer = createAgentResponseContainer();
@@ -619,7 +666,7 @@ function updateResponseDisplay(content, container) {
     }
     
     // Scroll to bottom
-    container.scrollTop = container.scrollHeight;
+    scrollToBottom(container);
 }
 
 function createAgentResponseContainer() {
@@ -658,7 +705,12 @@ function handleChatChunk(data) {
     const container = document.getElementById('chatContainer');
     
     // Log all events for debugging
-    console.log('MCP Event:', data.type, data);
+    streamDebug('MCP Event:', data.type, data);
+    
+    // Render buffered text before anything that is positioned relative to it
+    if (data.type !== 'text_delta') {
+        flushResponseRender();
+    }
     
     switch (data.type) {
         case 'text_delta':
@@ -684,11 +736,11 @@ function handleChatChunk(data) {
             } else {
                 container.appendChild(toolSelDiv);
             }
-            container.scrollTop = container.scrollHeight;
+            scrollToBottom(container);
             break;
             
         case 'tool_execution':
-            console.log('Tool execution event:', data);
+            streamDebug('Tool execution event:', data);
             
             // Create a tool execution card in the chat
             const toolCard = document.createElement('div');
@@ -716,33 +768,37 @@ function handleChatChunk(data) {
                 container.appendChild(toolCard);
             }
             currentToolExecutionBlock = toolCard;
+            if (data.tool_id) {
+                toolExecutionBlocks[data.tool_id] = toolCard;
+            }
             
             // Show tool execution popup
             currentToolExecutionPopup = createToolExecutionPopup(data.tool_name || 'Tool');
             
             toolCallCount++;
             updateStats();
-            container.scrollTop = container.scrollHeight;
+            scrollToBottom(container);
             break;
             
         case 'tool_result':
-            console.log('Tool result event:', data);
+            streamDebug('Tool result event:', data);
             
-            if (currentToolExecutionBlock) {
+            const resultCard = toolExecutionBlocks[data.tool_id] || currentToolExecutionBlock;
+            if (resultCard) {
                 // Update the tool card to show it's complete
-                const icon = currentToolExecutionBlock.querySelector('.tool-card-icon i');
+                const icon = resultCard.querySelector('.tool-card-icon i');
                 if (icon) {
-                    icon.className = 'bi bi-check-circle-fill';
+                    icon.className = data.status === 'error' ? 'bi bi-x-circle-fill' : 'bi bi-check-circle-fill';
                 }
                 
                 // Add result to the card
                 const resultDiv = document.createElement('div');
                 resultDiv.className = 'tool-card-result';
                 resultDiv.innerHTML = `
-                    <div class="result-label">Result:</div>
+                    <div class="result-label">Result:${data.cached ? ' <span class="badge bg-secondary">cached</span>' : ''}</div>
                     <pre>${formatToolResult(data.content)}</pre>
                 `;
-                currentToolExecutionBlock.appendChild(resultDiv);
+                resultCard.appendChild(resultDiv);
             }
             
             // Update tool execution popup to show completion
@@ -758,6 +814,7 @@ function handleChatChunk(data) {
             if (fullMessageBuffer) {
                 processMessageBuffer(container);
             }
+            flushResponseRender();
             
             // Mark thinking card as complete if it exists
             if (currentReasoningBlock) {
@@ -791,6 +848,7 @@ function handleChatChunk(data) {
             currentStreamContainer = null;
             currentReasoningBlock = null;
             currentToolExecutionBlock = null;
+            toolExecutionBlocks = {};
             currentResponseBlock = null;
             streamBuffer = '';
             fullMessageBuffer = '';
@@ -1024,6 +1082,7 @@ function toggleThinkingCard(button) {
 function handleChatError(data) {
     console.error('Chat error:', data.error);
     showToast('Chat error: ' + data.error, 'error');
+    flushResponseRender();
     
     // Remove any tool execution popup on error
     removeToolExecutionPopup();
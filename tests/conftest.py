@@ -0,0 +1,8 @@
+"""
+Shared pytest setup: make the repository root importable so tests can use
+`from utils... import ...` the same way app.py does
+"""
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
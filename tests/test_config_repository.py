@@ -0,0 +1,102 @@
+"""Tests for the shared, file-backed MCP config repository"""
+import json
+import os
+
+from utils.config_repository import ConfigRepository, DebouncedWriter, atomic_write_json, get_config_repository
+
+def _write(path, data):
+    path.write_text(json.dumps(data))
+
+def test_atomic_write_json_replaces_file_without_leftovers(tmp_path):
+    path = tmp_path / 'nested' / 'config.json'
+    atomic_write_json(path, {'a': 1})
+    atomic_write_json(path, {'a': 2})
+    assert json.loads(path.read_text()) == {'a': 2}
+    assert os.listdir(path.parent) == ['config.json']
+
+def test_atomic_write_json_keeps_file_mode(tmp_path):
+    path = tmp_path / 'config.json'
+    umask = os.umask(0)
+    os.umask(umask)
+    atomic_write_json(path, {})
+    assert os.stat(path).st_mode & 0o777 == 0o666 & ~umask
+    os.chmod(path, 0o640)
+    atomic_write_json(path, {'a': 1})
+    assert os.stat(path).st_mode & 0o777 == 0o640
+
+def test_debounced_writer_coalesces_a_burst(tmp_path):
+    path = tmp_path / 'config.json'
+    writer = DebouncedWriter(path, delay=60)
+    for i in range(5):
+        writer.schedule({'n': i})
+    assert writer.busy and not path.exists()
+    writer.flush()
+    assert json.loads(path.read_text()) == {'n': 4}
+    assert (writer.scheduled, writer.writes) == (5, 1)
+    writer.flush()
+    assert writer.writes == 1 and not writer.busy
+
+def test_missing_file_gives_empty_config(tmp_path):
+    repo = ConfigRepository(str(tmp_path / 'missing.json'))
+    assert repo.get() == {'active_servers': {}, 'settings': {}}
+
+def test_get_reloads_only_when_file_changes(tmp_path):
+    path = tmp_path / 'config.json'
+    _write(path, {'active_servers': {'s1': {}}})
+    repo = ConfigRepository(str(path))
+    first = repo.get()
+    assert first == {'active_servers': {'s1': {}}, 'settings': {}}
+    assert repo.get() is first
+    _write(path, {'active_servers': {'s1': {}, 's2': {}}, 'settings': {'tool_timeout': 5}})
+    os.utime(path, ns=(0, os.stat(path).st_mtime_ns + 1_000_000))
+    assert set(repo.get_servers()) == {'s1', 's2'}
+    assert repo.get_settings() == {'tool_timeout': 5}
+    assert repo.reloads == 2
+
+def test_invalid_json_keeps_last_good_snapshot(tmp_path):
+    path = tmp_path / 'config.json'
+    _write(path, {'active_servers': {'s1': {}}, 'settings': {}})
+    repo = ConfigRepository(str(path))
+    good = repo.get()
+    path.write_text('{"active_servers": ')
+    assert repo.get() is good
+
+def test_save_notifies_and_does_not_reload_own_write(tmp_path):
+    path = tmp_path / 'config.json'
+    repo = ConfigRepository(str(path), write_delay=60)
+    seen = []
+    repo.subscribe(seen.append)
+    repo.save({'active_servers': {'s1': {}}})
+    assert repo.get() == {'active_servers': {'s1': {}}, 'settings': {}}
+    assert not path.exists()
+    repo.flush()
+    assert json.loads(path.read_text())['active_servers'] == {'s1': {}}
+    assert not repo.refresh()
+    assert len(seen) == 1
+    repo.unsubscribe(seen.append)
+    repo.save({}, immediate=True)
+    assert len(seen) == 1
+
+def test_pending_save_wins_over_external_edit(tmp_path):
+    path = tmp_path / 'config.json'
+    _write(path, {'active_servers': {}})
+    repo = ConfigRepository(str(path), write_delay=60)
+    repo.get()
+    repo.save({'active_servers': {'mine': {}}})
+    _write(path, {'active_servers': {'theirs': {}}})
+    assert set(repo.get_servers()) == {'mine'}
+
+def test_listener_errors_do_not_break_save(tmp_path):
+    repo = ConfigRepository(str(tmp_path / 'config.json'), write_delay=60)
+
+    def broken(config):
+        raise RuntimeError('boom')
+
+    repo.subscribe(broken)
+    repo.save({'active_servers': {'s1': {}}}, immediate=True)
+    assert set(repo.get_servers()) == {'s1'}
+
+def test_get_config_repository_shares_one_instance_per_file(tmp_path):
+    path = tmp_path / 'config.json'
+    assert get_config_repository(str(path)) is get_config_repository(str(path))
+    assert get_config_repository(str(path)) is not get_config_repository(str(tmp_path / 'other.json'))
@@ -0,0 +1,114 @@
+"""Tests for the bounded, asynchronous event bus"""
+import threading
+import time
+
+import pytest
+
+from utils.event_bus import BoundedEventQueue, EventBus, create_event_bus
+
+def test_drop_oldest_keeps_newest_items():
+    queue = BoundedEventQueue(maxsize=2, policy='drop_oldest')
+    assert all(queue.put(i) for i in range(4))
+    assert [queue.get(timeout=0), queue.get(timeout=0)] == [2, 3]
+    assert queue.dropped == 2
+
+def test_block_waits_for_room_then_drops():
+    queue = BoundedEventQueue(maxsize=1, policy='block', block_timeout=0.05)
+    queue.put('a')
+    started = time.monotonic()
+    assert not queue.put('b')
+    assert time.monotonic() - started >= 0.04
+    threading.Timer(0.02, queue.get).start()
+    queue.block_timeout = 1.0
+    assert queue.put('c')
+    assert queue.get(timeout=0) == 'c'
+
+def test_non_blocking_put_never_waits():
+    queue = BoundedEventQueue(maxsize=1, policy='block', block_timeout=5.0)
+    queue.put('a')
+    started = time.monotonic()
+    assert not queue.put('b', block=False)
+    assert time.monotonic() - started < 0.5
+    assert queue.dropped == 1
+
+def test_sample_thins_out_above_half_capacity():
+    queue = BoundedEventQueue(maxsize=4, policy='sample', sample_every=2)
+    results = [queue.put(i) for i in range(8)]
+    assert results[:2] == [True, True]
+    assert len(queue) <= 4
+    assert queue.sampled_out > 0
+
+def test_unknown_policy_is_rejected():
+    with pytest.raises(ValueError):
+        BoundedEventQueue(policy='nope')
+
+def test_publish_delivers_matching_events_off_thread():
+    bus = EventBus('test')
+    received, threads = [], []
+
+    def on_event(data):
+        received.append(data)
+        threads.append(threading.current_thread())
+
+    bus.subscribe(on_event, event_types=['wanted'])
+    assert not bus.publish('other', {'n': 0})
+    payload = {'n': 1}
+    assert bus.publish('wanted', payload)
+    payload['n'] = 2
+    assert bus.flush(2.0)
+    assert received == [{'n': 1}]
+    assert threads[0] is not threading.current_thread()
+
+def test_slow_subscriber_does_not_delay_others():
+    bus = EventBus('test', subscriber_queue=2)
+    release = threading.Event()
+    fast = []
+    bus.subscribe(lambda data: release.wait(2.0), name='slow')
+    bus.subscribe(fast.append, name='fast')
+    for i in range(10):
+        bus.publish('tick', i)
+        time.sleep(0.005)
+    deadline = time.monotonic() + 2.0
+    while len(fast) < 10 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert fast == list(range(10))
+    release.set()
+    assert bus.flush(2.0)
+    stats = bus.get_stats()['subscribers']
+    assert stats['slow#1']['dropped'] > 0
+    assert stats['fast#2']['dropped'] == 0
+
+def test_callback_errors_are_counted_not_raised():
+    bus = EventBus('test')
+
+    def broken(data):
+        raise RuntimeError('boom')
+
+    subscription = bus.subscribe(broken)
+    bus.publish('tick', 1)
+    assert bus.flush(2.0)
+    assert subscription.get_stats()['errors'] == 1
+
+def test_unsubscribe_stops_delivery():
+    bus = EventBus('test')
+    received = []
+    subscription = bus.subscribe(received.append)
+    bus.publish('tick', 1)
+    assert bus.flush(2.0)
+    bus.unsubscribe(subscription)
+    assert not bus.publish('tick', 2)
+    assert received == [1]
+
+def test_pass_event_type():
+    bus = EventBus('test')
+    received = []
+    bus.subscribe(lambda event_type, data: received.append((event_type, data)), pass_event_type=True)
+    bus.publish('tick', 1)
+    assert bus.flush(2.0)
+    assert received == [('tick', 1)]
+
+def test_create_event_bus_falls_back_on_unknown_policy():
+    bus = create_event_bus('test', {'event_backpressure': 'nope', 'event_queue_size': 7})
+    assert bus.policy == 'drop_oldest'
+    assert bus.subscriber_queue == 7
+    assert create_event_bus('test', {}).policy == 'drop_oldest'
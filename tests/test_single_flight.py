@@ -0,0 +1,134 @@
+"""Tests for coalescing identical in-flight tool calls"""
+import asyncio
+import threading
+
+import pytest
+from strands.tools.mcp import MCPClient
+
+from utils.single_flight import SingleFlight
+from utils.strands_mcp_agent import FilteredMCPClient
+from utils.timeout_policy import TimeoutPolicy
+from utils.tool_result_cache import ToolResultCache
+
+KEY = ('s1', 'search', '{"q":"x"}')
+
+def test_first_caller_leads_and_later_callers_follow():
+    flights = SingleFlight()
+    future, leader = flights.join(KEY)
+    follower_future, follower_leads = flights.join(KEY)
+    assert leader and not follower_leads
+    assert follower_future is future
+    flights.finish(KEY, future, ({'content': []}, False))
+    assert future.result() == ({'content': []}, False)
+    _, leader = flights.join(KEY)
+    assert leader
+    stats = flights.get_stats()
+    assert (stats['executed'], stats['coalesced']) == (2, 1)
+    assert stats['coalesced_by_tool'] == {'s1/search': 1}
+
+def test_finish_hands_out_a_private_copy():
+    flights = SingleFlight()
+    future, _ = flights.join(KEY)
+    outcome = {'content': [{'text': 'a'}]}
+    flights.finish(KEY, future, outcome)
+    outcome['content'][0]['text'] = 'changed'
+    assert future.result()['content'][0]['text'] == 'a'
+
+def test_leader_cancellation_reaches_followers_as_runtime_error():
+    flights = SingleFlight()
+    future, _ = flights.join(KEY)
+    flights.finish(KEY, future, error=asyncio.CancelledError())
+    with pytest.raises(RuntimeError):
+        future.result()
+
+def test_should_coalesce_only_shareable_tools():
+    flights = SingleFlight()
+    flights.configure({'active_servers': {'s1': {'coalesce_tools': ['a'], 'cache_tools': {'b': 0}}}, 'settings': {}})
+    assert flights.should_coalesce('s1', 'a')
+    assert flights.should_coalesce('s1', 'b')
+    assert flights.should_coalesce('s1', 'c', read_only=True)
+    assert not flights.should_coalesce('s1', 'c')
+    flights.configure({'active_servers': {'s1': {'coalesce_tools': ['a']}}, 'settings': {'tool_coalescing_enabled': False}})
+    assert not flights.should_coalesce('s1', 'a', read_only=True)
+
+def test_wait_timeout_leaves_the_flight_running():
+    flights = SingleFlight()
+    future, _ = flights.join(KEY)
+
+    async def main():
+        with pytest.raises(asyncio.TimeoutError):
+            await SingleFlight.wait(future, timeout=0.05)
+        assert not future.cancelled()
+        flights.finish(KEY, future, 'done')
+        assert await SingleFlight.wait(future) == 'done'
+
+    asyncio.run(main())
+
+@pytest.fixture
+def fake_server(monkeypatch):
+    """Replace the MCP round trip with a counted, controllable coroutine"""
+    calls = []
+    release = threading.Event()
+
+    async def call_tool_async(self, tool_use_id, name, arguments=None, **kwargs):
+        calls.append((name, arguments))
+        while not release.is_set():
+            await asyncio.sleep(0.01)
+        return {'status': 'success', 'toolUseId': tool_use_id, 'content': [{'text': f"{name}:{arguments}"}]}
+
+    monkeypatch.setattr(MCPClient, 'call_tool_async', call_tool_async)
+    return calls, release
+
+def _client(**settings):
+    config = {'active_servers': {'s1': {'coalesce_tools': ['search']}}, 'settings': settings}
+    flights, cache = SingleFlight(), ToolResultCache()
+    flights.configure(config)
+    cache.configure(config)
+    return FilteredMCPClient(
+        lambda: None, server_id='s1', single_flight=flights, result_cache=cache, timeouts=TimeoutPolicy(config)
+    )
+
+def test_identical_concurrent_calls_share_one_request(fake_server):
+    calls, release = fake_server
+    client = _client()
+
+    async def main():
+        tasks = [asyncio.ensure_future(client.call_tool_async(f"t{i}", 'search', {'q': 'x'})) for i in range(3)]
+        other = asyncio.ensure_future(client.call_tool_async('t9', 'search', {'q': 'y'}))
+        await asyncio.sleep(0.05)
+        release.set()
+        return await asyncio.gather(*tasks), await other
+
+    results, other = asyncio.run(main())
+    assert len(calls) == 2
+    assert [r['toolUseId'] for r in results] == ['t0', 't1', 't2']
+    assert all(r['content'] == [{'text': "search:{'q': 'x'}"}] for r in results)
+    assert other['content'] == [{'text': "search:{'q': 'y'}"}]
+    assert client.single_flight.get_stats()['coalesced'] == 2
+
+def test_unlisted_tools_are_not_coalesced(fake_server):
+    calls, release = fake_server
+    client = _client()
+    release.set()
+
+    async def main():
+        await asyncio.gather(*[client.call_tool_async(f"t{i}", 'write', {'q': 'x'}) for i in range(3)])
+
+    asyncio.run(main())
+    assert len(calls) == 3
+
+def test_follower_times_out_on_its_own(fake_server):
+    calls, release = fake_server
+    client = _client(tool_timeout=5)
+
+    async def main():
+        leader = asyncio.ensure_future(client.call_tool_with_timeout('t0', 'search', {'q': 'x'}))
+        await asyncio.sleep(0.02)
+        result, timed_out = await client.call_tool_with_timeout('t1', 'search', {'q': 'x'}, timeout=0.05)
+        release.set()
+        return result, timed_out, await leader
+
+    result, timed_out, (leader_result, leader_timed_out) = asyncio.run(main())
+    assert timed_out and result['status'] == 'error' and result['toolUseId'] == 't1'
+    assert not leader_timed_out and leader_result['status'] == 'success'
+    assert len(calls) == 1
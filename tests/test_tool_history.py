@@ -0,0 +1,87 @@
+"""Tests for the indexed tool call ring buffer"""
+import json
+import random
+
+from utils.tool_history import ToolCallHistory
+
+def _record(server_id='s1', tool_name='echo', status='executing'):
+    return {'server_id': server_id, 'tool_name': tool_name, 'status': status}
+
+def test_append_assigns_increasing_ids():
+    history = ToolCallHistory(capacity=10)
+    ids = [history.append(_record()) for _ in range(3)]
+    assert ids == [1, 2, 3]
+    assert history.total_calls == 3
+
+def test_capacity_evicts_oldest_and_unindexes():
+    history = ToolCallHistory(capacity=3)
+    for i in range(5):
+        history.append(_record(server_id=f"s{i % 2}"))
+    assert len(history) == 3
+    assert [r['id'] for r in history] == [3, 4, 5]
+    assert history.get_stats()['evicted'] == 2
+    assert [r['id'] for r in history.query(server_id='s0')['history']] == [3, 5]
+
+def test_update_moves_record_between_status_indexes():
+    history = ToolCallHistory(capacity=10)
+    call_id = history.append(_record())
+    history.update(call_id, status='completed', result='ok')
+    assert history.query(status='executing')['history'] == []
+    completed = history.query(status='completed')['history']
+    assert [r['id'] for r in completed] == [call_id]
+    assert completed[0]['result'] == 'ok'
+
+def test_update_of_evicted_record_returns_none():
+    history = ToolCallHistory(capacity=1)
+    first = history.append(_record())
+    history.append(_record())
+    assert history.update(first, status='completed') is None
+
+def test_query_pages_backwards_with_cursor():
+    history = ToolCallHistory(capacity=100)
+    for _ in range(7):
+        history.append(_record())
+    page = history.query(limit=3)
+    assert [r['id'] for r in page['history']] == [5, 6, 7]
+    page = history.query(limit=3, cursor=page['next_cursor'])
+    assert [r['id'] for r in page['history']] == [2, 3, 4]
+    page = history.query(limit=3, cursor=page['next_cursor'])
+    assert [r['id'] for r in page['history']] == [1]
+    assert page['next_cursor'] is None
+
+def test_query_combines_filters():
+    history = ToolCallHistory(capacity=100)
+    history.append(_record('s1', 'echo'))
+    history.append(_record('s1', 'slow'))
+    history.append(_record('s2', 'echo'))
+    result = history.query(server_id='s1', tool_name='echo')['history']
+    assert [(r['server_id'], r['tool_name']) for r in result] == [('s1', 'echo')]
+    assert history.query(server_id='missing')['history'] == []
+
+def test_query_returns_copies():
+    history = ToolCallHistory(capacity=10)
+    history.append(_record())
+    history.query()['history'][0]['status'] = 'tampered'
+    assert history.query()['history'][0]['status'] == 'executing'
+
+def test_indexes_match_brute_force_under_random_operations():
+    rng = random.Random(7)
+    history = ToolCallHistory(capacity=20)
+    ids = []
+    for _ in range(500):
+        if ids and rng.random() < 0.4:
+            history.update(rng.choice(ids), status=rng.choice(['completed', 'failed']))
+        else:
+            ids.append(history.append(_record(rng.choice(['a', 'b']), rng.choice(['x', 'y']))))
+        server_id, status = rng.choice(['a', 'b']), rng.choice(['executing', 'completed', 'failed'])
+        expected = [r['id'] for r in history if r['server_id'] == server_id and r['status'] == status]
+        assert [r['id'] for r in history.query(server_id=server_id, status=status, limit=100)['history']] == expected
+
+def test_evicted_records_spill_to_jsonl(tmp_path):
+    spill = tmp_path / 'history.jsonl'
+    history = ToolCallHistory(capacity=2, spill_path=str(spill), spill_batch=2)
+    for _ in range(5):
+        history.append(_record())
+    history.flush_spill()
+    spilled = [json.loads(line)['id'] for line in spill.read_text().splitlines()]
+    assert spilled == [1, 2, 3]
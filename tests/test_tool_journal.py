@@ -0,0 +1,45 @@
+"""Tests for the durable tool call journal"""
+import io
+import json
+
+from utils.tool_journal import ToolCallJournal
+
+def _journal(tmp_path, **kwargs):
+    return ToolCallJournal(str(tmp_path / 'calls.jsonl'), retention_days=0, **kwargs)
+
+def _call(call_id, status='completed', server_id='s1'):
+    return {'call_id': call_id, 'server_id': server_id, 'status': status, 'timestamp': f"2030-01-01T00:00:{call_id:02d}"}
+
+def test_read_segment_backwards_handles_lines_across_blocks():
+    lines = [json.dumps({'call_id': i, 'pad': 'x' * i}) for i in range(50)]
+    data = ('\n'.join(lines) + '\n').encode('utf-8')
+    records = list(ToolCallJournal._read_segment_backwards(io.BytesIO(data), len(data), block_size=7))
+    assert [r['call_id'] for r in records] == list(range(49, -1, -1))
+
+def test_read_segment_backwards_skips_torn_lines():
+    data = b'{"call_id": 1}\n{"call_id": 2}\n{"call_'
+    records = list(ToolCallJournal._read_segment_backwards(io.BytesIO(data), len(data), block_size=4))
+    assert [r['call_id'] for r in records] == [2, 1]
+
+def test_query_returns_latest_snapshot_per_call(tmp_path):
+    journal = _journal(tmp_path)
+    for call_id in range(5):
+        journal.append(_call(call_id, 'executing'))
+    journal.append(_call(3))
+    journal.append(_call(4, 'failed', server_id='s2'))
+    assert [r['status'] for r in journal.query()] == ['executing'] * 3 + ['completed', 'failed']
+    assert [r['call_id'] for r in journal.query(status='completed')] == [3]
+    assert [r['call_id'] for r in journal.query(server_id='s1', limit=2)] == [2, 3]
+    journal.close()
+
+def test_rotation_keeps_segments_near_max_bytes(tmp_path):
+    journal = _journal(tmp_path, max_bytes=2000, backups=10)
+    for call_id in range(60):
+        journal.append(_call(call_id))
+    journal.flush()
+    line_size = len(json.dumps(_call(59), default=str)) + 100
+    segments = sorted(tmp_path.glob('calls.jsonl*'))
+    assert journal.rotations >= 2
+    assert all(segment.stat().st_size < 2000 + line_size for segment in segments)
+    assert [r['call_id'] for r in journal.query(limit=1000)] == list(range(60))
+    journal.close()
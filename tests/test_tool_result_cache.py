@@ -0,0 +1,82 @@
+"""Tests for the TTL + LRU cache of read-only tool results"""
+from utils.tool_result_cache import ToolResultCache
+
+def _result(text='ok'):
+    return {'status': 'success', 'content': [{'text': text}]}
+
+def _config(cache_tools=None, **settings):
+    server = {'name': 'Server'}
+    if cache_tools is not None:
+        server['cache_tools'] = cache_tools
+    return {'active_servers': {'s1': server}, 'settings': settings}
+
+def test_make_key_canonicalizes_arguments():
+    assert ToolResultCache.make_key('s1', 't', {'a': 1, 'b': 2}) == ToolResultCache.make_key('s1', 't', {'b': 2, 'a': 1})
+    assert ToolResultCache.make_key('s1', 't', None) == ToolResultCache.make_key('s1', 't', {})
+    assert ToolResultCache.make_key('s1', 't', {'a': 1}) != ToolResultCache.make_key('s2', 't', {'a': 1})
+
+def test_get_returns_copy_and_counts_hits_and_misses():
+    cache = ToolResultCache()
+    key = ToolResultCache.make_key('s1', 't', {})
+    assert cache.get(key) is None
+    cache.put(key, _result(), ttl=60)
+    hit = cache.get(key)
+    hit['content'][0]['text'] = 'changed'
+    assert cache.get(key) == _result()
+    stats = cache.get_stats()
+    assert (stats['hits'], stats['misses']) == (2, 1)
+
+def test_entries_expire_after_ttl(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr('utils.tool_result_cache.time.monotonic', lambda: now[0])
+    cache = ToolResultCache()
+    key = ToolResultCache.make_key('s1', 't', {})
+    cache.put(key, _result(), ttl=10)
+    now[0] += 9.9
+    assert cache.get(key) is not None
+    now[0] += 0.2
+    assert cache.get(key) is None
+    assert cache.get_stats()['expirations'] == 1
+
+def test_lru_eviction_keeps_recently_used():
+    cache = ToolResultCache(max_entries=2)
+    a, b, c = (ToolResultCache.make_key('s1', name, {}) for name in 'abc')
+    cache.put(a, _result('a'), 60)
+    cache.put(b, _result('b'), 60)
+    cache.get(a)
+    cache.put(c, _result('c'), 60)
+    assert cache.get(b) is None
+    assert cache.get(a) is not None and cache.get(c) is not None
+    assert cache.get_stats()['evictions'] == 1
+
+def test_ttl_for_uses_config_and_read_only_hint():
+    cache = ToolResultCache()
+    cache.configure(_config({'listed': 30, 'off': 0}, tool_cache_ttl=120))
+    assert cache.ttl_for('s1', 'listed') == 30
+    assert cache.ttl_for('s1', 'off', read_only=True) is None
+    assert cache.ttl_for('s1', 'hinted', read_only=True) == 120
+    assert cache.ttl_for('s1', 'other') is None
+
+def test_list_form_uses_default_ttl_and_hint_can_be_ignored():
+    cache = ToolResultCache()
+    cache.configure(_config(['listed'], tool_cache_ttl=45, tool_cache_read_only_hint=False))
+    assert cache.ttl_for('s1', 'listed') == 45
+    assert cache.ttl_for('s1', 'hinted', read_only=True) is None
+
+def test_disabling_clears_entries():
+    cache = ToolResultCache()
+    key = ToolResultCache.make_key('s1', 't', {})
+    cache.put(key, _result(), 60)
+    cache.configure(_config(['t'], tool_cache_enabled=False))
+    assert cache.ttl_for('s1', 't') is None
+    assert cache.get_stats()['entries'] == 0
+
+def test_invalidate_by_server_and_tool():
+    cache = ToolResultCache()
+    keys = [ToolResultCache.make_key(s, t, {}) for s in ('s1', 's2') for t in ('a', 'b')]
+    for key in keys:
+        cache.put(key, _result(), 60)
+    assert cache.invalidate('s1', 'a') == 1
+    assert cache.invalidate('s1') == 1
+    assert cache.get_stats()['entries'] == 2
+    assert cache.invalidate() == 2
@@ -1,7 +1,15 @@
 """
 Utils package for MCP Demo
 """
-from .mcp_client import MCPClientManager
-from .strands_mcp_agent import StrandsMCPAgent
 
-__all__ = ['MCPClientManager', 'StrandsMCPAgent']
\ No newline at end of file
+__all__ = ['MCPClientManager', 'StrandsMCPAgent']
+
+def __getattr__(name):
+    # Import on first access so that importing a light utils module doesn't pull in strands/boto3
+    if name == 'MCPClientManager':
+        from .mcp_client import MCPClientManager
+        return MCPClientManager
+    if name == 'StrandsMCPAgent':
+        from .strands_mcp_agent import StrandsMCPAgent
+        return StrandsMCPAgent
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,167 @@
+"""
+Strands Agent Cache
+Reuses Agent instances across chat turns instead of re-registering and
+re-validating every tool spec on each message
+"""
+import asyncio
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from contextlib import asynccontextmanager, contextmanager
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from strands.agent.state import AgentState
+from strands.telemetry.metrics import EventLoopMetrics
+
+logger = logging.getLogger(__name__)
+
+AgentKey = Tuple[str, float, int, str]
+
+class AgentCache:
+    """LRU cache of Agent instances keyed by model, sampling parameters and tool set
+
+    An Agent can only serve one invocation at a time, so each key holds a
+    small list of idle instances that are checked out for a turn and
+    returned afterwards. Keys are evicted least-recently-used first.
+    """
+
+    def __init__(self, max_entries: int = 8, max_idle_per_entry: int = 4):
+        self.max_entries = max_entries
+        self.max_idle_per_entry = max_idle_per_entry
+        self._entries: "OrderedDict[AgentKey, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(model_id: str, temperature: float, max_tokens: int, tool_ids: Iterable[str]) -> AgentKey:
+        """Build a cache key from the model settings and a hash of the enabled tool set"""
+        tools_hash = hashlib.sha1('\n'.join(sorted(tool_ids)).encode('utf-8')).hexdigest()
+        return (model_id, float(temperature), int(max_tokens), tools_hash)
+
+    @contextmanager
+    def checkout(
+        self,
+        key: AgentKey,
+        factory: Callable[[], Any],
+        tool_ids: Iterable[str] = (),
+        server_ids: Iterable[str] = ()
+    ) -> Iterator[Any]:
+        """Borrow an Agent for one turn, building a new one on a miss"""
+        entry, agent = self._take(key, tool_ids, server_ids)
+        if agent is None:
+            agent = factory()
+        try:
+            yield agent
+        finally:
+            self._give_back(key, entry, agent)
+
+    @asynccontextmanager
+    async def acheckout(
+        self,
+        key: AgentKey,
+        factory: Callable[[], Any],
+        tool_ids: Iterable[str] = (),
+        server_ids: Iterable[str] = ()
+    ):
+        """checkout() for async callers: a new Agent is built on a worker thread
+
+        Building one creates the Bedrock client and validates every tool
+        spec, which would otherwise stall the shared event loop.
+        """
+        entry, agent = self._take(key, tool_ids, server_ids)
+        if agent is None:
+            agent = await asyncio.to_thread(factory)
+        try:
+            yield agent
+        finally:
+            self._give_back(key, entry, agent)
+
+    def _take(self, key: AgentKey, tool_ids: Iterable[str], server_ids: Iterable[str]) -> Tuple[Dict[str, Any], Any]:
+        """Get the key's entry and an idle Agent (reset for a new turn), or None on a miss"""
+        agent = None
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                entry = {
+                    'idle': [],
+                    'model_id': key[0],
+                    'tool_ids': frozenset(tool_ids),
+                    'server_ids': frozenset(server_ids)
+                }
+                self._entries[key] = entry
+                self._evict_locked()
+            else:
+                self._entries.move_to_end(key)
+                if entry['idle']:
+                    agent = entry['idle'].pop()
+            if agent is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+
+        if agent is not None:
+            self.reset(agent)
+        return entry, agent
+
+    def _give_back(self, key: AgentKey, entry: Dict[str, Any], agent: Any):
+        with self._lock:
+            # Only return the agent if its entry survived invalidation
+            if self._entries.get(key) is entry and len(entry['idle']) < self.max_idle_per_entry:
+                entry['idle'].append(agent)
+
+    @staticmethod
+    def reset(agent: Any):
+        """Clear per-invocation state so a reused Agent starts like a new one
+
+        Messages, agent state and event loop metrics (cycle durations and
+        traces) would otherwise carry over from every earlier turn.
+        """
+        agent.messages = []
+        agent.state = AgentState()
+        agent.event_loop_metrics = EventLoopMetrics()
+
+    def _evict_locked(self):
+        """Drop least recently used entries beyond max_entries"""
+        while len(self._entries) > self.max_entries:
+            evicted_key, _ = self._entries.popitem(last=False)
+            logger.debug(f"Evicted cached agent for model {evicted_key[0]}")
+
+    def invalidate(
+        self,
+        model_id: Optional[str] = None,
+        server_id: Optional[str] = None,
+        tool_ids: Optional[Iterable[str]] = None
+    ) -> int:
+        """Drop entries built for a model, for a server's tools, or containing any of the given tools"""
+        tool_ids = frozenset(tool_ids) if tool_ids is not None else None
+        with self._lock:
+            stale: List[AgentKey] = []
+            for key, entry in self._entries.items():
+                if model_id is not None and entry['model_id'] == model_id:
+                    stale.append(key)
+                elif server_id is not None and server_id in entry['server_ids']:
+                    stale.append(key)
+                elif tool_ids is not None and entry['tool_ids'] & tool_ids:
+                    stale.append(key)
+            for key in stale:
+                del self._entries[key]
+        if stale:
+            logger.info(f"Invalidated {len(stale)} cached agent(s)")
+        return len(stale)
+
+    def clear(self):
+        """Drop all cached agents"""
+        with self._lock:
+            self._entries.clear()
+
+    def get_stats(self) -> Dict[str, int]:
+        """Get cache hit/miss statistics"""
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'idle_agents': sum(len(e['idle']) for e in self._entries.values()),
+                'hits': self.hits,
+                'misses': self.misses
+            }
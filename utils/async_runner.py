@@ -0,0 +1,116 @@
+"""
+Background Event Loop Runner
+Runs one long-lived asyncio event loop in a dedicated thread so that sync
+Flask routes and Socket.IO handlers can share async MCP sessions and caches
+"""
+import asyncio
+import atexit
+import logging
+import threading
+import concurrent.futures
+from typing import Any, Awaitable, Optional
+
+logger = logging.getLogger(__name__)
+
+class AsyncLoopRunner:
+    """Owns a background event loop and runs coroutines on it from any thread"""
+
+    def __init__(self, name: str = "mcp-event-loop"):
+        self.name = name
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._started = threading.Event()
+        self._lock = threading.Lock()
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        """The running background loop, started on first use"""
+        self.start()
+        return self._loop
+
+    @property
+    def is_running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        """Start the loop thread if it is not already running"""
+        with self._lock:
+            if self.is_running:
+                return
+            self._started.clear()
+            self._loop = asyncio.new_event_loop()
+            self._thread = threading.Thread(target=self._run_loop, name=self.name, daemon=True)
+            self._thread.start()
+        self._started.wait()
+        logger.info(f"Started background event loop thread: {self.name}")
+
+    def _run_loop(self):
+        loop = self._loop
+        asyncio.set_event_loop(loop)
+        loop.call_soon(self._started.set)
+        try:
+            loop.run_forever()
+        finally:
+            loop.close()
+
+    def submit(self, coro: Awaitable[Any]) -> concurrent.futures.Future:
+        """Schedule a coroutine on the loop and return a thread-safe future"""
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
+
+    def run(self, coro: Awaitable[Any], timeout: Optional[float] = None) -> Any:
+        """Run a coroutine on the loop and block the calling thread for its result
+
+        On timeout the task is cancelled on the loop and asyncio.TimeoutError
+        is raised to the caller.
+        """
+        if self.is_running and threading.current_thread() is self._thread:
+            raise RuntimeError("AsyncLoopRunner.run() cannot be called from the loop thread")
+
+        future = self.submit(coro)
+        try:
+            return future.result(timeout=timeout)
+        except concurrent.futures.TimeoutError:
+            future.cancel()
+            raise asyncio.TimeoutError(f"Operation timed out after {timeout} seconds")
+        except BaseException:
+            # Propagate caller-side interruption (e.g. KeyboardInterrupt) to the task
+            future.cancel()
+            raise
+
+    def shutdown(self, timeout: float = 5.0):
+        """Cancel outstanding tasks, stop the loop and join its thread"""
+        with self._lock:
+            if not self.is_running:
+                return
+            loop, thread = self._loop, self._thread
+
+        async def _cancel_pending():
+            tasks = [t for t in asyncio.all_tasks() if t is not asyncio.current_task()]
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+        try:
+            asyncio.run_coroutine_threadsafe(_cancel_pending(), loop).result(timeout=timeout)
+        except Exception as e:
+            logger.warning(f"Error cancelling pending tasks during shutdown: {str(e)}")
+
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join(timeout=timeout)
+        with self._lock:
+            self._thread = None
+            self._loop = None
+        logger.info(f"Stopped background event loop thread: {self.name}")
+
+# Singleton instance
+_loop_runner = None
+_loop_runner_lock = threading.Lock()
+
+def get_loop_runner() -> AsyncLoopRunner:
+    """Get or create the shared background loop runner"""
+    global _loop_runner
+    with _loop_runner_lock:
+        if _loop_runner is None:
+            _loop_runner = AsyncLoopRunner()
+            atexit.register(_loop_runner.shutdown)
+    return _loop_runner
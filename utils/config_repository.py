@@ -0,0 +1,238 @@
+"""
+MCP Config Repository
+Single in-memory copy of data/mcp_servers.json shared by the API routes,
+MCPClientManager and StrandsMCPAgent, reloaded only when the file changes
+and written back atomically in debounced batches
+"""
+import os
+import json
+import atexit
+import logging
+import tempfile
+import threading
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+StatKey = Tuple[int, int, int]
+
+# Read once at import: os.umask can only be read by setting it
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
+def replacement_mode(path: Path) -> int:
+    """Permissions for a file about to replace `path`
+
+    mkstemp creates files as 0600 and os.replace keeps that, so temp files
+    take the target's current mode, or the umask default for a new file.
+    """
+    try:
+        return os.stat(path).st_mode & 0o7777
+    except FileNotFoundError:
+        return 0o666 & ~_UMASK
+
+def atomic_write_json(path: Path, data: Any):
+    """Write JSON to a temp file in the same directory and rename it over the target
+
+    Readers see either the old or the new file, never a partial write.
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix='.tmp')
+    try:
+        os.fchmod(fd, replacement_mode(path))
+        with os.fdopen(fd, 'w') as f:
+            json.dump(data, f, indent=2)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+
+class DebouncedWriter:
+    """Write-behind JSON persistence that coalesces saves within a short window
+
+    The first schedule() starts a timer; later calls before it fires only
+    replace the pending data, so a burst of changes costs one write.
+    """
+
+    def __init__(self, path: Path, delay: float = 0.25, on_written: Optional[Callable[[], None]] = None):
+        self.path = Path(path)
+        self.delay = delay
+        self.on_written = on_written
+        self._pending: Optional[Any] = None
+        self._timer: Optional[threading.Timer] = None
+        self._writing = False
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self.scheduled = 0
+        self.writes = 0
+        atexit.register(self.flush)
+
+    @property
+    def busy(self) -> bool:
+        """Whether a write is pending or in progress"""
+        with self._lock:
+            return self._pending is not None or self._writing
+
+    def schedule(self, data: Any):
+        """Queue data to be written, replacing any not yet written"""
+        with self._lock:
+            self._pending = data
+            self.scheduled += 1
+            if self._timer is None:
+                self._timer = threading.Timer(self.delay, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+
+    def flush(self):
+        """Write pending data now"""
+        with self._write_lock:
+            with self._lock:
+                if self._timer is not None:
+                    self._timer.cancel()
+                    self._timer = None
+                data, self._pending = self._pending, None
+                if data is None:
+                    return
+                self._writing = True
+            try:
+                atomic_write_json(self.path, data)
+                self.writes += 1
+                if self.on_written:
+                    self.on_written()
+            except Exception as e:
+                logger.error(f"Failed to write {self.path}: {str(e)}")
+            finally:
+                with self._lock:
+                    self._writing = False
+
+class ConfigRepository:
+    """Serves the MCP config from memory and reloads it when the file's stat changes
+
+    A change is detected by comparing (st_mtime_ns, st_ino, st_size), so
+    both in-place edits and editors that replace the file are picked up.
+    Snapshots are replaced on reload, never mutated; treat them as read-only.
+    """
+
+    def __init__(self, path: str = "data/mcp_servers.json", write_delay: float = 0.25):
+        self.path = Path(path)
+        self.writer = DebouncedWriter(self.path, write_delay, on_written=self._record_written)
+        self._data: Dict[str, Any] = {'active_servers': {}, 'settings': {}}
+        self._stat_key: Optional[StatKey] = None
+        self._loaded = False
+        self._listeners: List[Callable[[Dict[str, Any]], None]] = []
+        self._lock = threading.RLock()
+        self.version = 0
+        self.reloads = 0
+
+    def _current_stat_key(self) -> Optional[StatKey]:
+        try:
+            st = os.stat(self.path)
+        except FileNotFoundError:
+            return None
+        return (st.st_mtime_ns, st.st_ino, st.st_size)
+
+    def refresh(self, force: bool = False) -> bool:
+        """Reload the file if it changed on disk since the last read"""
+        stat_key = self._current_stat_key()
+        with self._lock:
+            if not force and self._loaded and stat_key == self._stat_key:
+                return False
+            if self._loaded and self.writer.busy:
+                # Unwritten local changes take precedence over the file
+                return False
+
+            if stat_key is None:
+                data = {'active_servers': {}, 'settings': {}}
+            else:
+                try:
+                    with open(self.path, 'r') as f:
+                        data = json.load(f)
+                except (OSError, ValueError) as e:
+                    # Keep serving the last good snapshot if the file is mid-write or invalid
+                    logger.error(f"Failed to load MCP config {self.path}: {str(e)}")
+                    return False
+
+            data.setdefault('active_servers', {})
+            data.setdefault('settings', {})
+            self._data = data
+            self._stat_key = stat_key
+            self._loaded = True
+            self.version += 1
+            self.reloads += 1
+            listeners = list(self._listeners)
+
+        logger.info(f"Loaded MCP config {self.path} ({len(data['active_servers'])} servers)")
+        self._notify(listeners, data)
+        return True
+
+    def get(self) -> Dict[str, Any]:
+        """Get the current config snapshot, reloading first if the file changed"""
+        self.refresh()
+        with self._lock:
+            return self._data
+
+    def get_servers(self) -> Dict[str, Dict[str, Any]]:
+        return self.get()['active_servers']
+
+    def get_settings(self) -> Dict[str, Any]:
+        return self.get()['settings']
+
+    def save(self, config: Dict[str, Any], immediate: bool = False):
+        """Make a new config the in-memory snapshot and schedule writing it to disk"""
+        with self._lock:
+            config.setdefault('active_servers', {})
+            config.setdefault('settings', {})
+            self._data = config
+            self._loaded = True
+            self.version += 1
+            self.writer.schedule(config)
+            listeners = list(self._listeners)
+        self._notify(listeners, config)
+        if immediate:
+            self.writer.flush()
+
+    def flush(self):
+        """Write any pending config change to disk now"""
+        self.writer.flush()
+
+    def _record_written(self):
+        # Our own write shouldn't trigger a re-read on the next refresh
+        with self._lock:
+            self._stat_key = self._current_stat_key()
+
+    def subscribe(self, callback: Callable[[Dict[str, Any]], None]):
+        """Call `callback(config)` whenever a new snapshot is loaded or saved"""
+        with self._lock:
+            self._listeners.append(callback)
+
+    def unsubscribe(self, callback: Callable[[Dict[str, Any]], None]):
+        with self._lock:
+            if callback in self._listeners:
+                self._listeners.remove(callback)
+
+    @staticmethod
+    def _notify(listeners: List[Callable[[Dict[str, Any]], None]], data: Dict[str, Any]):
+        for callback in listeners:
+            try:
+                callback(data)
+            except Exception as e:
+                logger.error(f"MCP config listener failed: {str(e)}")
+
+# One repository per config file
+_repositories: Dict[str, ConfigRepository] = {}
+_repositories_lock = threading.Lock()
+
+def get_config_repository(path: str = "data/mcp_servers.json") -> ConfigRepository:
+    """Get or create the shared repository for a config file"""
+    key = os.path.abspath(path)
+    with _repositories_lock:
+        if key not in _repositories:
+            _repositories[key] = ConfigRepository(path)
+        return _repositories[key]
@@ -0,0 +1,163 @@
+"""
+Conversation Store
+Keeps a bounded chat history per browser session instead of one
+process-wide list shared by every user
+"""
+import time
+import logging
+import threading
+from collections import OrderedDict, deque
+from datetime import datetime
+from itertools import islice
+from typing import Dict, List, Optional, Any
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CONVERSATION_ID = 'default'
+
+class Conversation:
+    """Bounded message history for a single conversation"""
+
+    def __init__(self, conversation_id: str, max_messages: int = 50):
+        self.id = conversation_id
+        self.messages: deque = deque(maxlen=max_messages)
+        # Structured Bedrock Converse messages, grouped per turn so that trimming
+        # never splits a toolUse from its toolResult
+        self.turns: deque = deque(maxlen=max(1, max_messages // 2))
+        self.usage: Dict[str, int] = {}  # Token usage summed over the conversation
+        self.created_at = datetime.now()
+        self.last_active = time.monotonic()
+        self._lock = threading.Lock()
+
+    def append(self, role: str, content: str):
+        """Append a message, dropping the oldest once the bound is reached"""
+        with self._lock:
+            self.messages.append({
+                "role": role,
+                "content": content,
+                "timestamp": datetime.now().isoformat()
+            })
+
+    def append_turn(
+        self,
+        user_message: str,
+        assistant_message: str,
+        turn_messages: Optional[List[Dict[str, Any]]] = None
+    ):
+        """Append a user/assistant pair atomically so concurrent turns don't interleave"""
+        with self._lock:
+            timestamp = datetime.now().isoformat()
+            self.messages.append({"role": "user", "content": user_message, "timestamp": timestamp})
+            self.messages.append({"role": "assistant", "content": assistant_message, "timestamp": timestamp})
+            if turn_messages:
+                self.turns.append(list(turn_messages))
+
+    def add_usage(self, usage: Optional[Dict[str, int]]):
+        """Add a turn's token usage to the conversation totals"""
+        with self._lock:
+            for key, value in (usage or {}).items():
+                self.usage[key] = self.usage.get(key, 0) + value
+
+    def get_usage(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self.usage)
+
+    def recent(self, count: int) -> List[Dict[str, Any]]:
+        """Get the last `count` messages in chronological order without copying the rest"""
+        with self._lock:
+            newest_first = list(islice(reversed(self.messages), count))
+        newest_first.reverse()
+        return newest_first
+
+    def get_messages(self, max_turns: int) -> List[Dict[str, Any]]:
+        """Get the structured messages of the last `max_turns` turns as one Converse message list"""
+        with self._lock:
+            recent_turns = list(islice(reversed(self.turns), max_turns))
+        messages = []
+        for turn in reversed(recent_turns):
+            messages.extend(turn)
+        return messages
+
+    def clear(self):
+        with self._lock:
+            self.messages.clear()
+            self.turns.clear()
+            self.usage.clear()
+
+    def get_stats(self) -> Dict[str, int]:
+        with self._lock:
+            user_messages = sum(1 for msg in self.messages if msg['role'] == 'user')
+            total_messages = len(self.messages)
+        return {
+            "total_messages": total_messages,
+            "user_messages": user_messages,
+            "assistant_messages": total_messages - user_messages
+        }
+
+    def __len__(self) -> int:
+        return len(self.messages)
+
+class ConversationStore:
+    """Conversations keyed by session id with LRU eviction of idle conversations"""
+
+    def __init__(self, max_conversations: int = 1000, max_messages: int = 50, idle_timeout: float = 3600.0):
+        self.max_conversations = max_conversations
+        self.max_messages = max_messages
+        self.idle_timeout = idle_timeout
+        self._conversations: "OrderedDict[str, Conversation]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.evicted = 0
+
+    def get(self, conversation_id: Optional[str] = None) -> Conversation:
+        """Get a conversation, creating it if needed, and mark it most recently used"""
+        conversation_id = conversation_id or DEFAULT_CONVERSATION_ID
+        now = time.monotonic()
+        with self._lock:
+            conversation = self._conversations.get(conversation_id)
+            if conversation is None:
+                conversation = Conversation(conversation_id, self.max_messages)
+                self._conversations[conversation_id] = conversation
+            else:
+                self._conversations.move_to_end(conversation_id)
+            conversation.last_active = now
+            self._evict_locked(now)
+        return conversation
+
+    def peek(self, conversation_id: Optional[str] = None) -> Optional[Conversation]:
+        """Get a conversation without creating it or changing its recency"""
+        with self._lock:
+            return self._conversations.get(conversation_id or DEFAULT_CONVERSATION_ID)
+
+    def clear(self, conversation_id: Optional[str] = None):
+        """Clear a conversation's messages"""
+        conversation = self.peek(conversation_id)
+        if conversation is not None:
+            conversation.clear()
+
+    def remove(self, conversation_id: str):
+        with self._lock:
+            self._conversations.pop(conversation_id, None)
+
+    def _evict_locked(self, now: float):
+        """Drop idle conversations from the LRU end, then enforce the size bound"""
+        while self._conversations:
+            oldest_id, oldest = next(iter(self._conversations.items()))
+            over_capacity = len(self._conversations) > self.max_conversations
+            idle = self.idle_timeout and now - oldest.last_active > self.idle_timeout
+            if not (over_capacity or idle):
+                break
+            del self._conversations[oldest_id]
+            self.evicted += 1
+            logger.debug(f"Evicted conversation {oldest_id}")
+
+    def __len__(self) -> int:
+        return len(self._conversations)
+
+    def get_stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "conversations": len(self._conversations),
+                "evicted": self.evicted,
+                "max_conversations": self.max_conversations,
+                "max_messages": self.max_messages
+            }
@@ -0,0 +1,291 @@
+"""
+Event Bus
+Non-blocking publish/subscribe for MCPClientManager and StrandsMCPAgent
+events. Publishing is an O(1) enqueue onto a bounded queue; a dispatcher
+thread fans events out to per-subscriber queues, each drained by its own
+worker so a slow subscriber never delays the publisher or other subscribers.
+"""
+import json
+import time
+import logging
+import threading
+from collections import deque
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from .mcp_settings import effective_settings
+
+logger = logging.getLogger(__name__)
+
+POLICIES = ('drop_oldest', 'block', 'sample')
+
+# (event_type, data, published_at, sequence)
+Event = Tuple[str, Any, float, int]
+
+class BoundedEventQueue:
+    """Bounded FIFO with a backpressure policy applied when it fills up
+
+    - drop_oldest: evict the oldest queued event to make room
+    - block: wait up to block_timeout for room, then drop the new event
+      (non-blocking puts drop it straight away)
+    - sample: above half capacity keep only every `sample_every`-th event,
+      and drop new events while full
+    """
+
+    def __init__(self, maxsize: int = 1000, policy: str = 'drop_oldest',
+                 block_timeout: float = 1.0, sample_every: int = 10):
+        if policy not in POLICIES:
+            raise ValueError(f"Unknown backpressure policy: {policy}")
+        self.maxsize = max(1, int(maxsize))
+        self.policy = policy
+        self.block_timeout = block_timeout
+        self.sample_every = max(1, int(sample_every))
+        self._items: deque = deque()
+        self._cond = threading.Condition()
+        self._offered = 0
+        self.dropped = 0
+        self.sampled_out = 0
+
+    def put(self, item: Any, block: bool = True) -> bool:
+        """Enqueue an item, returning False if the policy discarded it"""
+        with self._cond:
+            self._offered += 1
+            if self.policy == 'sample' and len(self._items) * 2 >= self.maxsize:
+                if self._offered % self.sample_every:
+                    self.sampled_out += 1
+                    return False
+            if len(self._items) >= self.maxsize:
+                if self.policy == 'drop_oldest':
+                    self._items.popleft()
+                    self.dropped += 1
+                elif self.policy == 'block' and block:
+                    deadline = time.monotonic() + self.block_timeout
+                    while len(self._items) >= self.maxsize:
+                        remaining = deadline - time.monotonic()
+                        if remaining <= 0 or not self._cond.wait(remaining):
+                            if len(self._items) >= self.maxsize:
+                                self.dropped += 1
+                                return False
+                else:
+                    self.dropped += 1
+                    return False
+            self._items.append(item)
+            self._cond.notify_all()
+            return True
+
+    def get(self, timeout: Optional[float] = None, on_take: Optional[Callable[[], None]] = None) -> Optional[Any]:
+        """Dequeue the next item, or None after timeout
+
+        `on_take` runs under the queue lock once an item is taken, so
+        wait_empty() callers can't observe an item as neither queued nor taken.
+        """
+        with self._cond:
+            if not self._items and not self._cond.wait_for(lambda: self._items, timeout):
+                return None
+            item = self._items.popleft()
+            if on_take:
+                on_take()
+            self._cond.notify_all()
+            return item
+
+    def wait_empty(self, timeout: float) -> bool:
+        with self._cond:
+            return self._cond.wait_for(lambda: not self._items, timeout)
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+class Subscription:
+    """A subscriber callback with its own queue, worker and lag statistics"""
+
+    def __init__(self, bus: "EventBus", callback: Callable[[Any], None], event_types: Optional[Iterable[str]],
+                 name: str, queue: BoundedEventQueue, pass_event_type: bool = False):
+        self.bus = bus
+        self.callback = callback
+        self.event_types = frozenset(event_types) if event_types else None
+        self.name = name
+        self.queue = queue
+        self.pass_event_type = pass_event_type
+        self.active = True
+        self.busy = False
+        self.delivered = 0
+        self.errors = 0
+        self.last_lag = 0.0
+        self.max_lag = 0.0
+        self.total_lag = 0.0
+        self._thread = threading.Thread(target=self._run, name=f"event-bus-{name}", daemon=True)
+        self._thread.start()
+
+    def wants(self, event_type: str) -> bool:
+        return self.event_types is None or event_type in self.event_types
+
+    def _run(self):
+        while self.active:
+            event = self.queue.get(timeout=0.5, on_take=self._mark_busy)
+            if event is None:
+                continue
+            event_type, data, published_at, _ = event
+            lag = time.monotonic() - published_at
+            try:
+                if self.pass_event_type:
+                    self.callback(event_type, data)
+                else:
+                    self.callback(data)
+            except Exception as e:
+                self.errors += 1
+                logger.error(f"Event callback error ({self.name}, {event_type}): {str(e)}")
+            self.delivered += 1
+            self.last_lag = lag
+            self.total_lag += lag
+            self.max_lag = max(self.max_lag, lag)
+            self.busy = False
+
+    def _mark_busy(self):
+        self.busy = True
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            'event_types': sorted(self.event_types) if self.event_types else None,
+            'pending': len(self.queue),
+            'delivered': self.delivered,
+            'dropped': self.queue.dropped,
+            'sampled_out': self.queue.sampled_out,
+            'errors': self.errors,
+            'last_lag_ms': round(self.last_lag * 1000, 2),
+            'max_lag_ms': round(self.max_lag * 1000, 2),
+            'avg_lag_ms': round(self.total_lag / self.delivered * 1000, 2) if self.delivered else 0.0
+        }
+
+class EventBus:
+    """Bounded, asynchronous event delivery with per-subscriber backpressure"""
+
+    def __init__(self, name: str = 'events', max_queue: int = 1000, policy: str = 'drop_oldest',
+                 subscriber_queue: int = 1000, block_timeout: float = 1.0, sample_every: int = 10):
+        self.name = name
+        self.policy = policy
+        self.subscriber_queue = subscriber_queue
+        self.block_timeout = block_timeout
+        self.sample_every = sample_every
+        self._queue = BoundedEventQueue(max_queue, policy, block_timeout, sample_every)
+        self._subscriptions: List[Subscription] = []
+        self._lock = threading.Lock()
+        self._dispatcher: Optional[threading.Thread] = None
+        self._dispatching = False
+        self.sequence = 0
+        self.published = 0
+
+    def subscribe(
+        self,
+        callback: Callable[..., None],
+        event_types: Optional[Iterable[str]] = None,
+        name: Optional[str] = None,
+        policy: Optional[str] = None,
+        max_queue: Optional[int] = None,
+        pass_event_type: bool = False
+    ) -> Subscription:
+        """Deliver matching events to `callback(data)` (or `callback(event_type, data)`) on a worker thread"""
+        queue = BoundedEventQueue(
+            max_queue or self.subscriber_queue, policy or self.policy, self.block_timeout, self.sample_every
+        )
+        with self._lock:
+            name = f"{name or getattr(callback, '__name__', 'subscriber')}#{len(self._subscriptions) + 1}"
+            subscription = Subscription(self, callback, event_types, name, queue, pass_event_type)
+            self._subscriptions.append(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        subscription.active = False
+        with self._lock:
+            if subscription in self._subscriptions:
+                self._subscriptions.remove(subscription)
+
+    def has_subscribers(self, event_type: str) -> bool:
+        return any(s.wants(event_type) for s in self._subscriptions)
+
+    def publish(self, event_type: str, data: Any = None) -> bool:
+        """Enqueue an event for delivery; never runs subscriber code inline
+
+        Dict payloads are copied so later changes by the publisher don't leak
+        into queued events.
+        """
+        if not self.has_subscribers(event_type):
+            return False
+        if isinstance(data, dict):
+            data = dict(data)
+        self._ensure_dispatcher()
+        with self._lock:
+            self.sequence += 1
+            seq = self.sequence
+        self.published += 1
+        return self._queue.put((event_type, data, time.monotonic(), seq))
+
+    def _ensure_dispatcher(self):
+        if self._dispatcher is not None:
+            return
+        with self._lock:
+            if self._dispatcher is None:
+                self._dispatcher = threading.Thread(target=self._dispatch, name=f"event-bus-{self.name}", daemon=True)
+                self._dispatcher.start()
+
+    def _dispatch(self):
+        while True:
+            event = self._queue.get(on_take=self._mark_dispatching)
+            if event is None:
+                continue
+            with self._lock:
+                subscriptions = [s for s in self._subscriptions if s.wants(event[0])]
+            # Never wait on a subscriber's queue: a full one would hold up delivery to all the others
+            for subscription in subscriptions:
+                subscription.queue.put(event, block=False)
+            self._dispatching = False
+
+    def _mark_dispatching(self):
+        self._dispatching = True
+
+    def flush(self, timeout: float = 5.0) -> bool:
+        """Wait until every queued event has been delivered"""
+        deadline = time.monotonic() + timeout
+        if not self._queue.wait_empty(timeout):
+            return False
+        while self._dispatching and time.monotonic() < deadline:
+            time.sleep(0.001)
+        for subscription in list(self._subscriptions):
+            if not subscription.queue.wait_empty(max(0.0, deadline - time.monotonic())):
+                return False
+            while subscription.busy and time.monotonic() < deadline:
+                time.sleep(0.001)
+        return time.monotonic() < deadline
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            subscriptions = list(self._subscriptions)
+        return {
+            'policy': self.policy,
+            'published': self.published,
+            'queued': len(self._queue),
+            'dropped': self._queue.dropped,
+            'sampled_out': self._queue.sampled_out,
+            'subscribers': {s.name: s.get_stats() for s in subscriptions}
+        }
+
+def create_event_bus(name: str, settings: Dict[str, Any]) -> EventBus:
+    """Build a bus from the event_queue_size / event_backpressure MCP settings"""
+    settings = effective_settings(settings)
+    policy = settings['event_backpressure']
+    if policy not in POLICIES:
+        logger.warning(f"Unknown event_backpressure '{policy}', using drop_oldest")
+        policy = 'drop_oldest'
+    size = int(settings['event_queue_size'])
+    return EventBus(name, max_queue=size, policy=policy, subscriber_queue=size)
+
+def bridge_to_socketio(bus: EventBus, socketio: Any, room: str = 'mcp_client',
+                       event_types: Optional[Iterable[str]] = None, source: Optional[str] = None) -> Subscription:
+    """Forward bus events to a Socket.IO room as `mcp_event` messages
+
+    Payloads are reduced to JSON-safe values; the room sees
+    {'type': event_type, 'source': source, 'data': payload}.
+    """
+    def emit(event_type: str, data: Any):
+        payload = json.loads(json.dumps(data, default=str))
+        socketio.emit('mcp_event', {'type': event_type, 'source': source or bus.name, 'data': payload}, room=room)
+
+    return bus.subscribe(emit, event_types, name=f"socketio:{room}", pass_event_type=True)
@@ -0,0 +1,274 @@
+"""
+Chat Latency Metrics
+Histograms of chat pipeline stage durations (prompt build, MCP session
+entry, tool listing, agent construction, time to first token, model and
+tool calls, total turn) plus a per-turn timer that feeds them
+"""
+import time
+import bisect
+import logging
+import threading
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Bucket upper bounds in seconds
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+
+Labels = Tuple[Tuple[str, str], ...]
+
+class Histogram:
+    """Fixed-bucket latency histogram with interpolated quantiles"""
+
+    def __init__(self, buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)  # Last slot is +Inf
+        self.count = 0
+        self.sum = 0.0
+        self.min: Optional[float] = None
+        self.max: Optional[float] = None
+        self._lock = threading.Lock()
+
+    def observe(self, seconds: float):
+        with self._lock:
+            self.counts[bisect.bisect_left(self.buckets, seconds)] += 1
+            self.count += 1
+            self.sum += seconds
+            self.min = seconds if self.min is None else min(self.min, seconds)
+            self.max = seconds if self.max is None else max(self.max, seconds)
+
+    def _quantile_locked(self, q: float) -> Optional[float]:
+        if not self.count:
+            return None
+        rank = q * self.count
+        cumulative = 0
+        for index, count in enumerate(self.counts):
+            if cumulative + count >= rank and count:
+                lower = self.buckets[index - 1] if index > 0 else 0.0
+                upper = self.buckets[index] if index < len(self.buckets) else self.max
+                estimate = lower + (upper - lower) * (rank - cumulative) / count
+                return min(max(estimate, self.min), self.max)
+            cumulative += count
+        return self.max
+
+    def cumulative_counts(self) -> List[Tuple[float, int]]:
+        """(upper bound, cumulative count) pairs ending with +Inf"""
+        with self._lock:
+            pairs, total = [], 0
+            for bound, count in zip(self.buckets + (float('inf'),), self.counts):
+                total += count
+                pairs.append((bound, total))
+            return pairs
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Summary in milliseconds"""
+        with self._lock:
+            def ms(value):
+                return None if value is None else round(value * 1000, 2)
+            return {
+                'count': self.count,
+                'sum_ms': ms(self.sum),
+                'avg_ms': ms(self.sum / self.count) if self.count else None,
+                'min_ms': ms(self.min),
+                'max_ms': ms(self.max),
+                'p50_ms': ms(self._quantile_locked(0.5)),
+                'p90_ms': ms(self._quantile_locked(0.9)),
+                'p99_ms': ms(self._quantile_locked(0.99))
+            }
+
+class LatencyMetrics:
+    """Stage histograms keyed by stage name and labels, with observation hooks
+
+    Hooks are called as `hook(stage, seconds, labels)` for every observation,
+    so other sinks (logging, exporters) can follow the same data.
+    """
+
+    def __init__(self, buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self._histograms: Dict[str, Dict[Labels, Histogram]] = {}
+        self._hooks: List[Callable[[str, float, Dict[str, str]], None]] = []
+        self._lock = threading.Lock()
+
+    def observe(self, stage: str, seconds: float, labels: Optional[Dict[str, str]] = None):
+        """Record one duration for a stage"""
+        key: Labels = tuple(sorted((labels or {}).items()))
+        with self._lock:
+            series = self._histograms.setdefault(stage, {})
+            histogram = series.get(key)
+            if histogram is None:
+                histogram = series[key] = Histogram(self.buckets)
+            hooks = list(self._hooks)
+        histogram.observe(seconds)
+        for hook in hooks:
+            try:
+                hook(stage, seconds, dict(key))
+            except Exception as e:
+                logger.error(f"Latency metrics hook failed: {str(e)}")
+
+    def add_hook(self, hook: Callable[[str, float, Dict[str, str]], None]):
+        with self._lock:
+            self._hooks.append(hook)
+
+    def remove_hook(self, hook: Callable[[str, float, Dict[str, str]], None]):
+        with self._lock:
+            if hook in self._hooks:
+                self._hooks.remove(hook)
+
+    def series(self) -> Iterator[Tuple[str, Dict[str, str], Histogram]]:
+        """Iterate (stage, labels, histogram) for every recorded series"""
+        with self._lock:
+            items = [(stage, key, h) for stage, series in self._histograms.items() for key, h in series.items()]
+        for stage, key, histogram in items:
+            yield stage, dict(key), histogram
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Per stage: a summary over all labels plus one per label set"""
+        stages: Dict[str, Any] = {}
+        for stage, labels, histogram in self.series():
+            entry = stages.setdefault(stage, {'series': []})
+            entry['series'].append({'labels': labels, **histogram.snapshot()})
+        for stage, entry in stages.items():
+            if len(entry['series']) == 1 and not entry['series'][0]['labels']:
+                entry.update({k: v for k, v in entry.pop('series')[0].items() if k != 'labels'})
+            else:
+                entry.update(self._merge(stage))
+        return stages
+
+    def _merge(self, stage: str) -> Dict[str, Any]:
+        merged = Histogram(self.buckets)
+        with self._lock:
+            series = list(self._histograms.get(stage, {}).values())
+        for histogram in series:
+            with histogram._lock:
+                merged.counts = [a + b for a, b in zip(merged.counts, histogram.counts)]
+                merged.count += histogram.count
+                merged.sum += histogram.sum
+                if histogram.min is not None:
+                    merged.min = histogram.min if merged.min is None else min(merged.min, histogram.min)
+                    merged.max = histogram.max if merged.max is None else max(merged.max, histogram.max)
+        return merged.snapshot()
+
+    def reset(self):
+        with self._lock:
+            self._histograms = {}
+
+class TurnTimer:
+    """Stage timings for one chat turn, also observed into LatencyMetrics"""
+
+    def __init__(self, metrics: Optional["LatencyMetrics"] = None, mode: str = 'chat', model_id: Optional[str] = None):
+        self.metrics = metrics
+        self.mode = mode
+        self.model_id = model_id
+        self.started = time.perf_counter()
+        self.stages: Dict[str, float] = {}
+        self.list_tools: Dict[str, float] = {}
+        self.tools: List[Dict[str, Any]] = []
+        self.model_calls: List[float] = []
+        self.first_token: Optional[float] = None
+        self._first_model_started: Optional[float] = None
+        self._model_started: Optional[float] = None
+        self._tool_starts: Dict[str, Tuple[str, Optional[str], float]] = {}
+        self._lock = threading.Lock()
+
+    def record(self, stage: str, seconds: float, **labels: str):
+        with self._lock:
+            self.stages[stage] = self.stages.get(stage, 0.0) + seconds
+        if self.metrics:
+            self.metrics.observe(stage, seconds, labels)
+
+    @contextmanager
+    def stage(self, name: str, **labels: str):
+        """Time a block as one pipeline stage"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - started, **labels)
+
+    def list_tools_done(self, server_id: str, seconds: float):
+        with self._lock:
+            self.list_tools[server_id] = self.list_tools.get(server_id, 0.0) + seconds
+        if self.metrics:
+            self.metrics.observe('list_tools', seconds, {'server_id': server_id})
+
+    def mark_first_token(self):
+        """Record time to first token from the first model request, once per turn"""
+        with self._lock:
+            if self.first_token is not None:
+                return
+            self.first_token = time.perf_counter() - (self._first_model_started or self.started)
+        if self.metrics:
+            self.metrics.observe('time_to_first_token', self.first_token)
+
+    def model_call_started(self):
+        self._model_started = time.perf_counter()
+        if self._first_model_started is None:
+            self._first_model_started = self._model_started
+
+    def model_call_finished(self) -> Optional[float]:
+        """Record a model request's duration and return it in seconds"""
+        if self._model_started is None:
+            return None
+        seconds = time.perf_counter() - self._model_started
+        self._model_started = None
+        with self._lock:
+            self.model_calls.append(seconds)
+        if self.metrics:
+            self.metrics.observe('model_call', seconds, {'model_id': self.model_id} if self.model_id else None)
+        return seconds
+
+    def tool_started(self, tool_use_id: str, tool_name: str, server_id: Optional[str] = None):
+        with self._lock:
+            self._tool_starts[tool_use_id] = (tool_name, server_id, time.perf_counter())
+
+    def tool_finished(self, tool_use_id: str, status: str = 'success') -> Optional[Dict[str, Any]]:
+        """Record a tool call's duration and return its summary entry"""
+        with self._lock:
+            entry = self._tool_starts.pop(tool_use_id, None)
+            if entry is None:
+                return None
+            tool_name, server_id, started = entry
+            seconds = time.perf_counter() - started
+            summary = {
+                'tool_name': tool_name,
+                'server_id': server_id,
+                'tool_use_id': tool_use_id,
+                'status': status,
+                'ms': round(seconds * 1000, 2)
+            }
+            self.tools.append(summary)
+        if self.metrics:
+            self.metrics.observe('tool_call', seconds, {'tool_name': tool_name, 'status': status})
+        return summary
+
+    def finish(self) -> Dict[str, Any]:
+        """Record the total turn duration and return the summary"""
+        self.record('total', time.perf_counter() - self.started, mode=self.mode)
+        return self.summary()
+
+    def summary(self) -> Dict[str, Any]:
+        """Per-turn timings in milliseconds"""
+        def ms(seconds):
+            return None if seconds is None else round(seconds * 1000, 2)
+        with self._lock:
+            return {
+                **{f"{stage}_ms": ms(seconds) for stage, seconds in self.stages.items()},
+                'list_tools_ms': {server_id: ms(seconds) for server_id, seconds in self.list_tools.items()},
+                'time_to_first_token_ms': ms(self.first_token),
+                'model_calls': len(self.model_calls),
+                'model_ms': ms(sum(self.model_calls)),
+                'tools': list(self.tools)
+            }
+
+# Shared metrics for the chat pipeline
+_latency_metrics: Optional[LatencyMetrics] = None
+_latency_metrics_lock = threading.Lock()
+
+def get_latency_metrics() -> LatencyMetrics:
+    """Get the process-wide chat latency metrics"""
+    global _latency_metrics
+    with _latency_metrics_lock:
+        if _latency_metrics is None:
+            _latency_metrics = LatencyMetrics()
+        return _latency_metrics
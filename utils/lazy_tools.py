@@ -0,0 +1,123 @@
+"""
+Lazy Strands Tools
+Registers strands_tools with the agent from a cached spec index and only
+imports a tool's module the first time the model actually calls it
+"""
+import json
+import asyncio
+import logging
+import importlib
+import threading
+from importlib import metadata
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from strands.types.tools import AgentTool
+from strands.tools.tools import PythonAgentTool
+
+from .config_repository import DebouncedWriter
+
+logger = logging.getLogger(__name__)
+
+def import_strands_tool(module_name: str) -> AgentTool:
+    """Import strands_tools.<module_name> and return it as an AgentTool
+
+    Handles both @tool decorated functions and module based tools that
+    define TOOL_SPEC plus a function named after the module.
+    """
+    module = importlib.import_module(f'strands_tools.{module_name}')
+    tool = getattr(module, module_name, None)
+    if isinstance(tool, AgentTool):
+        return tool
+    tool_spec = getattr(module, 'TOOL_SPEC', None)
+    if tool_spec and callable(tool):
+        return PythonAgentTool(module_name, tool_spec, tool)
+    raise AttributeError(f"Tool function {module_name} not found in module strands_tools.{module_name}")
+
+class ToolSpecIndex:
+    """On-disk cache of tool specs per strands_tools module, tied to the installed package version"""
+
+    def __init__(self, path: str = "data/strands_tools_spec_index.json"):
+        self.path = Path(path)
+        self.package_version = self._package_version()
+        self._specs: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        self._writer = DebouncedWriter(self.path)
+        self._load()
+
+    @staticmethod
+    def _package_version() -> str:
+        try:
+            return metadata.version('strands-agents-tools')
+        except metadata.PackageNotFoundError:
+            return 'unknown'
+
+    def _load(self):
+        if not self.path.exists():
+            return
+        try:
+            with open(self.path, 'r') as f:
+                index = json.load(f)
+            if index.get('version') == self.package_version:
+                self._specs = index.get('tools', {})
+            else:
+                logger.info("Strands tools version changed, rebuilding tool spec index")
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable tool spec index {self.path}: {str(e)}")
+
+    def get(self, module_name: str) -> Optional[Dict[str, Any]]:
+        """Get the cached spec entry ({'tool_spec', 'tool_type'}) for a module"""
+        with self._lock:
+            return self._specs.get(module_name)
+
+    def put(self, module_name: str, tool: AgentTool):
+        """Record a loaded tool's spec and schedule saving the index"""
+        with self._lock:
+            self._specs[module_name] = {
+                'tool_spec': tool.tool_spec,
+                'tool_type': tool.tool_type
+            }
+            index = {'version': self.package_version, 'tools': dict(self._specs)}
+        self._writer.schedule(index)
+
+class LazyStrandsTool(AgentTool):
+    """AgentTool proxy built from a cached spec that imports its module on first use"""
+
+    def __init__(self, module_name: str, tool_spec: Dict[str, Any], tool_type: str = 'python'):
+        super().__init__()
+        self.module_name = module_name
+        self._tool_spec = tool_spec
+        self._tool_type = tool_type
+        self._tool: Optional[AgentTool] = None
+        self._lock = threading.Lock()
+
+    @property
+    def tool_name(self) -> str:
+        return self._tool_spec['name']
+
+    @property
+    def tool_spec(self) -> Dict[str, Any]:
+        return self._tool_spec
+
+    @property
+    def tool_type(self) -> str:
+        return self._tool_type
+
+    @property
+    def loaded(self) -> bool:
+        return self._tool is not None
+
+    def resolve(self) -> AgentTool:
+        """Import the implementing module (once) and return the real tool"""
+        if self._tool is None:
+            with self._lock:
+                if self._tool is None:
+                    self._tool = import_strands_tool(self.module_name)
+                    logger.info(f"Imported Strands tool on first use: {self.module_name}")
+        return self._tool
+
+    async def stream(self, tool_use, invocation_state: Dict[str, Any], **kwargs: Any):
+        """Import on first call (off the event loop), then delegate to the real tool"""
+        tool = self._tool or await asyncio.to_thread(self.resolve)
+        async for event in tool.stream(tool_use, invocation_state, **kwargs):
+            yield event
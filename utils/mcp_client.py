@@ -3,9 +3,10 @@ MCP (Model Context Protocol) Client Manager
 Handles connections to MCP servers and manages tool execution
 """
 import os
-import json
 import asyncio
+import time
 import logging
+import uuid
 from pathlib import Path
 from typing import Dict, List, Optional, Any, Tuple
 from dataclasses import dataclass, field
@@ -14,6 +15,13 @@ import subprocess
 import sys
 from contextlib import AsyncExitStack
 
+from .config_repository import get_config_repository
+from .tool_history import ToolCallHistory
+from .tool_journal import get_tool_journal
+from .event_bus import Subscription, create_event_bus
+from .timeout_policy import TimeoutPolicy
+from .mcp_settings import effective_settings
+
 logger = logging.getLogger(__name__)
 
 @dataclass
@@ -27,7 +35,9 @@ class MCPServer:
     env_vars: Dict[str, str] = field(default_factory=dict)
     enabled: bool = True
     auto_connect: bool = False
+    warm: bool = False  # Keep pre-started clients ready in the warm pool
     category: str = "General"
+    added_at: Optional[str] = None
     
     process: Optional[subprocess.Popen] = None
     stdin: Optional[Any] = None
@@ -43,70 +53,120 @@ class MCPClientManager:
     
     def __init__(self, config_path: str = "data/mcp_servers.json"):
         self.config_path = Path(config_path)
+        self.config_repository = get_config_repository(config_path)  # Shared with StrandsMCPAgent
         self.servers: Dict[str, MCPServer] = {}
+        self._records: Dict[str, Dict] = {}  # Serialized server configs as last saved/loaded
+        self._dirty: set = set()  # Server IDs whose record must be re-serialized
         self.active_connections: Dict[str, AsyncExitStack] = {}
-        self.tool_call_history: List[Dict] = []
-        self.event_callbacks: Dict[str, List] = {}
+        self.tool_journal = get_tool_journal(str(self.config_path.parent / "tool_calls.jsonl"))  # Durable, shared with StrandsMCPAgent
+        self.timeouts = TimeoutPolicy()  # Global, per-server and per-tool timeouts from the config
         self.load_config()
+        settings = effective_settings(self.config_repository.get_settings())
+        self.event_bus = create_event_bus('mcp_client', settings)
+        self.tool_call_history = ToolCallHistory(
+            capacity=settings['tool_history_size'],
+            spill_path=settings['tool_history_spill_path']
+        )
+        self.config_repository.subscribe(self.load_config)
     
-    def load_config(self):
-        """Load MCP server configurations from file"""
-        if self.config_path.exists():
-            with open(self.config_path, 'r') as f:
-                config = json.load(f)
-                for server_id, server_config in config.get('active_servers', {}).items():
-                    self.servers[server_id] = MCPServer(
-                        id=server_id,
-                        name=server_config.get('name', 'Unknown Server'),
-                        description=server_config.get('description', ''),
-                        command=server_config.get('command', []),
-                        args=server_config.get('args', []),
-                        env_vars=server_config.get('env_vars', {}),
-                        enabled=server_config.get('enabled', True),
-                        auto_connect=server_config.get('auto_connect', False),
-                        category=server_config.get('category', 'General')
-                    )
+    def load_config(self, config: Optional[Dict] = None):
+        """Load MCP server configurations from the shared config repository"""
+        if config is None:
+            config = self.config_repository.get()
+        self.tool_journal.configure_from_settings(config.get('settings', {}))
+        self.timeouts.configure(config)
+        
+        active_servers = config.get('active_servers', {})
+        for server_id, server_config in active_servers.items():
+            fields = {
+                'name': server_config.get('name', 'Unknown Server'),
+                'description': server_config.get('description', ''),
+                'command': server_config.get('command', []),
+                'args': server_config.get('args', []),
+                'env_vars': server_config.get('env_vars', {}),
+                'enabled': server_config.get('enabled', True),
+                'auto_connect': server_config.get('auto_connect', False),
+                'warm': server_config.get('warm', False),
+                'category': server_config.get('category', 'General'),
+                'added_at': server_config.get('added_at')
+            }
+            self._records[server_id] = server_config
+            self._dirty.discard(server_id)
+            server = self.servers.get(server_id)
+            if server is None:
+                self.servers[server_id] = MCPServer(id=server_id, **fields)
+            else:
+                # Update in place so connection state survives a reload
+                for name, value in fields.items():
+                    setattr(server, name, value)
+        
+        for server_id in list(self.servers.keys()):
+            if server_id not in active_servers and server_id not in self.active_connections:
+                del self.servers[server_id]
+        for server_id in list(self._records.keys()):
+            if server_id not in active_servers:
+                del self._records[server_id]
+    
+    def _serialize_server(self, server: MCPServer) -> Dict:
+        """Build the config record for a server, keeping keys this class doesn't manage"""
+        if server.added_at is None:
+            server.added_at = datetime.now().isoformat()
+        return {
+            **self._records.get(server.id, {}),
+            'name': server.name,
+            'description': server.description,
+            'command': server.command,
+            'args': server.args,
+            'env_vars': server.env_vars,
+            'enabled': server.enabled,
+            'auto_connect': server.auto_connect,
+            'warm': server.warm,
+            'category': server.category,
+            'added_at': server.added_at
+        }
     
     def save_config(self):
-        """Save current server configurations to file"""
+        """Save server configurations, re-serializing only changed records
+        
+        The write itself is atomic and debounced by the config repository, so
+        a burst of changes results in a single file write.
+        """
+        for server_id in list(self._dirty):
+            if server_id in self.servers:
+                self._records[server_id] = self._serialize_server(self.servers[server_id])
+        self._dirty.clear()
+        
+        # Keep only the keys the user set; defaults stay in utils.mcp_settings
+        settings = {
+            **self.config_repository.get_settings(),
+            'updated_at': datetime.now().isoformat()
+        }
         config = {
-            'active_servers': {},
-            'settings': {
-                'auto_reconnect': True,
-                'connection_timeout': 30.0,
-                'tool_timeout': 60.0,
-                'session_init_timeout': 15.0,
-                'list_tools_timeout': 10.0,
-                'max_concurrent_tools': 5,
-                'log_tool_calls': True,
-                'updated_at': datetime.now().isoformat()
-            }
+            'active_servers': {
+                server_id: self._records[server_id]
+                for server_id in self.servers
+                if server_id in self._records
+            },
+            'settings': settings
         }
         
-        for server_id, server in self.servers.items():
-            config['active_servers'][server_id] = {
-                'name': server.name,
-                'description': server.description,
-                'command': server.command,
-                'args': server.args,
-                'env_vars': server.env_vars,
-                'enabled': server.enabled,
-                'auto_connect': server.auto_connect,
-                'category': server.category,
-                'added_at': datetime.now().isoformat()
-            }
-        
-        os.makedirs(self.config_path.parent, exist_ok=True)
-        with open(self.config_path, 'w') as f:
-            json.dump(config, f, indent=2)
+        self.config_repository.save(config)
     
-    async def connect_server(self, server_id: str, timeout: float = 30.0) -> bool:
-        """Connect to an MCP server using stdio transport with proper timeout handling"""
+    async def connect_server(self, server_id: str, timeout: Optional[float] = None) -> bool:
+        """Connect to an MCP server using stdio transport with proper timeout handling
+        
+        The transport, session and tool listing steps each use their timeout
+        from the policy; `timeout` overrides the connection timeout.
+        """
         if server_id not in self.servers:
             logger.error(f"Server {server_id} not found")
             return False
         
         server = self.servers[server_id]
+        started = time.perf_counter()
+        timeout = timeout or self.timeouts.connection(server_id)
+        session_timeout = self.timeouts.session_init(server_id)
+        step, step_timeout = "connect", timeout  # Reported if a step times out
         
         try:
             # Import MCP SDK components
@@ -144,13 +204,14 @@ class MCPClientManager:
             read_stream, write_stream = transport
             
             # Initialize client session with timeout
+            step, step_timeout = "session init", session_timeout
             session = await asyncio.wait_for(
                 exit_stack.enter_async_context(ClientSession(read_stream, write_stream)),
-                timeout=10.0  # Shorter timeout for session creation
+                timeout=session_timeout
             )
             
             # Initialize the session with timeout
-            await asyncio.wait_for(session.initialize(), timeout=15.0)
+            await asyncio.wait_for(session.initialize(), timeout=session_timeout)
             
             # Store session info
             server.session = session
@@ -158,7 +219,8 @@ class MCPClientManager:
             server.connected_at = datetime.now()
             
             # List available tools with timeout
-            tools_response = await asyncio.wait_for(session.list_tools(), timeout=10.0)
+            step, step_timeout = "list tools", self.timeouts.list_tools(server_id)
+            tools_response = await asyncio.wait_for(session.list_tools(), timeout=step_timeout)
             server.available_tools = [
                 {
                     'name': tool.name,
@@ -171,15 +233,17 @@ class MCPClientManager:
             logger.info(f"Connected to MCP server: {server.name} with {len(server.available_tools)} tools")
             self._trigger_event('server_connected', {
                 'server_id': server_id,
-                'tools': server.available_tools
+                'tools': server.available_tools,
+                'duration': time.perf_counter() - started
             })
             
             return True
             
         except asyncio.TimeoutError:
-            logger.error(f"Timeout connecting to server {server.name} after {timeout} seconds")
+            error = f"Connection timeout after {step_timeout} seconds ({step})"
+            logger.error(f"Timeout connecting to server {server.name}: {error}")
             server.status = "error"
-            server.last_error = f"Connection timeout after {timeout} seconds"
+            server.last_error = error
             # Clean up on timeout
             if server_id in self.active_connections:
                 try:
@@ -189,7 +253,9 @@ class MCPClientManager:
                     pass
             self._trigger_event('server_error', {
                 'server_id': server_id,
-                'error': f"Connection timeout after {timeout} seconds"
+                'error': error,
+                'timed_out': True,
+                'duration': time.perf_counter() - started
             })
             return False
         except Exception as e:
@@ -205,7 +271,8 @@ class MCPClientManager:
                     pass
             self._trigger_event('server_error', {
                 'server_id': server_id,
-                'error': str(e)
+                'error': str(e),
+                'duration': time.perf_counter() - started
             })
             return False
     
@@ -230,18 +297,27 @@ class MCPClientManager:
             except Exception as e:
                 logger.error(f"Error disconnecting from server {server_id}: {str(e)}")
     
-    async def call_tool(self, server_id: str, tool_name: str, arguments: Dict[str, Any], timeout: float = 60.0) -> Dict[str, Any]:
-        """Execute a tool on an MCP server with timeout"""
+    async def call_tool(self, server_id: str, tool_name: str, arguments: Dict[str, Any],
+                        timeout: Optional[float] = None) -> Dict[str, Any]:
+        """Execute a tool on an MCP server with timeout
+        
+        Without an explicit `timeout` the tool's timeout comes from the policy.
+        On timeout the request task is cancelled, which abandons the pending
+        MCP request rather than leaving it to complete in the background.
+        """
         if server_id not in self.servers:
             return {'error': f"Server {server_id} not found"}
         
         server = self.servers[server_id]
+        timeout = timeout or self.timeouts.tool(server_id, tool_name)
         
         if server.status != "connected" or not server.session:
             return {'error': f"Server {server.name} is not connected"}
         
         # Record tool call
         call_record = {
+            'call_id': uuid.uuid4().hex,
+            'source': 'mcp_client',
             'server_id': server_id,
             'server_name': server.name,
             'tool_name': tool_name,
@@ -249,7 +325,8 @@ class MCPClientManager:
             'timestamp': datetime.now().isoformat(),
             'status': 'executing'
         }
-        self.tool_call_history.append(call_record)
+        call_id = self.tool_call_history.append(call_record)
+        self.tool_journal.append(call_record)
         
         # Trigger event for UI update
         self._trigger_event('tool_call_start', call_record)
@@ -262,26 +339,31 @@ class MCPClientManager:
             )
             
             # Update call record
-            call_record['status'] = 'completed'
-            call_record['result'] = result.content if hasattr(result, 'content') else str(result)
-            call_record['duration'] = (datetime.now() - datetime.fromisoformat(call_record['timestamp'])).total_seconds()
+            content = result.content if hasattr(result, 'content') else str(result)
+            duration = (datetime.now() - datetime.fromisoformat(call_record['timestamp'])).total_seconds()
+            self._finish_call(call_id, call_record, status='completed', result=content, duration=duration)
             
             # Trigger completion event
             self._trigger_event('tool_call_complete', call_record)
             
             return {
                 'success': True,
-                'result': call_record['result'],
-                'duration': call_record['duration']
+                'result': content,
+                'duration': duration
             }
             
         except asyncio.TimeoutError:
             logger.error(f"Tool execution timed out after {timeout} seconds: {tool_name}")
             
             # Update call record
-            call_record['status'] = 'failed'
-            call_record['error'] = f"Tool execution timed out after {timeout} seconds"
-            call_record['duration'] = timeout
+            self._finish_call(
+                call_id,
+                call_record,
+                status='failed',
+                error=f"Tool execution timed out after {timeout} seconds",
+                timed_out=True,
+                duration=timeout
+            )
             
             # Trigger error event
             self._trigger_event('tool_call_error', call_record)
@@ -294,9 +376,13 @@ class MCPClientManager:
             logger.error(f"Tool execution failed: {str(e)}")
             
             # Update call record
-            call_record['status'] = 'failed'
-            call_record['error'] = str(e)
-            call_record['duration'] = (datetime.now() - datetime.fromisoformat(call_record['timestamp'])).total_seconds()
+            self._finish_call(
+                call_id,
+                call_record,
+                status='failed',
+                error=str(e),
+                duration=(datetime.now() - datetime.fromisoformat(call_record['timestamp'])).total_seconds()
+            )
             
             # Trigger error event
             self._trigger_event('tool_call_error', call_record)
@@ -306,6 +392,16 @@ class MCPClientManager:
                 'error': str(e)
             }
     
+    def _finish_call(self, call_id: int, call_record: Dict[str, Any], **fields):
+        """Record a call's outcome in the history and the journal
+        
+        Concurrent calls may already have evicted the record from the
+        history's ring buffer, so the local record is updated either way.
+        """
+        if self.tool_call_history.update(call_id, **fields) is None:
+            call_record.update(fields)
+        self.tool_journal.append(call_record)
+    
     def add_server(self, server_config: Dict) -> str:
         """Add a new MCP server configuration"""
         import uuid
@@ -320,10 +416,13 @@ class MCPClientManager:
             env_vars=server_config.get('env_vars', {}),
             enabled=server_config.get('enabled', True),
             auto_connect=server_config.get('auto_connect', False),
-            category=server_config.get('category', 'General')
+            warm=server_config.get('warm', False),
+            category=server_config.get('category', 'General'),
+            added_at=datetime.now().isoformat()
         )
         
         self.servers[server_id] = server
+        self._dirty.add(server_id)
         self.save_config()
         
         return server_id
@@ -343,8 +442,10 @@ class MCPClientManager:
         server.env_vars = server_config.get('env_vars', server.env_vars)
         server.enabled = server_config.get('enabled', server.enabled)
         server.auto_connect = server_config.get('auto_connect', server.auto_connect)
+        server.warm = server_config.get('warm', server.warm)
         server.category = server_config.get('category', server.category)
         
+        self._dirty.add(server_id)
         self.save_config()
         return True
     
@@ -356,6 +457,7 @@ class MCPClientManager:
                 asyncio.create_task(self.disconnect_server(server_id))
             
             del self.servers[server_id]
+            self._records.pop(server_id, None)
             self.save_config()
     
     def get_server_status(self, server_id: str) -> Dict:
@@ -398,20 +500,13 @@ class MCPClientManager:
                     })
         return tools
     
-    def on_event(self, event_type: str, callback):
-        """Register an event callback"""
-        if event_type not in self.event_callbacks:
-            self.event_callbacks[event_type] = []
-        self.event_callbacks[event_type].append(callback)
+    def on_event(self, event_type: str, callback) -> Subscription:
+        """Register an event callback, run on its own event bus worker"""
+        return self.event_bus.subscribe(callback, [event_type], name=event_type)
     
     def _trigger_event(self, event_type: str, data: Any):
-        """Trigger event callbacks"""
-        if event_type in self.event_callbacks:
-            for callback in self.event_callbacks[event_type]:
-                try:
-                    callback(data)
-                except Exception as e:
-                    logger.error(f"Event callback error: {str(e)}")
+        """Publish an event; callbacks run asynchronously and never block the caller"""
+        self.event_bus.publish(event_type, data)
     
     async def auto_connect_servers(self):
         """Auto-connect servers marked for auto-connection with timeout"""
@@ -420,15 +515,21 @@ class MCPClientManager:
             if server.auto_connect and server.enabled:
                 logger.info(f"Auto-connecting to {server.name}...")
                 # Create task with timeout for each connection
-                task = asyncio.create_task(self.connect_server(server_id, timeout=30.0))
+                task = asyncio.create_task(self.connect_server(server_id))
                 tasks.append((server_id, server.name, task))
         
         if tasks:
-            # Wait for all connections with a global timeout
+            # Wait for all connections with a global timeout: the slowest server's
+            # connect, session and tool listing budget, and at least a minute
+            overall_timeout = max([60.0] + [
+                self.timeouts.connection(server_id) + 2 * self.timeouts.session_init(server_id)
+                + self.timeouts.list_tools(server_id)
+                for server_id, _, _ in tasks
+            ])
             try:
                 results = await asyncio.wait_for(
                     asyncio.gather(*[task for _, _, task in tasks], return_exceptions=True),
-                    timeout=60.0  # Global timeout for all connections
+                    timeout=overall_timeout
                 )
                 
                 for i, (server_id, server_name, _) in enumerate(tasks):
@@ -441,7 +542,7 @@ class MCPClientManager:
                         logger.warning(f"Auto-connection to {server_name} returned False")
                         
             except asyncio.TimeoutError:
-                logger.error("Auto-connection process timed out after 60 seconds")
+                logger.error(f"Auto-connection process timed out after {overall_timeout} seconds")
                 # Cancel remaining tasks
                 for _, _, task in tasks:
                     if not task.done():
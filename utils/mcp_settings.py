@@ -0,0 +1,48 @@
+"""
+MCP Settings
+Defaults for the `settings` block of mcp_servers.json. The file only holds
+keys the user set; every other key falls back to DEFAULT_SETTINGS.
+"""
+import os
+from typing import Any, Dict, Optional
+
+DEFAULT_SETTINGS = {
+    'auto_reconnect': True,
+    'connection_timeout': float(os.getenv('MCP_CONNECTION_TIMEOUT', '30.0')),
+    'tool_timeout': float(os.getenv('MCP_TOOL_TIMEOUT', '60.0')),
+    'session_init_timeout': 15.0,
+    'list_tools_timeout': 10.0,
+    'max_concurrent_tools': 5,
+    'max_concurrent_tools_per_server': 2,
+    'max_concurrent_connections': 4,
+    'log_tool_calls': True,
+    'persistent_sessions': True,
+    'prompt_caching': False,
+    'native_messages': True,
+    'context_turns': 5,
+    'agent_cache_size': 8,
+    'max_conversations': 1000,
+    'conversation_max_messages': 50,
+    'warm_pool_size': 1,
+    'tool_history_size': 1000,
+    'tool_history_spill_path': None,
+    'tool_journal_enabled': True,
+    'tool_journal_max_bytes': 10 * 1024 * 1024,
+    'tool_journal_backups': 5,
+    'tool_journal_retention_days': 30,
+    'event_queue_size': 1000,
+    'event_backpressure': 'drop_oldest',
+    'tool_cache_enabled': True,
+    'tool_cache_size': 256,
+    'tool_cache_ttl': 300.0,
+    'tool_cache_read_only_hint': True,
+    'tool_coalescing_enabled': True
+}
+
+def defaults_for(*keys: str) -> Dict[str, Any]:
+    """The defaults of a subset of settings keys"""
+    return {key: DEFAULT_SETTINGS[key] for key in keys}
+
+def effective_settings(settings: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """A settings block with defaults filled in for keys the user didn't set"""
+    return {**DEFAULT_SETTINGS, **(settings or {})}
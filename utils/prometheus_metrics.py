@@ -0,0 +1,252 @@
+"""
+Prometheus Metrics
+Counters, gauges and histograms rendered in the Prometheus text exposition
+format for the /metrics endpoint, fed from the MCPClientManager and
+StrandsMCPAgent event callbacks
+"""
+import math
+import logging
+import threading
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from .latency_metrics import DEFAULT_BUCKETS, Histogram
+
+logger = logging.getLogger(__name__)
+
+LabelValues = Tuple[str, ...]
+
+def _escape(value: str) -> str:
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return '+Inf' if value > 0 else '-Inf'
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+class _Metric:
+    """One metric family; each distinct label value tuple is a series"""
+
+    type_name = 'untyped'
+
+    def __init__(self, name: str, help_text: str, label_names: Tuple[str, ...] = ()):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = tuple(label_names)
+        self._series: Dict[LabelValues, Any] = {}
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, Any]) -> LabelValues:
+        return tuple(str(labels.get(name, '')) for name in self.label_names)
+
+    def _labels(self, key: LabelValues, extra: Optional[Tuple[str, str]] = None) -> str:
+        pairs = list(zip(self.label_names, key))
+        if extra:
+            pairs.append(extra)
+        if not pairs:
+            return ''
+        return '{' + ','.join(f'{name}="{_escape(value)}"' for name, value in pairs) + '}'
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} {self.type_name}"]
+        with self._lock:
+            series = list(self._series.items())
+        for key, value in series:
+            lines.extend(self._render_series(key, value))
+        return lines
+
+    def _render_series(self, key: LabelValues, value: Any) -> List[str]:
+        return [f"{self.name}{self._labels(key)} {_format_value(value)}"]
+
+class Counter(_Metric):
+    type_name = 'counter'
+
+    def inc(self, amount: float = 1.0, **labels: Any):
+        key = self._key(labels)
+        with self._lock:
+            self._series[key] = self._series.get(key, 0.0) + amount
+
+class Gauge(_Metric):
+    """Gauge set directly or computed at scrape time by a callback"""
+
+    type_name = 'gauge'
+
+    def __init__(self, name: str, help_text: str, label_names: Tuple[str, ...] = ()):
+        super().__init__(name, help_text, label_names)
+        self._callback: Optional[Callable[[], float]] = None
+
+    def set(self, value: float, **labels: Any):
+        key = self._key(labels)
+        with self._lock:
+            self._series[key] = value
+
+    def inc(self, amount: float = 1.0, **labels: Any):
+        key = self._key(labels)
+        with self._lock:
+            self._series[key] = self._series.get(key, 0.0) + amount
+
+    def dec(self, amount: float = 1.0, **labels: Any):
+        self.inc(-amount, **labels)
+
+    def set_function(self, callback: Callable[[], float]):
+        """Compute the (unlabelled) value when scraped"""
+        self._callback = callback
+
+    def render(self) -> List[str]:
+        if self._callback is not None:
+            try:
+                self.set(float(self._callback()))
+            except Exception as e:
+                logger.error(f"Failed to collect gauge {self.name}: {str(e)}")
+        return super().render()
+
+class PromHistogram(_Metric):
+    type_name = 'histogram'
+
+    def __init__(self, name: str, help_text: str, label_names: Tuple[str, ...] = (), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, help_text, label_names)
+        self.buckets = buckets
+
+    def observe(self, seconds: float, **labels: Any):
+        key = self._key(labels)
+        histogram = self._series.get(key)
+        if histogram is None:
+            with self._lock:
+                histogram = self._series.setdefault(key, Histogram(self.buckets))
+        histogram.observe(seconds)
+
+    def _render_series(self, key: LabelValues, histogram: Histogram) -> List[str]:
+        lines = [
+            f"{self.name}_bucket{self._labels(key, ('le', _format_value(bound)))} {count}"
+            for bound, count in histogram.cumulative_counts()
+        ]
+        lines.append(f"{self.name}_sum{self._labels(key)} {_format_value(histogram.sum)}")
+        lines.append(f"{self.name}_count{self._labels(key)} {histogram.count}")
+        return lines
+
+class MetricsRegistry:
+    """Ordered collection of metric families"""
+
+    def __init__(self):
+        self._metrics: List[_Metric] = []
+
+    def register(self, metric: _Metric) -> _Metric:
+        self._metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        lines: List[str] = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        return '\n'.join(lines) + '\n'
+
+class AppMetrics:
+    """Server, tool and model health series for the MCP demo
+
+    Collection happens in the existing event callbacks: each update is a
+    dict lookup plus an add under a per-family lock.
+    """
+
+    def __init__(self):
+        self.registry = MetricsRegistry()
+        r = self.registry
+        self.tool_calls = r.register(Counter(
+            'mcp_tool_calls_total', 'MCP tool calls by outcome (success, error, timeout)',
+            ('source', 'server_id', 'tool_name', 'status')))
+        self.tool_duration = r.register(PromHistogram(
+            'mcp_tool_call_duration_seconds', 'MCP tool call duration',
+            ('source', 'server_id', 'tool_name')))
+        self.coalesced_calls = r.register(Counter(
+            'mcp_tool_calls_coalesced_total', 'MCP tool calls answered by an identical call already in flight',
+            ('server_id', 'tool_name')))
+        self.connect_attempts = r.register(Counter(
+            'mcp_connect_attempts_total', 'MCP server connect attempts by result (success, error, timeout)',
+            ('source', 'server_id', 'result')))
+        self.connect_duration = r.register(PromHistogram(
+            'mcp_connect_duration_seconds', 'MCP server connect duration',
+            ('source', 'server_id')))
+        self.active_streams = r.register(Gauge(
+            'mcp_active_streams', 'Chat streams currently running over Socket.IO'))
+        self.active_streams.set(0)
+        self.bedrock_latency = r.register(PromHistogram(
+            'bedrock_request_duration_seconds', 'Bedrock model request duration',
+            ('model_id',)))
+        self.bedrock_errors = r.register(Counter(
+            'bedrock_request_errors_total', 'Failed Bedrock model requests',
+            ('model_id',)))
+        self.input_tokens = r.register(Counter(
+            'bedrock_input_tokens_total', 'Bedrock input tokens', ('model_id',)))
+        self.output_tokens = r.register(Counter(
+            'bedrock_output_tokens_total', 'Bedrock output tokens', ('model_id',)))
+        self.conversations = r.register(Gauge(
+            'mcp_conversation_store_size', 'Conversations held in the conversation store'))
+        self._bound: set = set()
+        self._lock = threading.Lock()
+
+    def _bind_once(self, source: Any) -> bool:
+        with self._lock:
+            if id(source) in self._bound:
+                return False
+            self._bound.add(id(source))
+            return True
+
+    def bind_manager(self, manager: Any):
+        """Follow tool calls and connects of an MCPClientManager"""
+        if self._bind_once(manager):
+            self._bind_common(manager, 'mcp_client')
+
+    def bind_agent(self, agent: Any):
+        """Follow tool calls, connects, model requests and turns of a StrandsMCPAgent"""
+        if not self._bind_once(agent):
+            return
+        self._bind_common(agent, 'strands')
+        agent.on_event('model_call_complete', self._on_model_call)
+        agent.on_event('turn_complete', self._on_turn)
+        agent.on_event('tool_call_coalesced', lambda data: self.coalesced_calls.inc(
+            server_id=data.get('server_id'), tool_name=data.get('tool_name')))
+        self.conversations.set_function(lambda: len(agent.conversations))
+
+    def _bind_common(self, source: Any, name: str):
+        source.on_event('tool_call_complete', lambda data: self._on_tool_call(name, data, 'success'))
+        source.on_event('tool_call_error', lambda data: self._on_tool_call(
+            name, data, 'timeout' if data.get('timed_out') else 'error'))
+        source.on_event('server_connected', lambda data: self._on_connect(name, data, 'success'))
+        source.on_event('server_error', lambda data: self._on_connect(
+            name, data, 'timeout' if data.get('timed_out') else 'error'))
+
+    def _on_tool_call(self, source: str, data: Dict[str, Any], status: str):
+        labels = {'source': source, 'server_id': data.get('server_id'), 'tool_name': data.get('tool_name')}
+        self.tool_calls.inc(status=status, **labels)
+        if data.get('duration') is not None:
+            self.tool_duration.observe(data['duration'], **labels)
+
+    def _on_connect(self, source: str, data: Dict[str, Any], result: str):
+        self.connect_attempts.inc(source=source, server_id=data.get('server_id'), result=result)
+        if data.get('duration') is not None:
+            self.connect_duration.observe(data['duration'], source=source, server_id=data.get('server_id'))
+
+    def _on_model_call(self, data: Dict[str, Any]):
+        self.bedrock_latency.observe(data['duration'], model_id=data.get('model_id'))
+        if data.get('error'):
+            self.bedrock_errors.inc(model_id=data.get('model_id'))
+
+    def _on_turn(self, data: Dict[str, Any]):
+        usage = data.get('usage') or {}
+        self.input_tokens.inc(usage.get('input_tokens', 0), model_id=data.get('model_id'))
+        self.output_tokens.inc(usage.get('output_tokens', 0), model_id=data.get('model_id'))
+
+    def render(self) -> str:
+        return self.registry.render()
+
+# Process-wide metrics served at /metrics
+_app_metrics: Optional[AppMetrics] = None
+_app_metrics_lock = threading.Lock()
+
+def get_app_metrics() -> AppMetrics:
+    """Get the process-wide Prometheus metrics"""
+    global _app_metrics
+    with _app_metrics_lock:
+        if _app_metrics is None:
+            _app_metrics = AppMetrics()
+        return _app_metrics
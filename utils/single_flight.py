@@ -0,0 +1,94 @@
+"""
+Single Flight
+Coalesces identical concurrent MCP tool calls: while a call with the same
+server, tool and canonicalized arguments is in flight, later callers wait
+for its result instead of sending another request to the server
+"""
+import copy
+import asyncio
+import logging
+import threading
+from concurrent.futures import Future
+from typing import Any, Dict, Optional, Set, Tuple
+
+from .mcp_settings import defaults_for
+
+logger = logging.getLogger(__name__)
+
+COALESCING_SETTINGS = defaults_for('tool_coalescing_enabled')
+
+class SingleFlight:
+    """In-flight tool calls shared by callers on any thread or event loop
+
+    Only calls that are safe to share are coalesced: tools annotated with
+    readOnlyHint, and tools a server lists in `coalesce_tools` or
+    `cache_tools`. Results are handed out as thread-safe futures so callers
+    running on different event loops can wait on the same call.
+    """
+
+    def __init__(self):
+        self.enabled = True
+        self._tools: Dict[str, Set[str]] = {}  # server_id -> tool names declared shareable
+        self._flights: Dict[Tuple[str, str, str], Future] = {}
+        self._lock = threading.Lock()
+        self.leaders = 0
+        self.coalesced = 0
+        self.coalesced_by_tool: Dict[str, int] = {}
+
+    def configure(self, config: Dict):
+        """Load the coalescing setting and per-server tool lists from an MCP config dict"""
+        settings = {**COALESCING_SETTINGS, **config.get('settings', {})}
+        tools: Dict[str, Set[str]] = {}
+        for server_id, server_config in config.get('active_servers', {}).items():
+            tools[server_id] = set(server_config.get('coalesce_tools') or []) | set(server_config.get('cache_tools') or [])
+        with self._lock:
+            self.enabled = bool(settings['tool_coalescing_enabled'])
+            self._tools = tools
+
+    def should_coalesce(self, server_id: str, tool_name: str, read_only: bool = False) -> bool:
+        return self.enabled and (read_only or tool_name in self._tools.get(server_id, ()))
+
+    def join(self, key: Tuple[str, str, str]) -> Tuple[Future, bool]:
+        """Return (future, is_leader); the leader runs the call and must finish() it"""
+        with self._lock:
+            future = self._flights.get(key)
+            if future is not None:
+                self.coalesced += 1
+                name = f"{key[0]}/{key[1]}"
+                self.coalesced_by_tool[name] = self.coalesced_by_tool.get(name, 0) + 1
+                return future, False
+            future = self._flights[key] = Future()
+            self.leaders += 1
+            return future, True
+
+    def finish(self, key: Tuple[str, str, str], future: Future, outcome: Any = None,
+               error: Optional[BaseException] = None):
+        """Release the flight and hand its outcome (or error) to waiting callers"""
+        with self._lock:
+            if self._flights.get(key) is future:
+                del self._flights[key]
+        if isinstance(error, asyncio.CancelledError):
+            # The leader's cancellation is its own; followers see an ordinary failure
+            error = RuntimeError(f"Coalesced call to {key[1]} was cancelled")
+        if error is not None:
+            future.set_exception(error)
+        else:
+            # A private copy: the leader's caller is free to modify its own result
+            future.set_result(copy.deepcopy(outcome))
+
+    @staticmethod
+    async def wait(future: Future, timeout: Optional[float] = None) -> Any:
+        """Wait for a flight from async code; a timeout abandons the wait, not the call"""
+        return copy.deepcopy(await asyncio.wait_for(asyncio.shield(asyncio.wrap_future(future)), timeout))
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            calls = self.leaders + self.coalesced
+            return {
+                'enabled': self.enabled,
+                'in_flight': len(self._flights),
+                'executed': self.leaders,
+                'coalesced': self.coalesced,
+                'coalesced_ratio': round(self.coalesced / calls, 4) if calls else 0.0,
+                'coalesced_by_tool': dict(self.coalesced_by_tool)
+            }
@@ -0,0 +1,168 @@
+"""
+Startup Profiler
+Import-time and init-phase breakdown for `python app.py --profile-startup`
+"""
+import sys
+import time
+import threading
+import importlib.abc
+from collections import defaultdict
+from contextlib import contextmanager
+from typing import Dict, List, Optional, Tuple
+
+class _ImportTimingFinder(importlib.abc.MetaPathFinder):
+    """Meta path hook that times each module's execution via its loader"""
+
+    def __init__(self, profiler: "StartupProfiler"):
+        self.profiler = profiler
+        self._local = threading.local()
+
+    def find_spec(self, fullname, path, target=None):
+        if getattr(self._local, 'finding', False):
+            return None
+        self._local.finding = True
+        try:
+            # Let the remaining finders locate the module as usual
+            spec = None
+            for finder in list(sys.meta_path):
+                if finder is self or not hasattr(finder, 'find_spec'):
+                    continue
+                spec = finder.find_spec(fullname, path, target)
+                if spec is not None:
+                    break
+        finally:
+            self._local.finding = False
+
+        loader = getattr(spec, 'loader', None)
+        # Class-level loaders (builtin/frozen modules) are shared and cheap, leave them alone
+        if loader is not None and not isinstance(loader, type) and hasattr(loader, 'exec_module'):
+            self._wrap_loader(loader)
+        return spec
+
+    def _wrap_loader(self, loader):
+        if getattr(loader, '_startup_profiler_wrapped', False):
+            return
+        exec_module = loader.exec_module
+        profiler = self.profiler
+
+        def timed_exec_module(module):
+            with profiler.time_import(module.__name__):
+                exec_module(module)
+
+        try:
+            loader.exec_module = timed_exec_module
+            loader._startup_profiler_wrapped = True
+        except (AttributeError, TypeError):
+            pass
+
+class StartupProfiler:
+    """Collects import self-time per top-level package and named init phases"""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.imports: Dict[str, Dict[str, float]] = defaultdict(lambda: {'seconds': 0.0, 'modules': 0})
+        self.import_seconds = 0.0
+        self.phases: List[Tuple[str, float, int]] = []
+        self._finder = _ImportTimingFinder(self)
+        self._local = threading.local()
+        self._lock = threading.Lock()
+
+    def install(self):
+        """Start timing imports"""
+        if self._finder not in sys.meta_path:
+            sys.meta_path.insert(0, self._finder)
+
+    def uninstall(self):
+        if self._finder in sys.meta_path:
+            sys.meta_path.remove(self._finder)
+
+    def _stack(self, name: str) -> list:
+        stack = getattr(self._local, name, None)
+        if stack is None:
+            stack = []
+            setattr(self._local, name, stack)
+        return stack
+
+    @contextmanager
+    def time_import(self, module_name: str):
+        """Time one module body, charging nested imports to their own packages"""
+        stack = self._stack('imports')
+        stack.append(0.0)
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - started
+            nested = stack.pop()
+            if stack:
+                stack[-1] += elapsed
+            with self._lock:
+                entry = self.imports[module_name.split('.')[0]]
+                entry['seconds'] += elapsed - nested
+                entry['modules'] += 1
+                if not stack:
+                    self.import_seconds += elapsed
+
+    @contextmanager
+    def phase(self, name: str):
+        """Time a named init phase; nested phases are indented in the report"""
+        stack = self._stack('phases')
+        index = len(self.phases)
+        with self._lock:
+            self.phases.append((name, 0.0, len(stack)))
+        stack.append(name)
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            stack.pop()
+            with self._lock:
+                self.phases[index] = (name, time.perf_counter() - started, len(stack))
+
+    def report(self, top: int = 15) -> str:
+        """Format the import and phase breakdown"""
+        total = time.perf_counter() - self.started
+        lines = [
+            "Startup profile",
+            f"  total elapsed: {total * 1000:9.1f} ms",
+            f"  imports:       {self.import_seconds * 1000:9.1f} ms",
+            "",
+            f"  {'package (self time)':<32}{'ms':>10}{'modules':>10}"
+        ]
+        with self._lock:
+            packages = sorted(self.imports.items(), key=lambda item: item[1]['seconds'], reverse=True)
+            phases = list(self.phases)
+        for package, entry in packages[:top]:
+            lines.append(f"  {package:<32}{entry['seconds'] * 1000:>10.1f}{int(entry['modules']):>10}")
+        if len(packages) > top:
+            rest = sum(entry['seconds'] for _, entry in packages[top:])
+            lines.append(f"  {f'({len(packages) - top} more)':<32}{rest * 1000:>10.1f}")
+
+        lines.extend(["", f"  {'init phase':<42}{'ms':>10}"])
+        for name, seconds, depth in phases:
+            label = '  ' * depth + name
+            lines.append(f"  {label:<42}{seconds * 1000:>10.1f}")
+        return "\n".join(lines)
+
+# Active profiler, only set when startup profiling was requested
+_profiler: Optional[StartupProfiler] = None
+
+def start_profiling() -> StartupProfiler:
+    """Create and install the startup profiler"""
+    global _profiler
+    if _profiler is None:
+        _profiler = StartupProfiler()
+        _profiler.install()
+    return _profiler
+
+def get_profiler() -> Optional[StartupProfiler]:
+    return _profiler
+
+@contextmanager
+def startup_phase(name: str):
+    """Record an init phase when profiling, otherwise do nothing"""
+    if _profiler is None:
+        yield
+    else:
+        with _profiler.phase(name):
+            yield
@@ -4,50 +4,295 @@ Properly implements MCP tool integration with Amazon Bedrock
 """
 
 import os
+import copy
+import math
 import json
 import logging
 import asyncio
-import importlib
-from typing import Dict, List, Optional, Any, AsyncGenerator
-from datetime import datetime
+import time
+import uuid
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, TimeoutError as FuturesTimeoutError
+from typing import Dict, List, Optional, Any, AsyncGenerator, Callable, Tuple
+from datetime import datetime, timedelta
 from pathlib import Path
-from contextlib import ExitStack
+from contextlib import AsyncExitStack, ExitStack, asynccontextmanager, nullcontext
 
 # Set environment variable to bypass tool consent prompts
 os.environ["BYPASS_TOOL_CONSENT"] = "true"
 
 # Import Strands components
 from strands import Agent
-from strands.models import BedrockModel
+from strands.models import BedrockModel, CacheConfig
 from strands.tools.mcp import MCPClient
+from strands.hooks import AfterModelCallEvent, AfterToolCallEvent, BeforeModelCallEvent, BeforeToolCallEvent
 from mcp.client.stdio import stdio_client
 from mcp import StdioServerParameters
 
+from .tool_catalog import ToolCatalog
+from .agent_cache import AgentCache
+from .conversation_store import ConversationStore
+from .warm_pool import WarmClientPool
+from .config_repository import get_config_repository, DebouncedWriter
+from .lazy_tools import LazyStrandsTool, ToolSpecIndex, import_strands_tool
+from .startup_profiler import startup_phase
+from .tool_journal import ToolCallJournal, get_tool_journal
+from .latency_metrics import TurnTimer, get_latency_metrics
+from .event_bus import Subscription, create_event_bus
+from .tool_executor import BoundedToolExecutor
+from .timeout_policy import TIMEOUT_GRACE, TimeoutPolicy
+from .tool_result_cache import ToolResultCache
+from .mcp_settings import DEFAULT_SETTINGS, effective_settings
+from .single_flight import SingleFlight
+
 logger = logging.getLogger(__name__)
 
+# Tool usage guidance appended to every system prompt
+TOOL_GUIDANCE = """IMPORTANT: You have access to real tools that you MUST use to complete tasks. 
+
+When a user asks you to perform an action that requires a tool:
+1. IMMEDIATELY invoke the appropriate tool - DO NOT describe what you would do
+2. Use the actual tool function, not a JSON representation
+3. Wait for the tool's response before continuing
+4. Base your response on the actual tool output
+
+Tool Usage Rules:
+- ALWAYS use tools when they are relevant to the user's request
+- NEVER describe tool usage in hypothetical terms like "I would use" or "I will use"
+- DIRECTLY invoke tools without asking for permission
+- Only provide parameters that have actual values
+- Never provide empty strings, None, null, or undefined values
+- For file operations: Use file_read to read files, file_edit to modify them
+- For system operations: Use shell to execute commands
+- For calculations: Use calculator for mathematical operations
+
+Example: If asked to "read the README file":
+✓ CORRECT: Directly call file_read(file_path="README.md")
+✗ WRONG: "I will use the file_read tool to read the README file"
+
+You are an AI assistant with REAL tool access. Use them!"""
+
+# Bedrock usage fields reported per turn, mapped to the names used in API responses
+USAGE_FIELDS = {
+    'inputTokens': 'input_tokens',
+    'outputTokens': 'output_tokens',
+    'totalTokens': 'total_tokens',
+    'cacheReadInputTokens': 'cache_read_input_tokens',
+    'cacheWriteInputTokens': 'cache_write_input_tokens'
+}
+
+def accumulate_usage(totals: Dict[str, int], usage: Optional[Dict[str, Any]]) -> Dict[str, int]:
+    """Add a Bedrock usage block (camelCase keys) into a snake_case running total"""
+    for source, target in USAGE_FIELDS.items():
+        totals[target] = totals.get(target, 0) + int((usage or {}).get(source, 0) or 0)
+    return totals
+
 class FilteredMCPClient(MCPClient):
     """Subclass of MCPClient that filters None parameters in tool calls"""
     
-    def call_tool_sync(self, tool_name, **kwargs):
-        """Override call_tool_sync to filter None parameters"""
+    def __init__(self, *args, server_id: Optional[str] = None, server_name: Optional[str] = None,
+                 journal: Optional[ToolCallJournal] = None, timeouts: Optional[TimeoutPolicy] = None,
+                 result_cache: Optional[ToolResultCache] = None, single_flight: Optional[SingleFlight] = None,
+                 **kwargs):
+        super().__init__(*args, **kwargs)
+        self.server_id = server_id
+        self.server_name = server_name
+        self.journal = journal  # Durable tool call journal, if any
+        self.timeouts = timeouts  # Per-tool call timeouts, if any
+        self.result_cache = result_cache  # Shared cache for read-only tool results, if any
+        self.single_flight = single_flight  # Shared in-flight calls for coalescing, if any
+        self.on_coalesced = None  # Called with the tool name when a call joins one in flight
+        self.read_only_tools: set = set()  # Tools annotated with readOnlyHint
+        self._call_marks: "OrderedDict[str, set]" = OrderedDict()  # Recent tool_use_ids -> {'cached', 'timed_out'}
+        self._call_marks_lock = threading.Lock()
+    
+    def list_tools_sync(self, *args, **kwargs):
+        """List tools within the list_tools timeout, noting which ones the server annotates as read-only"""
+        if self.timeouts:
+            tools = self._wait_bounded(
+                lambda: super(FilteredMCPClient, self).list_tools_sync(*args, **kwargs),
+                self.timeouts.list_tools(self.server_id), 'list_tools'
+            )
+        else:
+            tools = super().list_tools_sync(*args, **kwargs)
+        for tool in tools:
+            annotations = getattr(tool.mcp_tool, 'annotations', None)
+            if annotations and (getattr(annotations, 'readOnlyHint', None) or getattr(annotations, 'read_only_hint', None)):
+                self.read_only_tools.add(tool.mcp_tool.name)
+        return tools
+    
+    def _wait_bounded(self, fn: Callable[[], Any], timeout: float, step: str) -> Any:
+        """Run a blocking SDK request on a helper thread and give up after `timeout`
+        
+        The SDK waits on these requests without a timeout; an abandoned
+        request is released when the client is stopped.
+        """
+        outcome: Future = Future()
+        
+        def run():
+            try:
+                outcome.set_result(fn())
+            except BaseException as e:
+                outcome.set_exception(e)
+        
+        threading.Thread(target=run, name=f"mcp-{step}-{self.server_id}", daemon=True).start()
+        try:
+            return outcome.result(timeout)
+        except FuturesTimeoutError:
+            raise TimeoutError(f"{step} on {self.server_name or self.server_id} timed out after {timeout} seconds") from None
+    
+    def consume_cache_hit(self, tool_use_id: str) -> bool:
+        """Whether a call's result came from the cache (answered once per call)"""
+        return self._consume_mark(tool_use_id, 'cached')
+    
+    def consume_timeout(self, tool_use_id: str) -> bool:
+        """Whether a call of the agent's returned a timeout result (answered once per call)"""
+        return self._consume_mark(tool_use_id, 'timed_out')
+    
+    def _mark_call(self, tool_use_id: str, mark: str):
+        with self._call_marks_lock:
+            self._call_marks.setdefault(tool_use_id, set()).add(mark)
+            while len(self._call_marks) > 1000:
+                self._call_marks.popitem(last=False)
+    
+    def _consume_mark(self, tool_use_id: str, mark: str) -> bool:
+        with self._call_marks_lock:
+            marks = self._call_marks.get(tool_use_id)
+            if not marks or mark not in marks:
+                return False
+            marks.discard(mark)
+            if not marks:
+                del self._call_marks[tool_use_id]
+            return True
+    
+    def _cache_lookup(self, tool_use_id: str, name: str, arguments: Optional[Dict[str, Any]]):
+        """Return (cache_key, ttl, cached_result) for a call; key and ttl are None for uncached tools"""
+        if not self.result_cache:
+            return None, None, None
+        ttl = self.result_cache.ttl_for(self.server_id, name, name in self.read_only_tools)
+        if not ttl:
+            return None, None, None
+        key = ToolResultCache.make_key(self.server_id, name, arguments)
+        cached = self.result_cache.get(key)
+        if cached is not None:
+            cached['toolUseId'] = tool_use_id
+            self._mark_call(tool_use_id, 'cached')
+        return key, ttl, cached
+    
+    def _flight_key(self, name: str, arguments: Optional[Dict[str, Any]], cache_key=None):
+        """Key for coalescing identical calls, or None when the tool isn't safe to share"""
+        if not self.single_flight or not self.single_flight.should_coalesce(
+                self.server_id, name, name in self.read_only_tools):
+            return None
+        return cache_key or ToolResultCache.make_key(self.server_id, name, arguments)
+    
+    def _joined_flight(self, name: str):
+        if self.on_coalesced:
+            try:
+                self.on_coalesced(name)
+            except Exception as e:
+                logger.error(f"Coalesced call callback error: {str(e)}")
+    
+    def call_tool_sync(self, tool_use_id, name, arguments=None, **kwargs):
+        """Override call_tool_sync to filter None parameters and serve cacheable tools from the cache"""
         # Filter out None values and offset=0
-        filtered_kwargs = {}
-        for k, v in kwargs.items():
+        filtered_arguments = {}
+        for k, v in (arguments or {}).items():
             if v is None:
                 continue
             if k == 'offset' and v == 0:
                 continue
-            filtered_kwargs[k] = v
+            filtered_arguments[k] = v
+        
+        logger.info(f"Filtering MCP sync call: {name}")
+        logger.info(f"  Original: {list((arguments or {}).keys())}")
+        logger.info(f"  Filtered: {filtered_arguments}")
+        
+        read_timeout = kwargs.pop('read_timeout_seconds', None)
+        timeout = read_timeout.total_seconds() if read_timeout else None
+        if timeout is None and self.timeouts:
+            timeout = self.timeouts.tool(self.server_id, name)
         
-        logger.info(f"Filtering MCP sync call: {tool_name}")
-        logger.info(f"  Original: {list(kwargs.keys())}")
-        logger.info(f"  Filtered: {filtered_kwargs}")
+        cache_key, cache_ttl, cached = self._cache_lookup(tool_use_id, name, filtered_arguments)
+        if cached is not None:
+            return cached
         
-        # Call the parent method with filtered parameters
-        return super().call_tool_sync(tool_name, **filtered_kwargs)
+        flight_key = self._flight_key(name, filtered_arguments, cache_key)
+        if flight_key:
+            future, leader = self.single_flight.join(flight_key)
+            if not leader:
+                self._joined_flight(name)
+                try:
+                    result, _ = copy.deepcopy(future.result(timeout + TIMEOUT_GRACE if timeout else None))
+                except FuturesTimeoutError:
+                    return self._timeout_result(tool_use_id, name, timeout)
+                result['toolUseId'] = tool_use_id
+                return result
+        try:
+            # Call the parent method with filtered parameters
+            if timeout:
+                result = self._call_bounded_sync(tool_use_id, name, filtered_arguments, timeout, **kwargs)
+            else:
+                result = super().call_tool_sync(tool_use_id, name, filtered_arguments, **kwargs)
+        except BaseException as e:
+            if flight_key:
+                self.single_flight.finish(flight_key, future, error=e)
+            raise
+        if cache_ttl and result.get('status') != 'error':
+            self.result_cache.put(cache_key, result, cache_ttl)
+        if flight_key:
+            self.single_flight.finish(flight_key, future, (result, False))
+        return result
+    
+    def _call_bounded_sync(self, tool_use_id, name, arguments, timeout: float, **kwargs):
+        """Blocking counterpart of _call_bounded: cancel the call once `timeout` passes"""
+        cancel_signal = threading.Event()
+        caller_signal = kwargs.pop('cancel_signal', None)
+        if caller_signal is not None and caller_signal.is_set():
+            cancel_signal.set()
+        expired = threading.Event()
+        timer = threading.Timer(timeout, lambda: (expired.set(), cancel_signal.set()))
+        timer.daemon = True
+        timer.start()
+        try:
+            result = super().call_tool_sync(
+                tool_use_id, name, arguments,
+                read_timeout_seconds=timedelta(seconds=timeout + TIMEOUT_GRACE),
+                cancel_signal=cancel_signal,
+                **kwargs
+            )
+        finally:
+            timer.cancel()
+        if expired.is_set():
+            logger.warning(f"Tool {name} on {self.server_name or self.server_id} timed out after {timeout} seconds")
+            return self._timeout_result(tool_use_id, name, timeout)
+        return result
+    
+    @staticmethod
+    def _timeout_result(tool_use_id: str, name: str, timeout: float) -> Dict[str, Any]:
+        return {
+            'status': 'error',
+            'toolUseId': tool_use_id,
+            'content': [{'text': f"Tool {name} timed out after {timeout} seconds"}]
+        }
     
     async def call_tool_async(self, tool_use_id, name, arguments, **kwargs):
-        """Override call_tool_async to filter None parameters"""
+        """Override call_tool_async to filter None parameters and apply the tool's timeout"""
+        result, timed_out = await self.call_tool_with_timeout(tool_use_id, name, arguments, **kwargs)
+        if timed_out:
+            # Read back by the agent's AfterToolCallEvent hook
+            self._mark_call(tool_use_id, 'timed_out')
+        return result
+    
+    async def call_tool_with_timeout(self, tool_use_id, name, arguments, timeout: Optional[float] = None, **kwargs):
+        """Call a tool and return (result, timed_out)
+        
+        The timeout is `timeout`, else an explicit read_timeout_seconds, else
+        the timeout policy. A call that runs over is cancelled through its
+        cancel signal, so the MCP request is abandoned instead of holding
+        the session's worker, and an error result is returned.
+        """
         # Filter out None values and offset=0 from arguments
         if arguments:
             filtered_arguments = {}
@@ -64,35 +309,195 @@ class FilteredMCPClient(MCPClient):
         else:
             filtered_arguments = arguments
         
-        # Call the parent method with filtered parameters
-        return await super().call_tool_async(tool_use_id, name, filtered_arguments, **kwargs)
+        read_timeout = kwargs.pop('read_timeout_seconds', None)
+        if timeout is None:
+            if read_timeout:
+                timeout = read_timeout.total_seconds()
+            elif self.timeouts:
+                timeout = self.timeouts.tool(self.server_id, name)
+        
+        call_record = {
+            'call_id': uuid.uuid4().hex,
+            'source': 'strands',
+            'tool_use_id': tool_use_id,
+            'server_id': self.server_id,
+            'server_name': self.server_name,
+            'tool_name': name,
+            'arguments': filtered_arguments,
+            'timestamp': datetime.now().isoformat(),
+            'status': 'executing'
+        }
+        
+        # Identical calls to cacheable tools skip the stdio round trip
+        cache_key, cache_ttl, cached = self._cache_lookup(tool_use_id, name, filtered_arguments)
+        if cached is not None:
+            if self.journal:
+                self.journal.append({
+                    **call_record, 'status': 'completed', 'cached': True, 'duration': 0.0,
+                    'result': [c.get('text', c) for c in cached.get('content', [])]
+                })
+            return cached, False
+        
+        # Identical calls already in flight are awaited rather than sent again
+        flight_key = self._flight_key(name, filtered_arguments, cache_key)
+        if not flight_key:
+            return await self._execute_call(call_record, filtered_arguments, timeout, cache_key, cache_ttl, **kwargs)
+        future, leader = self.single_flight.join(flight_key)
+        if not leader:
+            self._joined_flight(name)
+            return await self._follow_flight(future, call_record, timeout)
+        try:
+            outcome = await self._execute_call(call_record, filtered_arguments, timeout, cache_key, cache_ttl, **kwargs)
+        except BaseException as e:
+            self.single_flight.finish(flight_key, future, error=e)
+            raise
+        self.single_flight.finish(flight_key, future, outcome)
+        return outcome
+    
+    async def _follow_flight(self, future, call_record: Dict[str, Any], timeout: Optional[float]):
+        """Wait for the identical call in flight and return its result as this call's"""
+        name = call_record['tool_name']
+        started = time.monotonic()
+        try:
+            result, timed_out = await SingleFlight.wait(future, timeout + TIMEOUT_GRACE if timeout else None)
+        except asyncio.TimeoutError:
+            result, timed_out = {
+                'status': 'error',
+                'content': [{'text': f"Tool {name} timed out after {timeout} seconds"}]
+            }, True
+        except Exception as e:
+            if self.journal:
+                self.journal.append({
+                    **call_record, 'status': 'failed', 'coalesced': True, 'error': str(e),
+                    'duration': time.monotonic() - started
+                })
+            raise
+        result['toolUseId'] = call_record['tool_use_id']
+        if self.journal:
+            failed = result.get('status') == 'error'
+            content = [c.get('text', c) for c in result.get('content', [])]
+            self.journal.append({
+                **call_record, 'status': 'failed' if failed else 'completed', 'coalesced': True,
+                'duration': time.monotonic() - started, ('error' if failed else 'result'): content,
+                **({'timed_out': True} if timed_out else {})
+            })
+        return result, timed_out
+    
+    async def _execute_call(self, call_record: Dict[str, Any], filtered_arguments, timeout: Optional[float],
+                            cache_key=None, cache_ttl: Optional[float] = None, **kwargs):
+        """Send the call to the server, journal it and cache a successful result"""
+        tool_use_id, name = call_record['tool_use_id'], call_record['tool_name']
+        if self.journal:
+            self.journal.append(call_record)
+        started = time.monotonic()
+        timed_out = False
+        try:
+            # Call the parent method with filtered parameters
+            if timeout:
+                result, timed_out = await self._call_bounded(tool_use_id, name, filtered_arguments, timeout, **kwargs)
+            else:
+                result = await super().call_tool_async(tool_use_id, name, filtered_arguments, **kwargs)
+        except Exception as e:
+            if self.journal:
+                self.journal.append({
+                    **call_record, 'status': 'failed', 'error': str(e), 'duration': time.monotonic() - started
+                })
+            raise
+        
+        failed = result.get('status') == 'error'
+        if cache_ttl and not failed:
+            self.result_cache.put(cache_key, result, cache_ttl)
+        if self.journal:
+            call_record.update(status='failed' if failed else 'completed', duration=time.monotonic() - started)
+            content = [c.get('text', c) for c in result.get('content', [])]
+            call_record['error' if failed else 'result'] = content
+            if timed_out:
+                call_record['timed_out'] = True
+            self.journal.append(call_record)
+        return result, timed_out
+    
+    async def _call_bounded(self, tool_use_id, name, arguments, timeout: float, **kwargs):
+        """Run the MCP call under `timeout`, cancelling it on expiry"""
+        # A per-call signal: setting the caller's (the agent's) would cancel the whole agent
+        cancel_signal = threading.Event()
+        caller_signal = kwargs.pop('cancel_signal', None)
+        if caller_signal is not None and caller_signal.is_set():
+            cancel_signal.set()
+        try:
+            # The session-level read timeout only backstops the wait_for, which reports the timeout
+            result = await asyncio.wait_for(
+                super().call_tool_async(
+                    tool_use_id, name, arguments,
+                    read_timeout_seconds=timedelta(seconds=timeout + TIMEOUT_GRACE),
+                    cancel_signal=cancel_signal,
+                    **kwargs
+                ),
+                timeout=timeout
+            )
+            return result, False
+        except asyncio.TimeoutError:
+            cancel_signal.set()
+            logger.warning(f"Tool {name} on {self.server_name or self.server_id} timed out after {timeout} seconds")
+            return self._timeout_result(tool_use_id, name, timeout), True
 
 class StrandsMCPAgent:
     """Strands Agent with proper MCP tool integration and Bedrock support"""
     
     def __init__(self, config_path: str = "data/mcp_servers.json", tools_config_path: str = "data/strands_tools_config.json"):
         self.config_path = Path(config_path)
+        self.config_repository = get_config_repository(config_path)  # Shared with MCPClientManager
         self.tools_config_path = Path(tools_config_path)
+        self.tools_config_writer = DebouncedWriter(self.tools_config_path)  # Atomic, coalesced saves
+        self.tool_spec_index = ToolSpecIndex(str(self.tools_config_path.parent / "strands_tools_spec_index.json"))
         self.mcp_servers = {}
         self.mcp_clients = {}
-        self.conversation_history = []
+        self._connecting: Dict[str, asyncio.Future] = {}  # In-flight connect per server ID
+        self.conversations = ConversationStore()  # Bounded history per session
+        
+        # Send prior turns as a structured Converse message list and the system
+        # prompt through the system field, rather than one flattened prompt string
+        self.native_messages = True
+        self.context_turns = 5
+        
+        # Opt-in Bedrock prompt caching of the system prompt and tool definitions
+        self.prompt_caching = False
         self.connected_servers = {}
         self.strands_tools = {}  # Store loaded Strands tools
         self.tools_config = {}  # Store tools configuration
+        self.settings = dict(DEFAULT_SETTINGS)  # Global settings block from the MCP config, with defaults filled in
+        
+        # Keep MCP sessions open between chat turns instead of re-entering
+        # every client (and re-spawning stdio servers) per message
+        self.persistent_sessions = True
+        self.live_sessions = set()  # Server IDs whose client session is open
+        self.tool_catalog = ToolCatalog()  # Cached list_tools results per server
+        self.agent_cache = AgentCache()  # Reusable Agent instances per model/tool set
+        self.warm_pool = WarmClientPool(self._spawn_warm_client, self._stop_mcp_client)
+        self.tool_journal = get_tool_journal(str(self.config_path.parent / "tool_calls.jsonl"))  # Shared with MCPClientManager
+        self.latency_metrics = get_latency_metrics()  # Per-stage chat latency histograms
+        self.event_bus = create_event_bus('strands', self.config_repository.get_settings())
+        self.tool_executor = BoundedToolExecutor()  # Parallel tool calls within a turn, shared by cached agents
+        self.timeouts = TimeoutPolicy()  # Global, per-server and per-tool timeouts from the config
+        self.tool_result_cache = ToolResultCache()  # Results of read-only tools, shared by all clients
+        self.single_flight = SingleFlight()  # Identical in-flight tool calls, shared by all clients
         
-        # Configure Bedrock model (default to Nova Lite)
+        # Configure Bedrock model (default to Nova Lite); each cached agent builds its own client
         self.current_model_id = "amazon.nova-lite-v1:0"
-        self.bedrock_model = BedrockModel(
-            model_id=self.current_model_id,
-            temperature=0.7,
-            max_tokens=9500,
-            streaming=True
-        )
+        self.model_config = {
+            'model_id': self.current_model_id,
+            'temperature': 0.7,
+            'max_tokens': 9500,
+            'streaming': True
+        }
         
-        # Load configurations
-        self.load_mcp_server_configs()
-        self.load_strands_tools_config()
-        self.load_enabled_strands_tools()
+        # Load configurations and follow later changes to the MCP config
+        with startup_phase("load MCP server config"):
+            self.load_mcp_server_configs()
+            self.config_repository.subscribe(self.load_mcp_server_configs)
+        with startup_phase("load Strands tools config"):
+            self.load_strands_tools_config()
+        with startup_phase("load Strands tools"):
+            self.load_enabled_strands_tools()
         
         # Log loaded tools for debugging
         logger.info(f"Loaded {len(self.strands_tools)} Strands tools: {list(self.strands_tools.keys())}")
@@ -102,15 +507,21 @@ class StrandsMCPAgent:
         logger.info(f"Updating model from {self.current_model_id} to {model_id}")
         self.current_model_id = model_id
         
-        # Create new model instance with updated ID
-        self.bedrock_model = BedrockModel(
-            model_id=model_id,
-            temperature=0.7,
-            max_tokens=9500,
-            streaming=True
-        )
+        # Cached agents are keyed by model ID, so the previous model's stay valid for
+        # sessions still using it; unused ones age out of the LRU
+        self.model_config['model_id'] = model_id
         logger.info(f"Model updated successfully to {model_id}")
     
+    def warm_up(self):
+        """Cache an agent for the current model and Strands tools ahead of the first chat turn
+        
+        The first turn then reuses it instead of building the agent and its
+        Bedrock client. No MCP servers are connected yet at startup.
+        """
+        with self._checkout_agent(list(self.strands_tools.values()), blocking=True):
+            pass
+        logger.info(f"Strands MCP agent warmed up ({self.current_model_id})")
+    
     def load_strands_tools_config(self):
         """Load Strands tools configuration"""
         if not self.tools_config_path.exists():
@@ -131,6 +542,38 @@ class StrandsMCPAgent:
             logger.error(f"Failed to load Strands tools config: {str(e)}")
             self.tools_config = {"enabled_tools": [], "tool_categories": {}}
     
+    def _enabled_tool_modules(self) -> set:
+        """Module names of all tools enabled in the Strands tools config"""
+        enabled_tools = set()
+        for category, tools in self.tools_config.get('tool_categories', {}).items():
+            for tool_id, tool_info in tools.items():
+                if tool_info.get('enabled', False):
+                    enabled_tools.add(tool_info.get('module', tool_id))
+        return enabled_tools
+    
+    def _load_strands_tool(self, tool_name: str) -> Optional[Any]:
+        """Get a Strands tool, or None on failure
+        
+        Tools whose spec is in the spec index are returned as lazy proxies that
+        import their module on first call; others are imported now and indexed.
+        """
+        indexed = self.tool_spec_index.get(tool_name)
+        if indexed:
+            return LazyStrandsTool(tool_name, indexed['tool_spec'], indexed.get('tool_type', 'python'))
+        
+        try:
+            tool = import_strands_tool(tool_name)
+            self.tool_spec_index.put(tool_name, tool)
+            logger.info(f"Loaded Strands tool: {tool_name}")
+            return tool
+        except ImportError as e:
+            logger.error(f"Failed to import tool {tool_name}: {str(e)}")
+        except AttributeError as e:
+            logger.warning(str(e))
+        except Exception as e:
+            logger.error(f"Error loading tool {tool_name}: {str(e)}")
+        return None
+    
     def load_enabled_strands_tools(self):
         """Dynamically load enabled Strands tools"""
         self.strands_tools = {}
@@ -138,32 +581,13 @@ class StrandsMCPAgent:
         if not self.tools_config:
             return
         
-        # Get all enabled tools from categories
-        enabled_tools = set()
-        for category, tools in self.tools_config.get('tool_categories', {}).items():
-            for tool_id, tool_info in tools.items():
-                if tool_info.get('enabled', False):
-                    module_name = tool_info.get('module', tool_id)
-                    enabled_tools.add(module_name)
-        
         # Load each enabled tool
-        for tool_name in enabled_tools:
-            try:
-                # Import the specific tool module from strands_tools
-                tool_module = importlib.import_module(f'strands_tools.{tool_name}')
-                
-                # Get the tool function from the module (usually has the same name)
-                if hasattr(tool_module, tool_name):
-                    tool = getattr(tool_module, tool_name)
-                    self.strands_tools[tool_name] = tool
-                    logger.info(f"Loaded Strands tool: {tool_name}")
-                else:
-                    # Some tools might have different function names, check TOOL_SPEC
-                    logger.warning(f"Tool function {tool_name} not found in module strands_tools.{tool_name}")
-            except ImportError as e:
-                logger.error(f"Failed to import tool {tool_name}: {str(e)}")
-            except Exception as e:
-                logger.error(f"Error loading tool {tool_name}: {str(e)}")
+        strands_tools = {}
+        for tool_name in self._enabled_tool_modules():
+            tool = self._load_strands_tool(tool_name)
+            if tool is not None:
+                strands_tools[tool_name] = tool
+        self.strands_tools = strands_tools
     
     def get_strands_tools_status(self) -> Dict[str, Any]:
         """Get status of all Strands tools"""
@@ -203,61 +627,107 @@ class StrandsMCPAgent:
     
     def toggle_strands_tool(self, tool_id: str, category: str, enabled: bool) -> bool:
         """Enable or disable a Strands tool"""
+        tool_key = f"{category}:{tool_id}"
+        return self.bulk_update_strands_tools({tool_key: enabled})[tool_key]
+    
+    def bulk_update_strands_tools(self, updates: Dict[str, bool]) -> Dict[str, bool]:
+        """Bulk update multiple Strands tools as one change
+        
+        Applies every flag, then imports only newly enabled modules, drops only
+        disabled ones and persists the config once.
+        """
+        results = {}
+        categories = self.tools_config.get('tool_categories', {})
+        
         try:
-            # Update configuration
-            if category in self.tools_config.get('tool_categories', {}):
-                if tool_id in self.tools_config['tool_categories'][category]:
-                    self.tools_config['tool_categories'][category][tool_id]['enabled'] = enabled
-                    
-                    # Save configuration
-                    with open(self.tools_config_path, 'w') as f:
-                        json.dump(self.tools_config, f, indent=2)
-                    
-                    # Reload tools
-                    self.load_enabled_strands_tools()
-                    
+            before = self._enabled_tool_modules()
+            
+            for tool_key, enabled in updates.items():
+                # tool_key format: "category:tool_id"
+                category, _, tool_id = tool_key.partition(':')
+                if tool_id and tool_id in categories.get(category, {}):
+                    categories[category][tool_id]['enabled'] = bool(enabled)
+                    results[tool_key] = True
                     logger.info(f"Tool {tool_id} {'enabled' if enabled else 'disabled'}")
-                    return True
+                else:
+                    logger.error(f"Tool {tool_id} not found in category {category}")
+                    results[tool_key] = False
             
-            logger.error(f"Tool {tool_id} not found in category {category}")
-            return False
+            if not any(results.values()):
+                return results
+            
+            after = self._enabled_tool_modules()
+            added, removed = after - before, before - after
+            
+            # Swap in a new dict so concurrent turns see a consistent tool set
+            strands_tools = {name: tool for name, tool in self.strands_tools.items() if name not in removed}
+            for tool_name in added - strands_tools.keys():
+                tool = self._load_strands_tool(tool_name)
+                if tool is not None:
+                    strands_tools[tool_name] = tool
+            self.strands_tools = strands_tools
+            
+            # Save configuration once for the whole batch
+            self.tools_config_writer.schedule(copy.deepcopy(self.tools_config))
+            
+            # Only agents that were built with a changed tool are stale
+            if added or removed:
+                self.agent_cache.invalidate(tool_ids=[f"strands:{name}" for name in added | removed])
+            logger.info(f"Strands tools updated: +{len(added)} -{len(removed)}")
             
         except Exception as e:
-            logger.error(f"Failed to toggle tool {tool_id}: {str(e)}")
-            return False
-    
-    def bulk_update_strands_tools(self, updates: Dict[str, bool]) -> Dict[str, bool]:
-        """Bulk update multiple Strands tools"""
-        results = {}
-        
-        for tool_key, enabled in updates.items():
-            # tool_key format: "category:tool_id"
-            if ':' in tool_key:
-                category, tool_id = tool_key.split(':', 1)
-                success = self.toggle_strands_tool(tool_id, category, enabled)
-                results[tool_key] = success
-            else:
-                results[tool_key] = False
+            logger.error(f"Failed to update Strands tools: {str(e)}")
+            return {tool_key: False for tool_key in updates}
         
         return results
     
-    def load_mcp_server_configs(self):
+    def load_mcp_server_configs(self, config: Optional[Dict] = None):
         """Load MCP server configurations without connecting"""
-        if not self.config_path.exists():
-            logger.warning(f"MCP config file not found: {self.config_path}")
-            return
-        
         try:
-            with open(self.config_path, 'r') as f:
-                config = json.load(f)
+            if config is None:
+                config = self.config_repository.get()
             
             servers = config.get('active_servers', {})
             logger.info(f"Loaded {len(servers)} MCP server configurations")
             
+            self.settings = effective_settings(config.get('settings'))
+            self.tool_journal.configure_from_settings(self.settings)
+            self.timeouts.configure(config)
+            self.tool_result_cache.configure(config)
+            self.single_flight.configure(config)
+            self.persistent_sessions = self.settings['persistent_sessions']
+            self.agent_cache.max_entries = self.settings['agent_cache_size']
+            self.conversations.max_conversations = self.settings['max_conversations']
+            self.conversations.max_messages = self.settings['conversation_max_messages']
+            self.native_messages = self.settings['native_messages']
+            self.context_turns = self.settings['context_turns']
+            
+            prompt_caching = bool(self.settings['prompt_caching'])
+            if prompt_caching != self.prompt_caching:
+                # Cached agents were built with the previous cache settings
+                self.prompt_caching = prompt_caching
+                self.agent_cache.clear()
+            
+            mcp_servers = {}
             for server_id, server_config in servers.items():
                 if server_config.get('enabled', True):
-                    self.mcp_servers[server_id] = server_config
+                    mcp_servers[server_id] = server_config
                     logger.info(f"Loaded config for: {server_config.get('name', server_id)}")
+                    
+                    # Drop cached tool listings built from an older config
+                    cached_fingerprint = self.tool_catalog.fingerprint_of(server_id)
+                    if cached_fingerprint and cached_fingerprint != ToolCatalog.fingerprint(server_config):
+                        self.tool_catalog.invalidate(server_id)
+                        self.tool_result_cache.invalidate(server_id)
+            
+            # Servers removed or disabled in the config are dropped as well
+            self.mcp_servers = mcp_servers
+            self._configure_warm_pool()
+            self.tool_executor.configure(
+                self.settings['max_concurrent_tools'],
+                self.settings['max_concurrent_tools_per_server'],
+                {sid: cfg['max_concurrent_tools'] for sid, cfg in mcp_servers.items() if cfg.get('max_concurrent_tools')}
+            )
                 
         except Exception as e:
             logger.error(f"Failed to load MCP server configs: {str(e)}")
@@ -272,41 +742,44 @@ class StrandsMCPAgent:
             logger.info(f"Server {server_id} already connected")
             return True
         
+        # Overlapping connects for one server share a single attempt, otherwise
+        # each would start its own client and all but the last would leak
+        connecting = self._connecting.get(server_id)
+        if connecting is None:
+            connecting = asyncio.ensure_future(self._connect_server(server_id))
+            self._connecting[server_id] = connecting
+            connecting.add_done_callback(lambda _: self._connecting.pop(server_id, None))
+        else:
+            logger.info(f"Server {server_id} is already connecting, waiting for that attempt")
+        return await asyncio.shield(connecting)
+    
+    async def _connect_server(self, server_id: str) -> bool:
         server_config = self.mcp_servers[server_id]
+        started = time.perf_counter()
         
         try:
-            # Prepare command and environment
-            command = server_config.get('command', [])
-            args = server_config.get('args', [])
-            env_vars = server_config.get('env_vars', {})
-            
-            if not command:
+            if not server_config.get('command', []):
                 logger.error(f"No command specified for server {server_id}")
                 return False
             
-            # Prepare environment
-            env = os.environ.copy()
-            env.update(env_vars)
-            
-            # Create transport function for stdio connection
-            def create_stdio_transport():
-                full_command = command + args
-                return stdio_client(StdioServerParameters(
-                    command=full_command[0],
-                    args=full_command[1:] if len(full_command) > 1 else [],
-                    env=env
-                ))
-            
-            # Create FilteredMCPClient (subclass that filters None params)
-            mcp_client = FilteredMCPClient(create_stdio_transport)
-            
-            # Test connection by listing tools synchronously
-            # MCPClient uses sync context manager
-            with mcp_client:
-                tools = mcp_client.list_tools_sync()
-                tool_count = len(tools) if tools else 0
+            # Hand over a pre-started client for warm servers when one is ready
+            persistent = self.persistent_sessions
+            warm_client = None
+            if persistent and server_config.get('warm', False):
+                warm_client = self.warm_pool.acquire(server_id, server_config)
             
+            if warm_client:
+                mcp_client, tools = warm_client
+            else:
+                mcp_client = self._create_mcp_client(server_id, server_config)
+                tools = await self._start_mcp_client_async(server_id, mcp_client, persistent)
+            if persistent:
+                self.live_sessions.add(server_id)
+            tool_count = len(tools) if tools else 0
+            
+            self.tool_catalog.put(server_id, ToolCatalog.fingerprint(server_config), tools or [])
             self.mcp_clients[server_id] = mcp_client
+            self.agent_cache.invalidate(server_id=server_id)
             self.connected_servers[server_id] = {
                 'name': server_config.get('name', f'Server {server_id}'),
                 'description': server_config.get('description', ''),
@@ -315,6 +788,12 @@ class StrandsMCPAgent:
             }
             
             logger.info(f"Connected to {server_config.get('name', server_id)}: {tool_count} tools available")
+            self._trigger_event('server_connected', {
+                'server_id': server_id,
+                'tools_count': tool_count,
+                'warm': warm_client is not None,
+                'duration': time.perf_counter() - started
+            })
             return True
             
         except Exception as e:
@@ -324,13 +803,185 @@ class StrandsMCPAgent:
                 'status': 'error',
                 'error': str(e)
             }
+            self._trigger_event('server_error', {
+                'server_id': server_id,
+                'error': str(e),
+                'timed_out': isinstance(e, TimeoutError),
+                'duration': time.perf_counter() - started
+            })
             return False
     
+    async def connect_servers(
+        self,
+        server_ids: Optional[List[str]] = None,
+        max_concurrency: Optional[int] = None,
+        on_result: Optional[Callable[[str, Dict[str, Any]], None]] = None
+    ) -> Dict[str, Dict[str, Any]]:
+        """Connect several MCP servers concurrently with bounded parallelism
+        
+        Defaults to every configured server marked auto_connect. on_result is
+        called with (server_id, result) as each connection finishes.
+        """
+        if server_ids is None:
+            server_ids = [
+                server_id for server_id, server_config in self.mcp_servers.items()
+                if server_config.get('auto_connect', False)
+            ]
+        limit = max(1, int(max_concurrency or self.settings['max_concurrent_connections']))
+        semaphore = asyncio.Semaphore(limit)
+        logger.info(f"Connecting {len(server_ids)} servers, {limit} at a time")
+        
+        async def connect_one(server_id: str):
+            async with semaphore:
+                started = time.monotonic()
+                try:
+                    connected = await self.connect_server(server_id)
+                    error = None
+                except Exception as e:
+                    connected, error = False, str(e)
+                duration = time.monotonic() - started
+            
+            result = {
+                'success': connected,
+                'status': self.get_server_status(server_id),
+                'duration': round(duration, 3)
+            }
+            if not connected:
+                result['error'] = error or self.connected_servers.get(server_id, {}).get(
+                    'error', 'Failed to connect to server'
+                )
+            if on_result:
+                try:
+                    on_result(server_id, result)
+                except Exception as e:
+                    logger.error(f"Connect progress callback failed for {server_id}: {str(e)}")
+            return server_id, result
+        
+        results = {}
+        for finished in asyncio.as_completed([connect_one(server_id) for server_id in dict.fromkeys(server_ids)]):
+            server_id, result = await finished
+            results[server_id] = result
+        return results
+    
+    def _create_mcp_client(self, server_id: str, server_config: Dict) -> FilteredMCPClient:
+        """Build a stdio MCP client from a server's command, args and env_vars"""
+        command = server_config.get('command', [])
+        args = server_config.get('args', [])
+        env_vars = server_config.get('env_vars', {})
+        
+        # Prepare environment
+        env = os.environ.copy()
+        env.update(env_vars)
+        
+        # Create transport function for stdio connection
+        def create_stdio_transport():
+            full_command = command + args
+            return stdio_client(StdioServerParameters(
+                command=full_command[0],
+                args=full_command[1:] if len(full_command) > 1 else [],
+                env=env
+            ))
+        
+        # Create FilteredMCPClient (subclass that filters None params)
+        mcp_client = FilteredMCPClient(
+            create_stdio_transport,
+            server_id=server_id,
+            server_name=server_config.get('name', server_id),
+            journal=self.tool_journal,
+            timeouts=self.timeouts,
+            result_cache=self.tool_result_cache,
+            single_flight=self.single_flight,
+            # Covers spawning the server and the initialize handshake
+            startup_timeout=math.ceil(self.timeouts.session_init(server_id))
+        )
+        
+        mcp_client.on_coalesced = lambda tool_name: self._trigger_event(
+            'tool_call_coalesced', {'server_id': server_id, 'tool_name': tool_name}
+        )
+        # Re-list tools lazily after a tools/list_changed notification; cached agents
+        # hold the old tool specs even when the tool names are unchanged
+        if hasattr(mcp_client, 'on_tools_changed'):
+            mcp_client.on_tools_changed = lambda *_: (
+                self.tool_catalog.invalidate(server_id), self.tool_result_cache.invalidate(server_id),
+                self.agent_cache.invalidate(server_id=server_id)
+            )
+        
+        return mcp_client
+    
+    def _spawn_warm_client(self, server_id: str, server_config: Dict):
+        """Start a client for the warm pool, returning it with its tool listing"""
+        mcp_client = self._create_mcp_client(server_id, server_config)
+        return mcp_client, self._start_mcp_client(mcp_client, persistent=True)
+    
+    @staticmethod
+    def _stop_mcp_client(mcp_client: FilteredMCPClient):
+        mcp_client.stop(None, None, None)
+    
+    def _configure_warm_pool(self):
+        """Keep a warm pool for each server flagged warm: true and drop the rest"""
+        default_size = self.settings['warm_pool_size']
+        warm_ids = set()
+        if self.persistent_sessions:
+            for server_id, server_config in self.mcp_servers.items():
+                if server_config.get('warm', False) and server_config.get('command'):
+                    warm_ids.add(server_id)
+                    self.warm_pool.configure(
+                        server_id, server_config, server_config.get('warm_pool_size', default_size)
+                    )
+        for server_id in self.warm_pool.server_ids():
+            if server_id not in warm_ids:
+                self.warm_pool.remove(server_id)
+    
+    async def _start_mcp_client_async(self, server_id: str, mcp_client: FilteredMCPClient, persistent: bool) -> List[Any]:
+        """Start a client on a worker thread within the server's connection timeout
+        
+        A thread can't be cancelled, so if the caller gives up (timeout or
+        cancellation) the start runs on and the client is stopped as soon as
+        it finishes, instead of leaving its stdio server running unowned.
+        """
+        # Spawning stdio servers blocks for seconds, keep it off the event loop
+        start = asyncio.ensure_future(asyncio.to_thread(self._start_mcp_client, mcp_client, persistent))
+        timeout = self.timeouts.connection(server_id)
+        try:
+            return await asyncio.wait_for(asyncio.shield(start), timeout)
+        except (asyncio.TimeoutError, asyncio.CancelledError) as e:
+            def discard(task: asyncio.Future):
+                if persistent and not task.cancelled() and task.exception() is None:
+                    logger.info(f"Stopping abandoned client for {server_id}")
+                    asyncio.ensure_future(asyncio.to_thread(self._stop_mcp_client, mcp_client))
+            start.add_done_callback(discard)
+            if isinstance(e, asyncio.TimeoutError):
+                raise TimeoutError(f"Connecting to {server_id} timed out after {timeout} seconds") from None
+            raise
+    
+    def _start_mcp_client(self, mcp_client: FilteredMCPClient, persistent: bool) -> List[Any]:
+        """Start (or just probe) an MCP client session and list its tools"""
+        if persistent:
+            # Start the session once and keep it open until disconnect
+            mcp_client.start()
+            try:
+                return mcp_client.list_tools_sync()
+            except Exception:
+                mcp_client.stop(None, None, None)
+                raise
+        
+        # Test connection by listing tools synchronously
+        # MCPClient uses sync context manager
+        with mcp_client:
+            return mcp_client.list_tools_sync()
+    
     async def disconnect_server(self, server_id: str) -> bool:
         """Disconnect from a specific MCP server"""
         if server_id in self.mcp_clients:
             try:
-                del self.mcp_clients[server_id]
+                mcp_client = self.mcp_clients.pop(server_id)
+                if server_id in self.live_sessions:
+                    # Close the long-lived session and its stdio process
+                    self.live_sessions.discard(server_id)
+                    await asyncio.to_thread(self._stop_mcp_client, mcp_client)
+                self.tool_catalog.invalidate(server_id)
+                self.tool_result_cache.invalidate(server_id)
+                self.agent_cache.invalidate(server_id=server_id)
                 if server_id in self.connected_servers:
                     del self.connected_servers[server_id]
                 logger.info(f"Disconnected from server {server_id}")
@@ -340,141 +991,438 @@ class StrandsMCPAgent:
                 return False
         return True
     
+    async def cleanup(self):
+        """Close all open MCP sessions"""
+        for server_id in list(self.mcp_clients.keys()):
+            await self.disconnect_server(server_id)
+        await asyncio.to_thread(self.warm_pool.shutdown)
+    
+    def on_event(self, event_type: str, callback) -> Subscription:
+        """Register an event callback, run on its own event bus worker"""
+        return self.event_bus.subscribe(callback, [event_type], name=event_type)
+    
+    def _trigger_event(self, event_type: str, data: Any):
+        """Publish an event; callbacks run asynchronously and never block the caller"""
+        self.event_bus.publish(event_type, data)
+    
+    def _open_mcp_sessions(self, stack: AsyncExitStack):
+        """Enter MCP client contexts unless sessions are already kept open"""
+        for server_id, mcp_client in self.mcp_clients.items():
+            if server_id not in self.live_sessions:
+                stack.enter_context(mcp_client)
+    
+    def _get_server_tools(self, server_id: str, timer: Optional[TurnTimer] = None) -> List[Any]:
+        """Get a server's tools from the catalog, listing them only on a cache miss"""
+        fingerprint = ToolCatalog.fingerprint(self.mcp_servers.get(server_id, {}))
+        tools = self.tool_catalog.get(server_id, fingerprint)
+        if tools is None:
+            mcp_client = self.mcp_clients[server_id]
+            started = time.perf_counter()
+            with ExitStack() as stack:
+                if server_id not in self.live_sessions:
+                    stack.enter_context(mcp_client)
+                tools = mcp_client.list_tools_sync()
+            if timer:
+                timer.list_tools_done(server_id, time.perf_counter() - started)
+            else:
+                self.latency_metrics.observe('list_tools', time.perf_counter() - started, {'server_id': server_id})
+            self.tool_catalog.put(server_id, fingerprint, tools or [])
+            tools = self.tool_catalog.get(server_id, fingerprint)
+        return tools
+    
+    def _collect_tools(self, timer: Optional[TurnTimer] = None) -> List[Any]:
+        """Gather loaded Strands tools and cached MCP tools for agent construction"""
+        all_tools = list(self.strands_tools.values())
+        for server_id in self.mcp_clients:
+            all_tools.extend(self._get_server_tools(server_id, timer))
+        return all_tools
+    
+    def _prompt_cache_support(self, model_id: Optional[str] = None) -> Dict[str, bool]:
+        """Which prompt sections get Bedrock cache points for a model"""
+        model_id = (model_id or self.current_model_id).lower()
+        if not self.prompt_caching:
+            return {'system': False, 'tools': False}
+        if 'anthropic.claude' in model_id:
+            return {'system': True, 'tools': True}
+        if 'amazon.nova' in model_id:
+            # Nova caches system and messages but not tool definitions
+            return {'system': True, 'tools': False}
+        return {'system': False, 'tools': False}
+    
+    def _checkout_agent(self, tools: List[Any], temperature: float = 0.7, max_tokens: int = 9500,
+                        timer: Optional[TurnTimer] = None, blocking: bool = False):
+        """Borrow a cached Agent for the current model, sampling parameters and tool set
+        
+        Returns an async context manager, or a plain one when `blocking` is set
+        for callers outside the event loop.
+        """
+        strands_names = {id(tool): name for name, tool in self.strands_tools.items()}
+        tool_ids = [
+            f"strands:{strands_names[id(tool)]}" if id(tool) in strands_names
+            else f"mcp:{getattr(tool, 'tool_name', tool)}"
+            for tool in tools
+        ]
+        has_mcp_tools = any(tool_id.startswith('mcp:') for tool_id in tool_ids)
+        server_ids = list(self.mcp_clients.keys()) if has_mcp_tools else []
+        
+        key = AgentCache.make_key(self.current_model_id, temperature, max_tokens, tool_ids)
+        
+        cache_support = self._prompt_cache_support()
+        
+        def build_agent():
+            logger.info(f"Creating agent with {len(tools)} tools")
+            with timer.stage('agent_construction') if timer else nullcontext():
+                model = BedrockModel(**{
+                    **self.model_config,
+                    'model_id': self.current_model_id,
+                    'temperature': temperature,
+                    'max_tokens': max_tokens,
+                    # The system prompt carries its own cache point (see _prepare_turn)
+                    **({'cache_config': CacheConfig(strategy='anthropic', tools_ttl=True, system_prompt_ttl=False)}
+                       if tools and cache_support['tools'] else {})
+                })
+                agent = Agent(model=model, tools=tools, tool_executor=self.tool_executor) if tools else Agent(model=model)
+            self._add_agent_hooks(agent)
+            return agent
+        
+        checkout = self.agent_cache.checkout if blocking else self.agent_cache.acheckout
+        return checkout(key, build_agent, tool_ids=tool_ids, server_ids=server_ids)
+    
+    def _add_agent_hooks(self, agent: Agent):
+        """Report model and tool calls to the TurnTimer passed in invocation_state and as events"""
+        def timer_for(event) -> Optional[TurnTimer]:
+            return (event.invocation_state or {}).get('turn_timer')
+        
+        def before_model(event: BeforeModelCallEvent):
+            timer = timer_for(event)
+            if timer:
+                timer.model_call_started()
+        
+        def after_model(event: AfterModelCallEvent):
+            timer = timer_for(event)
+            duration = timer.model_call_finished() if timer else None
+            if duration is not None:
+                self._trigger_event('model_call_complete', {
+                    'model_id': timer.model_id,
+                    'duration': duration,
+                    'error': str(event.exception) if event.exception else None
+                })
+        
+        def before_tool(event: BeforeToolCallEvent):
+            timer = timer_for(event)
+            if timer:
+                mcp_client = getattr(event.selected_tool, 'mcp_client', None)
+                server_id = getattr(mcp_client, 'server_id', None) if mcp_client else 'strands'
+                timer.tool_started(event.tool_use.get('toolUseId', ''), event.tool_use.get('name', 'unknown'), server_id)
+        
+        def after_tool(event: AfterToolCallEvent):
+            tool_use_id = event.tool_use.get('toolUseId', '')
+            consume_timeout = getattr(getattr(event.selected_tool, 'mcp_client', None), 'consume_timeout', None)
+            timed_out = bool(consume_timeout and consume_timeout(tool_use_id))
+            timer = timer_for(event)
+            if timer:
+                failed = timed_out or event.exception is not None or (event.result or {}).get('status') == 'error'
+                summary = timer.tool_finished(tool_use_id, 'error' if failed else 'success')
+                if summary:
+                    self._trigger_event('tool_call_error' if failed else 'tool_call_complete', {
+                        'server_id': summary['server_id'],
+                        'tool_name': summary['tool_name'],
+                        'duration': summary['ms'] / 1000,
+                        **({'timed_out': True} if timed_out else {})
+                    })
+        
+        agent.hooks.add_callback(BeforeModelCallEvent, before_model)
+        agent.hooks.add_callback(AfterModelCallEvent, after_model)
+        agent.hooks.add_callback(BeforeToolCallEvent, before_tool)
+        agent.hooks.add_callback(AfterToolCallEvent, after_tool)
+    
+    def _prepare_turn(self, message: str, system_prompt: Optional[str], conversation) -> Dict[str, Any]:
+        """Build the prompt, system prompt and prior messages for one chat turn"""
+        system_text = f"{system_prompt}\n\n{TOOL_GUIDANCE}" if system_prompt else TOOL_GUIDANCE
+        
+        if self.native_messages:
+            system_content = system_text
+            if self._prompt_cache_support()['system']:
+                # Cache checkpoint after the (stable) system prompt
+                system_content = [{'text': system_text}, {'cachePoint': {'type': 'default'}}]
+            
+            # Only the new user message is appended to the structured history
+            return {
+                'native': True,
+                'prompt': message,
+                'system_prompt': system_content,
+                'history': conversation.get_messages(self.context_turns)
+            }
+        
+        # Legacy mode: flatten system prompt and recent history into one user message
+        conversation_messages = [f"System: {system_text}"]
+        for item in conversation.recent(10):
+            if item['role'] == 'user':
+                conversation_messages.append(f"User: {item['content']}")
+            else:
+                conversation_messages.append(f"Assistant: {item['content']}")
+        conversation_messages.append(f"User: {message}")
+        
+        return {
+            'native': False,
+            'prompt': "\n\n".join(conversation_messages),
+            'system_prompt': None,
+            'history': []
+        }
+    
+    @asynccontextmanager
+    async def _agent_for_turn(self, turn: Dict[str, Any], tools: List[Any], temperature: float, max_tokens: int):
+        """Check out an agent primed with the turn's system prompt and prior messages"""
+        async with self._checkout_agent(tools, temperature, max_tokens, turn.get('timer')) as agent:
+            agent.system_prompt = turn['system_prompt']
+            agent.messages = list(turn['history'])
+            removed_before = getattr(agent.conversation_manager, 'removed_message_count', 0)
+            usage_before = accumulate_usage({}, self._agent_usage(agent))
+            
+            yield agent
+            
+            # Cached agents keep their metrics across turns, so record only this turn's share
+            usage_after = accumulate_usage({}, self._agent_usage(agent))
+            turn['usage'] = {key: usage_after[key] - usage_before[key] for key in usage_after}
+            
+            if turn['native']:
+                # Keep the messages this turn added (user prompt, tool use/results, reply),
+                # allowing for any the conversation manager trimmed from the front
+                removed = getattr(agent.conversation_manager, 'removed_message_count', 0) - removed_before
+                start = max(0, len(turn['history']) - removed)
+                turn['messages'] = list(agent.messages[start:])
+    
+    @staticmethod
+    def _agent_usage(agent: Any) -> Optional[Dict[str, Any]]:
+        """Get the Bedrock usage an agent has accumulated over its lifetime"""
+        metrics = getattr(agent, 'event_loop_metrics', None)
+        return getattr(metrics, 'accumulated_usage', None)
+    
     async def get_available_tools(self) -> List[Dict]:
         """Get list of all available tools from connected servers and Strands"""
-        # Start with loaded Strands tools
-        all_tools = list(self.strands_tools.values())
+        # Start with loaded Strands tools, described from their specs without importing them
+        all_tools = [
+            {
+                'name': tool.tool_name,
+                'description': tool.tool_spec.get('description', ''),
+                'server_id': 'strands',
+                'server_name': 'Strands Tools'
+            }
+            for tool in self.strands_tools.values()
+        ]
         
-        for server_id, mcp_client in self.mcp_clients.items():
+        for server_id in list(self.mcp_clients.keys()):
             try:
-                # Use sync context manager
-                with mcp_client:
-                    tools = mcp_client.list_tools_sync()
-                    # Note: Don't wrap here since this is just for listing, not execution
-                    for tool in tools:
-                        # Handle MCPAgentTool structure
-                        if hasattr(tool, 'tool_def'):
-                            name = tool.tool_def.name
-                            description = tool.tool_def.description
-                        else:
-                            name = getattr(tool, 'name', 'unknown')
-                            description = getattr(tool, 'description', '')
-                        
-                        all_tools.append({
-                            'name': name,
-                            'description': description,
-                            'server_id': server_id,
-                            'server_name': self.connected_servers.get(server_id, {}).get('name', 'Unknown')
-                        })
+                # Served from the tool catalog; only lists on a cache miss
+                tools = await asyncio.to_thread(self._get_server_tools, server_id)
+                # Note: Don't wrap here since this is just for listing, not execution
+                for tool in tools:
+                    # Handle MCPAgentTool structure
+                    if hasattr(tool, 'tool_def'):
+                        name = tool.tool_def.name
+                        description = tool.tool_def.description
+                    elif hasattr(tool, 'mcp_tool'):
+                        name = tool.mcp_tool.name
+                        description = tool.mcp_tool.description
+                    else:
+                        name = getattr(tool, 'name', 'unknown')
+                        description = getattr(tool, 'description', '')
+                    
+                    all_tools.append({
+                        'name': name,
+                        'description': description,
+                        'server_id': server_id,
+                        'server_name': self.connected_servers.get(server_id, {}).get('name', 'Unknown')
+                    })
             except Exception as e:
                 logger.error(f"Failed to get tools from {server_id}: {str(e)}")
         
         return all_tools
     
+    def _find_tool(self, tool_name: str, server_id: Optional[str] = None) -> List[Tuple[str, Any]]:
+        """(server_id, tool) pairs matching a tool name among loaded Strands tools and cached MCP tools"""
+        matches = []
+        if server_id in (None, 'strands'):
+            for name, tool in self.strands_tools.items():
+                if tool_name in (name, tool.tool_name):
+                    matches.append(('strands', tool))
+        for sid in list(self.mcp_clients.keys()):
+            if server_id not in (None, sid):
+                continue
+            for tool in self._get_server_tools(sid):
+                mcp_tool = getattr(tool, 'mcp_tool', None)
+                if tool_name in (tool.tool_name, getattr(mcp_tool, 'name', None)):
+                    matches.append((sid, tool))
+        return matches
+    
+    async def _call_mcp_tool(self, server_id: str, tool: Any, tool_use_id: str,
+                             arguments: Dict[str, Any], timeout: float) -> Tuple[Dict[str, Any], bool]:
+        """Call an MCP tool over the server's session, opening one just for this call if none is kept open
+        
+        Returns (result, timed_out).
+        """
+        mcp_client = self.mcp_clients[server_id]
+        live = server_id in self.live_sessions
+        if not live:
+            await asyncio.to_thread(mcp_client.start)
+        try:
+            return await mcp_client.call_tool_with_timeout(tool_use_id, tool.mcp_tool.name, arguments, timeout=timeout)
+        finally:
+            if not live:
+                await asyncio.to_thread(self._stop_mcp_client, mcp_client)
+    
+    @staticmethod
+    async def _run_strands_tool(tool: Any, tool_use_id: str, arguments: Dict[str, Any]) -> Dict[str, Any]:
+        """Run a Strands tool in-process and return its final tool result"""
+        final = None
+        async for event in tool.stream({'toolUseId': tool_use_id, 'name': tool.tool_name, 'input': arguments}, {}):
+            final = event
+        if isinstance(final, dict) and 'tool_result' in final:
+            return final['tool_result']
+        return final or {'status': 'error', 'content': [{'text': 'Tool produced no result'}]}
+    
+    async def execute_tool(
+        self,
+        tool_name: str,
+        arguments: Optional[Dict[str, Any]] = None,
+        server_id: Optional[str] = None,
+        timeout: Optional[float] = None
+    ) -> Dict[str, Any]:
+        """Run a single tool directly, without a model round trip
+        
+        The tool is resolved by name against loaded Strands tools and the
+        tool catalog of connected servers (narrowed by server_id if given).
+        Without an explicit `timeout` the timeout policy applies.
+        On failure `error_class` is one of ServerNotConnected, ToolNotFound,
+        AmbiguousTool, Timeout, ToolError (reported by the tool) or the
+        exception class name.
+        """
+        started = time.perf_counter()
+        arguments = {k: v for k, v in (arguments or {}).items() if v is not None}
+        response: Dict[str, Any] = {
+            'success': False,
+            'tool_name': tool_name,
+            'server_id': server_id,
+            'content': [],
+            'structured_content': None,
+            'duration': 0.0,
+            'error': None,
+            'error_class': None,
+            'cached': False
+        }
+        
+        def finish(error_class: Optional[str] = None, error: Optional[str] = None) -> Dict[str, Any]:
+            duration = time.perf_counter() - started
+            response.update(success=error_class is None, error=error, error_class=error_class, duration=duration)
+            if 'tool_use_id' in response:  # Only calls that reached the tool are measured
+                status = 'success' if error_class is None else 'error'
+                self.latency_metrics.observe('tool_call', duration, {'tool_name': tool_name, 'status': status})
+                self._trigger_event('tool_call_complete' if error_class is None else 'tool_call_error', {
+                    'server_id': response['server_id'],
+                    'tool_name': tool_name,
+                    'duration': duration,
+                    'timed_out': error_class == 'Timeout'
+                })
+            return response
+        
+        if server_id and server_id != 'strands' and server_id not in self.mcp_clients:
+            return finish('ServerNotConnected', f"Server {server_id} is not connected")
+        
+        try:
+            matches = await asyncio.to_thread(self._find_tool, tool_name, server_id)
+        except Exception as e:
+            logger.error(f"Failed to resolve tool {tool_name}: {str(e)}")
+            return finish(type(e).__name__, str(e))
+        if not matches:
+            return finish('ToolNotFound', f"Tool {tool_name} not found")
+        if len(matches) > 1:
+            servers = ', '.join(sorted({sid for sid, _ in matches}))
+            return finish('AmbiguousTool', f"Tool {tool_name} is provided by several servers ({servers}); pass server_id")
+        
+        resolved_server, tool = matches[0]
+        tool_use_id = f"direct-{uuid.uuid4().hex[:12]}"
+        response.update(server_id=resolved_server, tool_use_id=tool_use_id)
+        timeout = timeout or self.timeouts.tool(resolved_server, tool_name)
+        try:
+            if resolved_server == 'strands':
+                result = await asyncio.wait_for(self._run_strands_tool(tool, tool_use_id, arguments), timeout=timeout)
+                timed_out = False
+            else:
+                result, timed_out = await self._call_mcp_tool(resolved_server, tool, tool_use_id, arguments, timeout)
+        except asyncio.TimeoutError:
+            timed_out = True
+        except Exception as e:
+            logger.error(f"Direct tool execution failed: {tool_name}: {str(e)}")
+            return finish(type(e).__name__, str(e))
+        if timed_out:
+            return finish('Timeout', f"Tool execution timed out after {timeout} seconds")
+
+        if resolved_server != 'strands':
+            response['cached'] = self.mcp_clients[resolved_server].consume_cache_hit(tool_use_id)
+        
+        # Content blocks may hold bytes (images, documents); keep the response JSON-safe
+        response['content'] = json.loads(json.dumps(result.get('content', []), default=str))
+        response['structured_content'] = result.get('structuredContent')
+        if result.get('status') == 'error':
+            message = ' '.join(c['text'] for c in response['content'] if isinstance(c, dict) and 'text' in c)
+            return finish('ToolError', message or 'Tool reported an error')
+        return finish()
+    
     async def chat(
         self,
         message: str,
         system_prompt: Optional[str] = None,
         temperature: float = 0.7,
         max_tokens: int = 9500,
-        use_tools: bool = True
+        use_tools: bool = True,
+        conversation_id: Optional[str] = None
     ) -> Dict[str, Any]:
         """Send a chat message and get response with proper MCP context management"""
         try:
-            # Update model parameters
-            self.bedrock_model.temperature = temperature
-            self.bedrock_model.max_tokens = max_tokens
+            timer = TurnTimer(self.latency_metrics, mode='chat', model_id=self.current_model_id)
             
-            # Prepare the conversation context
-            conversation_messages = []
-            
-            # Add tool usage guidance
-            tool_guidance = """IMPORTANT: You have access to real tools that you MUST use to complete tasks. 
-
-When a user asks you to perform an action that requires a tool:
-1. IMMEDIATELY invoke the appropriate tool - DO NOT describe what you would do
-2. Use the actual tool function, not a JSON representation
-3. Wait for the tool's response before continuing
-4. Base your response on the actual tool output
-
-Tool Usage Rules:
-- ALWAYS use tools when they are relevant to the user's request
-- NEVER describe tool usage in hypothetical terms like "I would use" or "I will use"
-- DIRECTLY invoke tools without asking for permission
-- Only provide parameters that have actual values
-- Never provide empty strings, None, null, or undefined values
-- For file operations: Use file_read to read files, file_edit to modify them
-- For system operations: Use shell to execute commands
-- For calculations: Use calculator for mathematical operations
-
-Example: If asked to "read the README file":
-✓ CORRECT: Directly call file_read(file_path="README.md")
-✗ WRONG: "I will use the file_read tool to read the README file"
-
-You are an AI assistant with REAL tool access. Use them!"""
-            
-            if system_prompt:
-                conversation_messages.append(f"System: {system_prompt}\n\n{tool_guidance}")
-            else:
-                conversation_messages.append(f"System: {tool_guidance}")
-            
-            # Add recent conversation history
-            recent_history = self.conversation_history[-10:] if len(self.conversation_history) > 10 else self.conversation_history
-            for item in recent_history:
-                if item['role'] == 'user':
-                    conversation_messages.append(f"User: {item['content']}")
-                else:
-                    conversation_messages.append(f"Assistant: {item['content']}")
-            
-            conversation_messages.append(f"User: {message}")
-            full_conversation = "\n\n".join(conversation_messages)
+            # Prepare the prompt and prior messages for this session's turn
+            conversation = self.conversations.get(conversation_id)
+            with timer.stage('prompt_build'):
+                turn = self._prepare_turn(message, system_prompt, conversation)
+            turn['timer'] = timer
             
             response_text = ""
             
             if use_tools and (self.mcp_clients or self.strands_tools):
                 # Execute within all MCP client contexts using sync context manager
-                with ExitStack() as stack:
-                    # Start with loaded Strands tools
-                    all_tools = list(self.strands_tools.values())
+                async with AsyncExitStack() as stack:
+                    # Loaded Strands tools plus MCP tools from connected servers
+                    with timer.stage('mcp_context_entry'):
+                        await asyncio.to_thread(self._open_mcp_sessions, stack)
+                    all_tools = await asyncio.to_thread(self._collect_tools, timer)
                     
-                    # Add MCP tools if any clients are connected
-                    for mcp_client in self.mcp_clients.values():
-                        stack.enter_context(mcp_client)
-                        tools = mcp_client.list_tools_sync()
-                        all_tools.extend(tools)
+                    # Reuse an agent with the same model and tool set
+                    agent = await stack.enter_async_context(self._agent_for_turn(turn, all_tools, temperature, max_tokens))
                     
-                    # Create agent with Bedrock model and all tools
-                    logger.info(f"Creating agent with {len(all_tools)} tools")
-                    agent = Agent(model=self.bedrock_model, tools=all_tools)
-                    
-                    # Run the agent (using direct call, not run_async)
-                    response = agent(full_conversation)
+                    # Run the agent without blocking the shared event loop
+                    response = await agent.invoke_async(turn['prompt'], invocation_state={'turn_timer': timer})
                     response_text = str(response) if response else "No response generated"
             else:
-                # Create agent without tools
-                agent = Agent(model=self.bedrock_model)
-                response = agent(full_conversation)
+                # Agent without tools
+                async with self._agent_for_turn(turn, [], temperature, max_tokens) as agent:
+                    response = await agent.invoke_async(turn['prompt'], invocation_state={'turn_timer': timer})
                 response_text = str(response) if response else "No response generated"
-            
-            # Update conversation history
-            self.conversation_history.append({
-                "role": "user",
-                "content": message,
-                "timestamp": datetime.now().isoformat()
-            })
-            self.conversation_history.append({
-                "role": "assistant",
-                "content": response_text,
-                "timestamp": datetime.now().isoformat()
+            usage = turn.get('usage', {})
+            timing = timer.finish()
+            self._trigger_event('turn_complete', {
+                'model_id': timer.model_id, 'mode': 'chat', 'usage': usage, 'timing': timing
             })
             
-            # Keep history manageable
-            if len(self.conversation_history) > 50:
-                self.conversation_history = self.conversation_history[-40:]
+            # Update conversation history (bounded per conversation)
+            conversation.append_turn(message, response_text, turn.get('messages'))
+            conversation.add_usage(usage)
             
             return {
                 "success": True,
                 "content": response_text,
+                "usage": usage,
+                "timing": timing,
                 "timestamp": datetime.now().isoformat()
             }
             
@@ -492,83 +1440,44 @@ You are an AI assistant with REAL tool access. Use them!"""
         system_prompt: Optional[str] = None,
         temperature: float = 0.7,
         max_tokens: int = 9500,
-        use_tools: bool = True
+        use_tools: bool = True,
+        conversation_id: Optional[str] = None
     ) -> AsyncGenerator[Dict[str, Any], None]:
         """Stream chat responses with proper event handling"""
         try:
-            # Update model parameters
-            self.bedrock_model.temperature = temperature
-            self.bedrock_model.max_tokens = max_tokens
+            timer = TurnTimer(self.latency_metrics, mode='stream', model_id=self.current_model_id)
             
-            # Prepare conversation
-            conversation_messages = []
-            
-            # Add tool usage guidance
-            tool_guidance = """IMPORTANT: You have access to real tools that you MUST use to complete tasks. 
-
-When a user asks you to perform an action that requires a tool:
-1. IMMEDIATELY invoke the appropriate tool - DO NOT describe what you would do
-2. Use the actual tool function, not a JSON representation
-3. Wait for the tool's response before continuing
-4. Base your response on the actual tool output
-
-Tool Usage Rules:
-- ALWAYS use tools when they are relevant to the user's request
-- NEVER describe tool usage in hypothetical terms like "I would use" or "I will use"
-- DIRECTLY invoke tools without asking for permission
-- Only provide parameters that have actual values
-- Never provide empty strings, None, null, or undefined values
-- For file operations: Use file_read to read files, file_edit to modify them
-- For system operations: Use shell to execute commands
-- For calculations: Use calculator for mathematical operations
-
-Example: If asked to "read the README file":
-✓ CORRECT: Directly call file_read(file_path="README.md")
-✗ WRONG: "I will use the file_read tool to read the README file"
-
-You are an AI assistant with REAL tool access. Use them!"""
-            
-            if system_prompt:
-                conversation_messages.append(f"System: {system_prompt}\n\n{tool_guidance}")
-            else:
-                conversation_messages.append(f"System: {tool_guidance}")
-            
-            recent_history = self.conversation_history[-10:] if len(self.conversation_history) > 10 else self.conversation_history
-            for item in recent_history:
-                if item['role'] == 'user':
-                    conversation_messages.append(f"User: {item['content']}")
-                else:
-                    conversation_messages.append(f"Assistant: {item['content']}")
-            
-            conversation_messages.append(f"User: {message}")
-            full_conversation = "\n\n".join(conversation_messages)
+            # Prepare the prompt and prior messages for this session's turn
+            conversation = self.conversations.get(conversation_id)
+            with timer.stage('prompt_build'):
+                turn = self._prepare_turn(message, system_prompt, conversation)
+            turn['timer'] = timer
             
             full_response = ""
             current_tool_use = None
+            usage = accumulate_usage({}, None)  # Summed over every model call in the turn
             
             if use_tools and (self.mcp_clients or self.strands_tools):
                 # Stream within MCP contexts
-                with ExitStack() as stack:
-                    # Start with loaded Strands tools
-                    all_tools = list(self.strands_tools.values())
-                    
-                    # Add MCP tools if any clients are connected
-                    for mcp_client in self.mcp_clients.values():
-                        stack.enter_context(mcp_client)
-                        tools = mcp_client.list_tools_sync()
-                        all_tools.extend(tools)
+                async with AsyncExitStack() as stack:
+                    # Loaded Strands tools plus MCP tools from connected servers
+                    with timer.stage('mcp_context_entry'):
+                        await asyncio.to_thread(self._open_mcp_sessions, stack)
+                    all_tools = await asyncio.to_thread(self._collect_tools, timer)
                     
-                    # Create agent with all tools
+                    # Reuse an agent with the same model and tool set
                     logger.info(f"Streaming with {len(all_tools)} tools")
-                    agent = Agent(model=self.bedrock_model, tools=all_tools)
+                    agent = await stack.enter_async_context(self._agent_for_turn(turn, all_tools, temperature, max_tokens))
                     
                     # Stream the response - simplified approach
-                    async for event in agent.stream_async(full_conversation):
+                    async for event in agent.stream_async(turn['prompt'], invocation_state={'turn_timer': timer}):
                         # Parse the complex event structure
                         if isinstance(event, dict):
                             # Check for nested event structure
                             if 'event' in event:
                                 event_data = event['event']
+                                if 'contentBlockStart' in event_data or 'contentBlockDelta' in event_data:
+                                    timer.mark_first_token()
                                 
                                 # Handle text deltas - just send raw text
                                 if 'contentBlockDelta' in event_data:
@@ -583,31 +1492,28 @@ You are an AI assistant with REAL tool access. Use them!"""
                                             "timestamp": datetime.now().isoformat()
                                         }
                                 
-                                # Handle tool use
-                                elif 'toolUse' in event_data:
-                                    tool_info = event_data['toolUse']
-                                    yield {
-                                        "type": "tool_execution",
-                                        "tool_name": tool_info.get('name', 'unknown'),
-                                        "tool_id": tool_info.get('toolUseId', ''),
-                                        "input": tool_info.get('input', {}),
-                                        "timestamp": datetime.now().isoformat()
-                                    }
-                                
-                                # Handle tool results
-                                elif 'toolResult' in event_data:
-                                    result_info = event_data['toolResult']
-                                    yield {
-                                        "type": "tool_result",
-                                        "content": result_info.get('content', []),
-                                        "timestamp": datetime.now().isoformat()
-                                    }
+                                # Token usage, including prompt cache reads/writes
+                                elif 'metadata' in event_data:
+                                    accumulate_usage(usage, event_data['metadata'].get('usage'))
                                 
                                 # Handle message stop
                                 elif 'messageStop' in event_data:
                                     # Message is complete
                                     pass  # Will handle completion below
                             
+                            # Each tool call as it starts and finishes (calls run in parallel)
+                            elif 'tool_progress' in event:
+                                progress = dict(event['tool_progress'])
+                                stage = progress.pop('stage')
+                                if 'content' in progress:
+                                    # Content blocks may hold bytes (images, documents)
+                                    progress['content'] = json.loads(json.dumps(progress['content'], default=str))
+                                yield {
+                                    "type": stage,
+                                    **progress,
+                                    "timestamp": datetime.now().isoformat()
+                                }
+                            
                             # Don't also process 'data' field if we already processed 'event'
                             # This was causing duplication
                         elif isinstance(event, str):
@@ -623,46 +1529,43 @@ You are an AI assistant with REAL tool access. Use them!"""
                                 }
             else:
                 # Stream without tools
-                agent = Agent(model=self.bedrock_model)
-                
-                async for event in agent.stream_async(full_conversation):
-                    # Parse event structure
-                    if isinstance(event, dict):
-                        if 'event' in event:
-                            event_data = event['event']
-                            if 'contentBlockDelta' in event_data:
-                                delta = event_data['contentBlockDelta'].get('delta', {})
-                                if 'text' in delta:
-                                    text = delta['text']
-                                    full_response += text
-                                    yield {
-                                        "type": "text_delta",
-                                        "text": text,
-                                        "timestamp": datetime.now().isoformat()
-                                    }
-                        # Don't process 'data' if we already processed 'event'
+                async with self._agent_for_turn(turn, [], temperature, max_tokens) as agent:
+                    async for event in agent.stream_async(turn['prompt'], invocation_state={'turn_timer': timer}):
+                        # Parse event structure
+                        if isinstance(event, dict):
+                            if 'event' in event:
+                                event_data = event['event']
+                                if 'contentBlockStart' in event_data or 'contentBlockDelta' in event_data:
+                                    timer.mark_first_token()
+                                if 'contentBlockDelta' in event_data:
+                                    delta = event_data['contentBlockDelta'].get('delta', {})
+                                    if 'text' in delta:
+                                        text = delta['text']
+                                        full_response += text
+                                        yield {
+                                            "type": "text_delta",
+                                            "text": text,
+                                            "timestamp": datetime.now().isoformat()
+                                        }
+                                elif 'metadata' in event_data:
+                                    accumulate_usage(usage, event_data['metadata'].get('usage'))
+                            # Don't process 'data' if we already processed 'event'
             
             # Signal completion
+            timing = timer.finish()
+            self._trigger_event('turn_complete', {
+                'model_id': timer.model_id, 'mode': 'stream', 'usage': usage, 'timing': timing
+            })
             yield {
                 "type": "message_complete",
+                "usage": usage,
+                "timing": timing,
                 "timestamp": datetime.now().isoformat()
             }
             
-            # Update history
-            self.conversation_history.append({
-                "role": "user",
-                "content": message,
-                "timestamp": datetime.now().isoformat()
-            })
-            self.conversation_history.append({
-                "role": "assistant",
-                "content": full_response,
-                "timestamp": datetime.now().isoformat()
-            })
-            
-            # Keep history manageable
-            if len(self.conversation_history) > 50:
-                self.conversation_history = self.conversation_history[-40:]
+            # Update history (bounded per conversation)
+            conversation.append_turn(message, full_response, turn.get('messages'))
+            conversation.add_usage(usage)
                 
         except Exception as e:
             logger.error(f"Streaming error: {str(e)}", exc_info=True)
@@ -674,6 +1577,9 @@ You are an AI assistant with REAL tool access. Use them!"""
     
     def get_server_status(self, server_id: str = None) -> Dict[str, Any]:
         """Get status of MCP servers"""
+        # Pick up external edits to the config file (a stat call when unchanged)
+        self.config_repository.refresh()
+        
         if server_id:
             if server_id in self.connected_servers:
                 return self.connected_servers[server_id]
@@ -710,19 +1616,27 @@ You are an AI assistant with REAL tool access. Use them!"""
             "servers": all_servers,
             "total_servers": len(self.mcp_servers),
             "connected_servers": len([s for s in self.connected_servers.values() if s['status'] == 'connected']),
-            "total_tools": total_tools
+            "total_tools": total_tools,
+            "warm_pool": self.warm_pool.get_stats()
         }
     
-    def clear_history(self):
+    @property
+    def conversation_history(self) -> List[Dict]:
+        """History of the default conversation (kept for backward compatibility)"""
+        return list(self.conversations.get().messages)
+    
+    def clear_history(self, conversation_id: Optional[str] = None):
         """Clear conversation history"""
-        self.conversation_history = []
+        self.conversations.clear(conversation_id)
         logger.info("Conversation history cleared")
     
-    def get_conversation_stats(self) -> Dict:
+    def get_conversation_stats(self, conversation_id: Optional[str] = None) -> Dict:
         """Get conversation statistics"""
-        total_messages = len(self.conversation_history)
-        user_messages = sum(1 for msg in self.conversation_history if msg['role'] == 'user')
-        assistant_messages = sum(1 for msg in self.conversation_history if msg['role'] == 'assistant')
+        conversation = self.conversations.peek(conversation_id)
+        message_stats = conversation.get_stats() if conversation else {}
+        total_messages = message_stats.get('total_messages', 0)
+        user_messages = message_stats.get('user_messages', 0)
+        assistant_messages = message_stats.get('assistant_messages', 0)
         
         total_tools = sum(
             s.get('tools_count', 0) 
@@ -730,20 +1644,28 @@ You are an AI assistant with REAL tool access. Use them!"""
             if s.get('status') == 'connected'
         )
         
+        # Token usage including prompt cache reads/writes
+        usage = accumulate_usage({}, None)
+        if conversation:
+            usage.update(conversation.get_usage())
+        
         return {
             "total_messages": total_messages,
             "user_messages": user_messages,
             "assistant_messages": assistant_messages,
             "available_tools": total_tools,
-            "connected_servers": len([s for s in self.connected_servers.values() if s['status'] == 'connected'])
+            "connected_servers": len([s for s in self.connected_servers.values() if s['status'] == 'connected']),
+            "active_conversations": len(self.conversations),
+            "prompt_caching": self._prompt_cache_support(),
+            "usage": usage
         }
     
     async def test_connection(self) -> bool:
         """Test the agent connectivity"""
         try:
             # Test basic Bedrock connection without tools
-            agent = Agent(model=self.bedrock_model)
-            response = agent("Say 'Hello' and nothing else")
+            async with self._checkout_agent([]) as agent:
+                response = await agent.invoke_async("Say 'Hello' and nothing else")
             return bool(response)
         except Exception as e:
             logger.error(f"Connection test failed: {str(e)}")
@@ -0,0 +1,72 @@
+"""
+Stream Coalescer
+Batches consecutive text_delta chunks from stream_chat into fewer Socket.IO
+frames, flushing on a time window, a byte budget, or any other chunk type
+"""
+import asyncio
+import logging
+from typing import Any, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+class TextDeltaCoalescer:
+    """Merge text_delta chunks emitted within `window_ms` (or up to `max_bytes`) into one
+
+    Other chunks (tool events, message_complete, errors) flush pending text
+    first and are emitted immediately, so ordering is preserved. A window of
+    0 disables batching. Must be used from a running event loop.
+    """
+
+    def __init__(self, emit: Callable[[Dict[str, Any]], None], window_ms: float = 30.0, max_bytes: int = 4096):
+        self.emit = emit
+        self.window = max(0.0, window_ms) / 1000.0
+        self.max_bytes = max_bytes
+        self._parts: List[str] = []
+        self._bytes = 0
+        self._first: Optional[Dict[str, Any]] = None
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self.chunks_in = 0
+        self.frames_out = 0
+
+    def push(self, chunk: Dict[str, Any]):
+        """Buffer a text_delta or emit any other chunk after flushing"""
+        self.chunks_in += 1
+        if self.window <= 0 or chunk.get('type') != 'text_delta':
+            self.flush()
+            self._emit(chunk)
+            return
+
+        text = chunk.get('text') or ''
+        if self._first is None:
+            self._first = chunk
+            self._timer = asyncio.get_running_loop().call_later(self.window, self.flush)
+        self._parts.append(text)
+        self._bytes += len(text.encode('utf-8'))
+        if self._bytes >= self.max_bytes:
+            self.flush()
+
+    def flush(self):
+        """Emit buffered text as a single text_delta"""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if self._first is None:
+            return
+        batched = {**self._first, 'text': ''.join(self._parts)}
+        if len(self._parts) > 1:
+            batched['batched'] = len(self._parts)
+        self._parts, self._bytes, self._first = [], 0, None
+        self._emit(batched)
+
+    def close(self):
+        """Flush remaining text; call when the stream ends or fails"""
+        self.flush()
+        if self.chunks_in:
+            logger.debug(f"Stream coalescer sent {self.frames_out} frames for {self.chunks_in} chunks")
+
+    def _emit(self, chunk: Dict[str, Any]):
+        self.frames_out += 1
+        try:
+            self.emit(chunk)
+        except Exception as e:
+            logger.error(f"Failed to emit stream chunk: {str(e)}")
@@ -0,0 +1,92 @@
+"""
+Timeout Policy
+Resolves MCP connect, session, tool listing and tool call timeouts from the
+settings block of mcp_servers.json, with per-server and per-tool overrides
+"""
+import logging
+import threading
+from typing import Any, Dict, Optional
+
+from .mcp_settings import defaults_for
+
+logger = logging.getLogger(__name__)
+
+# Global defaults in seconds, used when the settings block doesn't set them
+# (MCP_CONNECTION_TIMEOUT / MCP_TOOL_TIMEOUT in the environment)
+TIMEOUT_SETTINGS = defaults_for('connection_timeout', 'tool_timeout', 'session_init_timeout', 'list_tools_timeout')
+
+# Extra time an outer wait allows past a request's own timeout, so the
+# session-level timeout fires first and cleans up the pending request
+TIMEOUT_GRACE = 1.0
+
+def _seconds(value: Any) -> Optional[float]:
+    """A positive number of seconds, or None for unset/invalid values"""
+    try:
+        seconds = float(value)
+    except (TypeError, ValueError):
+        return None
+    return seconds if seconds > 0 else None
+
+class TimeoutPolicy:
+    """Timeouts resolved from most to least specific
+
+    1. Per tool: a server's `tool_timeouts` map ({tool name: seconds}), then
+       the settings block's `tool_timeouts` map (tool timeouts only)
+    2. Per server: `connection_timeout`, `tool_timeout`, ... on the server record
+    3. Global: the same keys in the settings block
+    4. TIMEOUT_SETTINGS
+    """
+
+    def __init__(self, config: Optional[Dict] = None):
+        self._settings: Dict[str, Any] = {}
+        self._servers: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        if config:
+            self.configure(config)
+
+    def configure(self, config: Dict):
+        """Load settings and server overrides from an MCP config dict"""
+        with self._lock:
+            self._settings = dict(config.get('settings', {}))
+            self._servers = {
+                server_id: dict(server_config)
+                for server_id, server_config in config.get('active_servers', {}).items()
+            }
+
+    def get(self, kind: str, server_id: Optional[str] = None) -> float:
+        """Timeout in seconds for one of the TIMEOUT_SETTINGS keys"""
+        with self._lock:
+            server = self._servers.get(server_id, {}) if server_id else {}
+            for source in (server, self._settings):
+                seconds = _seconds(source.get(kind))
+                if seconds:
+                    return seconds
+        return TIMEOUT_SETTINGS[kind]
+
+    def connection(self, server_id: Optional[str] = None) -> float:
+        return self.get('connection_timeout', server_id)
+
+    def session_init(self, server_id: Optional[str] = None) -> float:
+        return self.get('session_init_timeout', server_id)
+
+    def list_tools(self, server_id: Optional[str] = None) -> float:
+        return self.get('list_tools_timeout', server_id)
+
+    def tool(self, server_id: Optional[str] = None, tool_name: Optional[str] = None) -> float:
+        """Timeout for one tool call on a server"""
+        if tool_name:
+            with self._lock:
+                server = self._servers.get(server_id, {}) if server_id else {}
+                for source in (server, self._settings):
+                    seconds = _seconds((source.get('tool_timeouts') or {}).get(tool_name))
+                    if seconds:
+                        return seconds
+        return self.get('tool_timeout', server_id)
+
+    def longest_tool_timeout(self, tool_name: Optional[str] = None, server_id: Optional[str] = None) -> float:
+        """The tool's timeout on `server_id`, or the longest across servers when it isn't known"""
+        if server_id:
+            return self.tool(server_id, tool_name)
+        with self._lock:
+            server_ids = list(self._servers)
+        return max([self.tool(None, tool_name)] + [self.tool(sid, tool_name) for sid in server_ids])
@@ -0,0 +1,63 @@
+"""
+MCP Tool Catalog
+Caches tool listings per connected server so chat turns and the tools API
+don't round-trip to every MCP server on each request
+"""
+import json
+import hashlib
+import logging
+import threading
+from datetime import datetime
+from typing import Dict, List, Optional, Any
+
+logger = logging.getLogger(__name__)
+
+class ToolCatalog:
+    """Per-server cache of list_tools results keyed by server_id and config fingerprint"""
+
+    def __init__(self):
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def fingerprint(server_config: Dict) -> str:
+        """Hash the parts of a server config that determine which tools it exposes"""
+        relevant = {
+            'command': server_config.get('command', []),
+            'args': server_config.get('args', []),
+            'env_vars': server_config.get('env_vars', {})
+        }
+        payload = json.dumps(relevant, sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()[:16]
+
+    def get(self, server_id: str, fingerprint: str) -> Optional[List[Any]]:
+        """Return cached tools, or None if missing or built from a different config"""
+        with self._lock:
+            entry = self._entries.get(server_id)
+            if entry is None or entry['fingerprint'] != fingerprint:
+                return None
+            return entry['tools']
+
+    def put(self, server_id: str, fingerprint: str, tools: List[Any]):
+        """Store the tool listing for a server"""
+        with self._lock:
+            self._entries[server_id] = {
+                'fingerprint': fingerprint,
+                'tools': list(tools),
+                'cached_at': datetime.now().isoformat()
+            }
+
+    def invalidate(self, server_id: Optional[str] = None):
+        """Drop the cached listing for one server, or for all servers"""
+        with self._lock:
+            if server_id is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(server_id, None)
+        logger.debug(f"Tool catalog invalidated for {server_id or 'all servers'}")
+
+    def fingerprint_of(self, server_id: str) -> Optional[str]:
+        """Get the config fingerprint a cached listing was built from"""
+        with self._lock:
+            entry = self._entries.get(server_id)
+            return entry['fingerprint'] if entry else None
@@ -0,0 +1,135 @@
+"""
+Bounded Tool Executor
+Runs the tool calls of one model turn concurrently, capped overall by
+max_concurrent_tools and per MCP server, and reports each call as it
+starts and finishes
+
+Built on strands-agents internals (ConcurrentToolExecutor._task,
+ToolExecutor._stream_with_trace, TypedEvent); requirements.txt pins the
+version this was written against.
+"""
+import time
+import asyncio
+import logging
+import weakref
+from contextlib import nullcontext
+from typing import Any, Dict, Optional
+
+from strands.tools.executors import ConcurrentToolExecutor
+from strands.tools.executors._executor import ToolExecutor
+from strands.types._events import TypedEvent
+
+logger = logging.getLogger(__name__)
+
+class ToolProgressEvent(TypedEvent):
+    """Stream event for one tool call starting ('tool_execution') or finishing ('tool_result')"""
+
+    def __init__(self, stage: str, payload: Dict[str, Any]):
+        super().__init__({'tool_progress': {'stage': stage, **payload}})
+
+class _Slots:
+    """Semaphores for one event loop: a global cap and one per server"""
+
+    def __init__(self, max_concurrent: int):
+        self.total = asyncio.Semaphore(max_concurrent)
+        self.servers: Dict[str, asyncio.Semaphore] = {}
+
+class BoundedToolExecutor(ConcurrentToolExecutor):
+    """ConcurrentToolExecutor with global and per-server concurrency limits
+
+    Results keep the order of the model's toolUse blocks. A call waits for
+    its server's slot before taking a global one, so a saturated server
+    doesn't hold back calls to other servers. Strands tools only count
+    against the global cap.
+    """
+
+    def __init__(self, max_concurrent: int = 5, per_server: int = 2, server_limits: Optional[Dict[str, int]] = None):
+        super().__init__()
+        self._slots: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, _Slots]" = weakref.WeakKeyDictionary()
+        self.configure(max_concurrent, per_server, server_limits)
+
+    def configure(self, max_concurrent: int = 5, per_server: int = 2, server_limits: Optional[Dict[str, int]] = None):
+        """Apply new limits; calls already holding a slot finish under the old ones"""
+        self.max_concurrent = max(1, int(max_concurrent))
+        self.per_server = max(1, int(per_server))
+        self.server_limits = {sid: max(1, int(limit)) for sid, limit in (server_limits or {}).items()}
+        self._slots = weakref.WeakKeyDictionary()
+
+    def _slots_for_loop(self) -> _Slots:
+        loop = asyncio.get_running_loop()
+        slots = self._slots.get(loop)
+        if slots is None:
+            slots = self._slots[loop] = _Slots(self.max_concurrent)
+        return slots
+
+    def _server_semaphore(self, slots: _Slots, server_id: str) -> Optional[asyncio.Semaphore]:
+        if server_id == 'strands':
+            return None
+        semaphore = slots.servers.get(server_id)
+        if semaphore is None:
+            semaphore = slots.servers[server_id] = asyncio.Semaphore(self.server_limits.get(server_id, self.per_server))
+        return semaphore
+
+    @staticmethod
+    def _mcp_client(agent: Any, tool_use: Dict[str, Any]) -> Optional[Any]:
+        """The MCP client behind a tool, or None for Strands tools"""
+        tool = agent.tool_registry.registry.get(tool_use.get('name'))
+        return getattr(tool, 'mcp_client', None)
+
+    async def _task(
+        self,
+        agent,
+        tool_use,
+        tool_results,
+        cycle_trace,
+        cycle_span,
+        invocation_state,
+        task_id,
+        task_queue,
+        task_event,
+        stop_event,
+        structured_output_context=None
+    ) -> None:
+        """Same contract as ConcurrentToolExecutor._task, run inside the call's slots"""
+        async def publish(event: TypedEvent):
+            task_queue.put_nowait((task_id, event))
+            await task_event.wait()
+            task_event.clear()
+
+        mcp_client = self._mcp_client(agent, tool_use)
+        server_id = 'strands' if mcp_client is None else getattr(mcp_client, 'server_id', None) or 'unknown'
+        info = {
+            'tool_id': tool_use.get('toolUseId', ''),
+            'tool_name': tool_use.get('name', 'unknown'),
+            'server_id': server_id,
+            'index': task_id
+        }
+        try:
+            slots = self._slots_for_loop()
+            server_slot = self._server_semaphore(slots, server_id)
+            queued = time.perf_counter()
+            async with server_slot or nullcontext(), slots.total:
+                started = time.perf_counter()
+                await publish(ToolProgressEvent('tool_execution', {
+                    **info, 'input': tool_use.get('input', {}), 'wait_ms': round((started - queued) * 1000, 2)
+                }))
+                events = ToolExecutor._stream_with_trace(
+                    agent, tool_use, tool_results, cycle_trace, cycle_span, invocation_state, structured_output_context
+                )
+                async for event in events:
+                    await publish(event)
+                finished = time.perf_counter()
+            # Report the result after releasing the slots so a slow stream consumer doesn't hold them
+            result = tool_results[-1] if tool_results else {}
+            consume_cache_hit = getattr(mcp_client, 'consume_cache_hit', None)
+            await publish(ToolProgressEvent('tool_result', {
+                **info,
+                'status': result.get('status', 'error'),
+                'content': result.get('content', []),
+                'cached': bool(consume_cache_hit and consume_cache_hit(info['tool_id'])),
+                'ms': round((finished - started) * 1000, 2)
+            }))
+        except Exception as e:
+            task_queue.put_nowait((task_id, e))
+        finally:
+            task_queue.put_nowait((task_id, stop_event))
@@ -0,0 +1,206 @@
+"""
+Tool Call History
+Fixed-capacity ring buffer of tool call records with indexes by server,
+tool and status, cursor-based paging and optional spill of evicted
+records to a JSONL file
+"""
+import json
+import atexit
+import bisect
+import logging
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+logger = logging.getLogger(__name__)
+
+class _SeqIndex:
+    """Sorted record ids for one indexed value
+
+    Ids are appended in increasing order and evicted oldest first, so
+    eviction just advances a start offset; the occasional out-of-order
+    insert (a status change) lands near the tail.
+    """
+
+    def __init__(self):
+        self._ids: List[int] = []
+        self._start = 0
+
+    def add(self, record_id: int):
+        if not self._ids or record_id > self._ids[-1]:
+            self._ids.append(record_id)
+        else:
+            bisect.insort(self._ids, record_id, lo=self._start)
+
+    def remove(self, record_id: int):
+        pos = bisect.bisect_left(self._ids, record_id, lo=self._start)
+        if pos < len(self._ids) and self._ids[pos] == record_id:
+            if pos == self._start:
+                self._start += 1
+            else:
+                del self._ids[pos]
+            self._compact()
+
+    def _compact(self):
+        if self._start > 64 and self._start * 2 > len(self._ids):
+            del self._ids[:self._start]
+            self._start = 0
+
+    def __len__(self) -> int:
+        return len(self._ids) - self._start
+
+    def iter_before(self, cursor: Optional[int]) -> Iterator[int]:
+        """Yield ids below cursor, newest first"""
+        end = len(self._ids) if cursor is None else bisect.bisect_left(self._ids, cursor, lo=self._start)
+        for pos in range(end - 1, self._start - 1, -1):
+            yield self._ids[pos]
+
+class ToolCallHistory:
+    """Bounded tool call history with indexed, cursor-paged queries"""
+
+    INDEXED_FIELDS = ('server_id', 'tool_name', 'status')
+
+    def __init__(self, capacity: int = 1000, spill_path: Optional[str] = None, spill_batch: int = 50):
+        self.capacity = max(1, int(capacity))
+        self.spill_path = Path(spill_path) if spill_path else None
+        self.spill_batch = spill_batch
+        self._records: "OrderedDict[int, Dict[str, Any]]" = OrderedDict()
+        self._indexes: Dict[str, Dict[Any, _SeqIndex]] = {field: {} for field in self.INDEXED_FIELDS}
+        self._spill_buffer: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()
+        self._next_id = 1
+        self.evicted = 0
+        if self.spill_path:
+            atexit.register(self.flush_spill)
+
+    def append(self, record: Dict[str, Any]) -> int:
+        """Store a record (kept by reference) and return its id"""
+        spill = None
+        with self._lock:
+            record_id = self._next_id
+            self._next_id += 1
+            record['id'] = record_id
+            self._records[record_id] = record
+            self._index(record_id, record)
+
+            while len(self._records) > self.capacity:
+                old_id, old_record = self._records.popitem(last=False)
+                self._unindex(old_id, old_record)
+                self.evicted += 1
+                if self.spill_path:
+                    self._spill_buffer.append(old_record)
+            if len(self._spill_buffer) >= self.spill_batch:
+                spill, self._spill_buffer = self._spill_buffer, []
+        if spill:
+            self._write_spill(spill)
+        return record_id
+
+    def update(self, record_id: int, **fields) -> Optional[Dict[str, Any]]:
+        """Update fields of a stored record, keeping the indexes in sync"""
+        with self._lock:
+            record = self._records.get(record_id)
+            if record is None:
+                return None
+            changed = [f for f in self.INDEXED_FIELDS if f in fields and fields[f] != record.get(f)]
+            for field in changed:
+                self._index_for(field, record.get(field)).remove(record_id)
+            record.update(fields)
+            for field in changed:
+                self._index_for(field, record.get(field)).add(record_id)
+            return record
+
+    def get(self, record_id: int) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            return self._records.get(record_id)
+
+    def query(
+        self,
+        server_id: Optional[str] = None,
+        tool_name: Optional[str] = None,
+        status: Optional[str] = None,
+        cursor: Optional[int] = None,
+        limit: int = 50
+    ) -> Dict[str, Any]:
+        """Page backwards through matching records
+
+        Returns up to `limit` records older than `cursor` in chronological order,
+        plus `next_cursor` for the following (older) page or None at the end.
+        """
+        filters = {f: v for f, v in (('server_id', server_id), ('tool_name', tool_name), ('status', status)) if v is not None}
+        limit = max(1, int(limit))
+        with self._lock:
+            if filters:
+                # Walk the smallest matching index and check the remaining filters per record
+                indexes = [self._indexes[field].get(value) for field, value in filters.items()]
+                if any(index is None for index in indexes):
+                    return {'history': [], 'next_cursor': None}
+                candidates = min(indexes, key=len).iter_before(cursor)
+            else:
+                candidates = (rid for rid in reversed(self._records) if cursor is None or rid < cursor)
+
+            page: List[Dict[str, Any]] = []
+            next_cursor = None
+            for record_id in candidates:
+                record = self._records.get(record_id)
+                if record is None or any(record.get(f) != v for f, v in filters.items()):
+                    continue
+                if len(page) == limit:
+                    next_cursor = page[-1]['id']
+                    break
+                page.append(dict(record))
+        page.reverse()
+        return {'history': page, 'next_cursor': next_cursor}
+
+    def _index_for(self, field: str, value: Any) -> _SeqIndex:
+        return self._indexes[field].setdefault(value, _SeqIndex())
+
+    def _index(self, record_id: int, record: Dict[str, Any]):
+        for field in self.INDEXED_FIELDS:
+            self._index_for(field, record.get(field)).add(record_id)
+
+    def _unindex(self, record_id: int, record: Dict[str, Any]):
+        for field in self.INDEXED_FIELDS:
+            index = self._indexes[field].get(record.get(field))
+            if index is not None:
+                index.remove(record_id)
+                if not len(index):
+                    del self._indexes[field][record.get(field)]
+
+    def _write_spill(self, records: List[Dict[str, Any]]):
+        try:
+            self.spill_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.spill_path, 'a') as f:
+                for record in records:
+                    f.write(json.dumps(record, default=str) + '\n')
+        except Exception as e:
+            logger.error(f"Failed to spill tool call history to {self.spill_path}: {str(e)}")
+
+    def flush_spill(self):
+        """Write evicted records still waiting in the spill buffer"""
+        with self._lock:
+            spill, self._spill_buffer = self._spill_buffer, []
+        if spill:
+            self._write_spill(spill)
+
+    @property
+    def total_calls(self) -> int:
+        """Number of calls recorded since startup, including evicted ones"""
+        return self._next_id - 1
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        with self._lock:
+            records = list(self._records.values())
+        return iter(records)
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'size': len(self._records),
+                'capacity': self.capacity,
+                'total_calls': self._next_id - 1,
+                'evicted': self.evicted
+            }
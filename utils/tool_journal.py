@@ -0,0 +1,369 @@
+"""
+Tool Call Journal
+Durable append-only JSONL log of tool calls from MCPClientManager and the
+Strands MCP clients. Records are written by a background thread so the call
+path never waits on disk; the file is rotated by size and rotated segments
+are compacted to one line per call.
+"""
+import os
+import json
+import queue
+import atexit
+import logging
+import tempfile
+import threading
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from .config_repository import replacement_mode
+from .mcp_settings import defaults_for
+
+logger = logging.getLogger(__name__)
+
+# Settings keys read by configure_from_settings and their defaults
+JOURNAL_SETTINGS = defaults_for(
+    'tool_journal_enabled', 'tool_journal_max_bytes', 'tool_journal_backups', 'tool_journal_retention_days'
+)
+
+class ToolCallJournal:
+    """Background-written, size-rotated JSONL journal of tool call snapshots
+
+    Each append is a snapshot of one call keyed by `call_id`; a call is
+    usually journaled when it starts and again when it finishes. Compaction
+    keeps only the latest snapshot per call and drops expired ones.
+    """
+
+    def __init__(
+        self,
+        path: str = "data/tool_calls.jsonl",
+        max_bytes: int = JOURNAL_SETTINGS['tool_journal_max_bytes'],
+        backups: int = JOURNAL_SETTINGS['tool_journal_backups'],
+        retention_days: float = JOURNAL_SETTINGS['tool_journal_retention_days'],
+        max_queue: int = 10000,
+        max_result_chars: int = 4000
+    ):
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self.retention_days = retention_days
+        self.max_result_chars = max_result_chars
+        self.enabled = True
+        self._queue: "queue.Queue" = queue.Queue(maxsize=max_queue)
+        self._file = None
+        self._size = 0  # Bytes in the active file
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self._segments_lock = threading.Lock()  # Held while segments are renamed or rewritten
+        self.written = 0
+        self.dropped = 0
+        self.rotations = 0
+        self.compactions = 0
+        atexit.register(self.close)
+
+    def configure_from_settings(self, settings: Dict[str, Any]):
+        """Apply the tool_journal_* keys of the MCP settings block"""
+        options = {**JOURNAL_SETTINGS, **{k: v for k, v in settings.items() if k in JOURNAL_SETTINGS}}
+        self.enabled = bool(options['tool_journal_enabled'])
+        self.max_bytes = int(options['tool_journal_max_bytes'])
+        self.backups = int(options['tool_journal_backups'])
+        self.retention_days = options['tool_journal_retention_days']
+
+    def append(self, record: Dict[str, Any]):
+        """Queue a call snapshot for writing; never blocks the caller"""
+        if not self.enabled:
+            return
+        entry = dict(record)
+        if 'result' in entry:
+            entry['result'] = self._truncate(entry['result'])
+        entry.setdefault('journaled_at', datetime.now().isoformat())
+        self._ensure_writer()
+        try:
+            self._queue.put_nowait(('record', entry))
+        except queue.Full:
+            self.dropped += 1
+            if self.dropped == 1 or self.dropped % 1000 == 0:
+                logger.warning(f"Tool call journal queue full, dropped {self.dropped} records")
+
+    def _truncate(self, result: Any) -> Any:
+        text = result if isinstance(result, str) else json.dumps(result, default=str)
+        if len(text) <= self.max_result_chars:
+            return result
+        return text[:self.max_result_chars] + f"... [{len(text) - self.max_result_chars} chars truncated]"
+
+    def flush(self, timeout: float = 5.0) -> bool:
+        """Wait until everything queued so far is on disk"""
+        return self._request('flush', timeout)
+
+    def compact(self, timeout: float = 30.0) -> bool:
+        """Compact every segment, including the active file"""
+        return self._request('compact', timeout)
+
+    def _request(self, command: str, timeout: float) -> bool:
+        if self._thread is None:
+            if command != 'compact':
+                return True
+            self._ensure_writer()
+        done = threading.Event()
+        try:
+            self._queue.put((command, done), timeout=timeout)
+        except queue.Full:
+            return False
+        return done.wait(timeout)
+
+    def close(self):
+        """Drain the queue and stop the writer thread"""
+        thread = self._thread
+        if thread is None:
+            return
+        self._queue.put(('stop', None))
+        thread.join(timeout=5.0)
+
+    # Writer thread
+
+    def _ensure_writer(self):
+        if self._thread is not None:
+            return
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="mcp-tool-journal", daemon=True)
+                self._thread.start()
+
+    def _run(self):
+        while True:
+            batch = [self._queue.get()]
+            # Drain whatever else is queued so one fsync covers the whole batch
+            while len(batch) < 500:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            records = [item for kind, item in batch if kind == 'record']
+            if records:
+                self._write(records)
+            for kind, item in batch:
+                if kind == 'compact':
+                    self._compact_all()
+                if kind in ('flush', 'compact'):
+                    item.set()
+                elif kind == 'stop':
+                    self._close_file()
+                    with self._lock:
+                        self._thread = None
+                    return
+
+    def _open(self):
+        if self._file is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._file = open(self.path, 'ab')
+            self._size = self._file.tell()
+        return self._file
+
+    def _close_file(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def _write(self, records: List[Dict[str, Any]]):
+        try:
+            f = self._open()
+            for record in records:
+                line = (json.dumps(record, default=str) + '\n').encode('utf-8')
+                f.write(line)
+                self._size += len(line)
+                self.written += 1
+                # Rotate between records so a large batch can't overshoot max_bytes
+                if self._size >= self.max_bytes:
+                    self._sync(f)
+                    self._rotate()
+                    f = self._open()
+            self._sync(f)
+        except Exception as e:
+            logger.error(f"Failed to write tool call journal {self.path}: {str(e)}")
+
+    @staticmethod
+    def _sync(f):
+        f.flush()
+        os.fsync(f.fileno())
+
+    def _segment(self, index: int) -> Path:
+        return self.path if index == 0 else self.path.with_name(f"{self.path.name}.{index}")
+
+    def _rotate(self):
+        """Shift path -> path.1 -> ... -> path.N, dropping the oldest, then compact path.1"""
+        self._close_file()
+        with self._segments_lock:
+            if self.backups <= 0:
+                self.path.unlink(missing_ok=True)
+            else:
+                self._segment(self.backups).unlink(missing_ok=True)
+                for index in range(self.backups - 1, -1, -1):
+                    if self._segment(index).exists():
+                        os.replace(self._segment(index), self._segment(index + 1))
+                self._compact_segment(self._segment(1))
+        self.rotations += 1
+        logger.info(f"Rotated tool call journal {self.path}")
+
+    def _compact_all(self):
+        self._close_file()
+        with self._segments_lock:
+            for index in range(self.backups + 1):
+                segment = self._segment(index)
+                if segment.exists():
+                    self._compact_segment(segment)
+
+    def _compact_segment(self, segment: Path):
+        """Rewrite a segment with the latest snapshot per call, minus expired calls"""
+        cutoff = None
+        if self.retention_days:
+            cutoff = (datetime.now() - timedelta(days=self.retention_days)).isoformat()
+        try:
+            latest: Dict[str, Dict[str, Any]] = {}
+            for record in self._read_segment(segment):
+                latest.pop(record.get('call_id'), None)
+                latest[record.get('call_id')] = record
+            kept = [r for r in latest.values() if cutoff is None or r.get('timestamp', '') >= cutoff]
+
+            fd, tmp_path = tempfile.mkstemp(dir=segment.parent, prefix=f".{segment.name}.", suffix='.tmp')
+            try:
+                os.fchmod(fd, replacement_mode(segment))
+                with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                    for record in kept:
+                        f.write(json.dumps(record, default=str) + '\n')
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.replace(tmp_path, segment)
+            except BaseException:
+                Path(tmp_path).unlink(missing_ok=True)
+                raise
+            self.compactions += 1
+        except Exception as e:
+            logger.error(f"Failed to compact tool call journal segment {segment}: {str(e)}")
+
+    # Queries
+
+    @staticmethod
+    def _read_segment(segment: Path) -> Iterator[Dict[str, Any]]:
+        try:
+            with open(segment, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        yield json.loads(line)
+                    except ValueError:
+                        # A torn last line after a crash; skip it
+                        continue
+        except FileNotFoundError:
+            return
+
+    @staticmethod
+    def _read_segment_backwards(f, size: int, block_size: int = 64 * 1024) -> Iterator[Dict[str, Any]]:
+        """Yield the records in the first `size` bytes of an open segment, newest first
+
+        Reads fixed-size blocks from the end, so memory stays bounded however
+        large the segment is and a query that fills its limit stops early.
+        """
+        position, partial = size, b''
+        while position > 0:
+            length = min(block_size, position)
+            position -= length
+            f.seek(position)
+            lines = (f.read(length) + partial).split(b'\n')
+            # The first line may continue in the previous block
+            partial = lines.pop(0)
+            for line in reversed(lines):
+                if line:
+                    try:
+                        yield json.loads(line)
+                    except ValueError:
+                        continue
+        if partial:
+            try:
+                yield json.loads(partial)
+            except ValueError:
+                pass
+
+    def _open_segments(self) -> List[Tuple[Any, int]]:
+        """Open every segment, newest first, with its current size
+
+        Taken while no rotation or compaction is running, so the handles are a
+        consistent snapshot: later renames and rewrites don't affect open files,
+        and appends past the recorded size are ignored.
+        """
+        handles = []
+        with self._segments_lock:
+            for index in range(self.backups + 1):
+                try:
+                    f = open(self._segment(index), 'rb')
+                except FileNotFoundError:
+                    continue
+                handles.append((f, os.fstat(f.fileno()).st_size))
+        return handles
+
+    def query(
+        self,
+        server_id: Optional[str] = None,
+        tool_name: Optional[str] = None,
+        status: Optional[str] = None,
+        source: Optional[str] = None,
+        since: Optional[str] = None,
+        until: Optional[str] = None,
+        limit: int = 100
+    ) -> List[Dict[str, Any]]:
+        """Get the latest snapshot of matching calls, newest last
+
+        `since` and `until` are ISO timestamps compared against the call's start time.
+        """
+        self.flush()
+        filters = {k: v for k, v in (('server_id', server_id), ('tool_name', tool_name), ('status', status), ('source', source)) if v is not None}
+        seen = set()
+        matches: List[Dict[str, Any]] = []
+        handles = self._open_segments()
+        try:
+            for f, size in handles:
+                # Newest segment first, newest line first, so the first snapshot seen per call is the latest
+                for record in self._read_segment_backwards(f, size):
+                    call_id = record.get('call_id')
+                    if call_id in seen:
+                        continue
+                    seen.add(call_id)
+                    timestamp = record.get('timestamp', '')
+                    if since and timestamp < since:
+                        continue
+                    if until and timestamp > until:
+                        continue
+                    if any(record.get(k) != v for k, v in filters.items()):
+                        continue
+                    matches.append(record)
+                    if len(matches) >= limit:
+                        return matches[::-1]
+        finally:
+            for f, _ in handles:
+                f.close()
+        return matches[::-1]
+
+    def get_stats(self) -> Dict[str, Any]:
+        segments = [self._segment(i) for i in range(self.backups + 1)]
+        return {
+            'path': str(self.path),
+            'enabled': self.enabled,
+            'queued': self._queue.qsize(),
+            'written': self.written,
+            'dropped': self.dropped,
+            'rotations': self.rotations,
+            'compactions': self.compactions,
+            'segments': sum(1 for s in segments if s.exists()),
+            'bytes': sum(s.stat().st_size for s in segments if s.exists())
+        }
+
+# One journal per file
+_journals: Dict[str, ToolCallJournal] = {}
+_journals_lock = threading.Lock()
+
+def get_tool_journal(path: str = "data/tool_calls.jsonl") -> ToolCallJournal:
+    """Get or create the shared journal for a file"""
+    key = os.path.abspath(path)
+    with _journals_lock:
+        if key not in _journals:
+            _journals[key] = ToolCallJournal(path)
+        return _journals[key]
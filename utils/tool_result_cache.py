@@ -0,0 +1,136 @@
+"""
+Tool Result Cache
+TTL + LRU cache of MCP tool results for read-only tools, keyed by server,
+tool and canonicalized arguments
+"""
+import copy
+import json
+import time
+import logging
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+from .mcp_settings import defaults_for
+
+logger = logging.getLogger(__name__)
+
+CACHE_SETTINGS = defaults_for('tool_cache_enabled', 'tool_cache_size', 'tool_cache_ttl', 'tool_cache_read_only_hint')
+
+class ToolResultCache:
+    """Successful tool results reused for identical calls until they expire
+
+    Tools opt in per server with `cache_tools` in the server record, either
+    a list of tool names (default TTL) or a {tool name: ttl seconds} map
+    where 0 turns caching off for that tool. With tool_cache_read_only_hint,
+    tools whose MCP annotations carry readOnlyHint are cached as well.
+    """
+
+    def __init__(self, max_entries: int = 256, ttl: float = 300.0):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.enabled = True
+        self.trust_read_only_hint = True
+        self._tools: Dict[str, Dict[str, float]] = {}  # server_id -> {tool: ttl}
+        self._entries: "OrderedDict[Tuple[str, str, str], Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def configure(self, config: Dict):
+        """Load cache settings and per-server opt-ins from an MCP config dict"""
+        settings = {**CACHE_SETTINGS, **config.get('settings', {})}
+        tools: Dict[str, Dict[str, float]] = {}
+        for server_id, server_config in config.get('active_servers', {}).items():
+            cache_tools = server_config.get('cache_tools') or {}
+            if isinstance(cache_tools, list):
+                cache_tools = {name: None for name in cache_tools}
+            tools[server_id] = cache_tools
+        with self._lock:
+            self.enabled = bool(settings['tool_cache_enabled'])
+            self.max_entries = max(0, int(settings['tool_cache_size']))
+            self.ttl = float(settings['tool_cache_ttl'])
+            self.trust_read_only_hint = bool(settings['tool_cache_read_only_hint'])
+            self._tools = tools
+            self._evict_locked()
+        if not self.enabled:
+            self.clear()
+
+    def ttl_for(self, server_id: str, tool_name: str, read_only: bool = False) -> Optional[float]:
+        """Seconds to keep a tool's results, or None if the tool isn't cached"""
+        if not self.enabled or not self.max_entries:
+            return None
+        configured = self._tools.get(server_id, {})
+        if tool_name in configured:
+            ttl = configured[tool_name]
+            ttl = self.ttl if ttl is None else float(ttl)
+        elif read_only and self.trust_read_only_hint:
+            ttl = self.ttl
+        else:
+            return None
+        return ttl if ttl > 0 else None
+
+    @staticmethod
+    def make_key(server_id: str, tool_name: str, arguments: Optional[Dict[str, Any]]) -> Tuple[str, str, str]:
+        """Key with arguments canonicalized (sorted keys, compact separators)"""
+        return (server_id or '', tool_name, json.dumps(arguments or {}, sort_keys=True, separators=(',', ':'), default=str))
+
+    def get(self, key: Tuple[str, str, str]) -> Optional[Dict[str, Any]]:
+        """A copy of the cached result, or None on a miss or expiry"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            expires, result = entry
+            if expires <= time.monotonic():
+                del self._entries[key]
+                self.expirations += 1
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+        return copy.deepcopy(result)
+
+    def put(self, key: Tuple[str, str, str], result: Dict[str, Any], ttl: float):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, copy.deepcopy(result))
+            self._entries.move_to_end(key)
+            self._evict_locked()
+
+    def _evict_locked(self):
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def invalidate(self, server_id: Optional[str] = None, tool_name: Optional[str] = None) -> int:
+        """Drop cached results for a server (and tool), returning how many were removed"""
+        with self._lock:
+            keys = [
+                key for key in self._entries
+                if (server_id is None or key[0] == server_id) and (tool_name is None or key[1] == tool_name)
+            ]
+            for key in keys:
+                del self._entries[key]
+        return len(keys)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'enabled': self.enabled,
+                'entries': len(self._entries),
+                'max_entries': self.max_entries,
+                'ttl': self.ttl,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0,
+                'evictions': self.evictions,
+                'expirations': self.expirations
+            }
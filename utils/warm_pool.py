@@ -0,0 +1,167 @@
+"""
+Warm MCP Client Pool
+Keeps pre-started stdio MCP clients ready for servers flagged `warm: true`
+so that connect and reconnect hand over an initialized session instead of
+waiting on a uvx/npx cold start
+"""
+import time
+import logging
+import threading
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from .tool_catalog import ToolCatalog
+
+logger = logging.getLogger(__name__)
+
+class WarmClientPool:
+    """Per-server pools of started MCP clients, replenished in background threads
+
+    `spawn(server_id, server_config)` must return a started client and its
+    tool listing; `stop(client)` closes a client that is no longer needed.
+    """
+
+    def __init__(
+        self,
+        spawn: Callable[[str, Dict], Tuple[Any, List[Any]]],
+        stop: Callable[[Any], None]
+    ):
+        self._spawn = spawn
+        self._stop = stop
+        self._pools: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        self._closed = False
+        self.handed_over = 0
+        self.cold_misses = 0
+
+    def configure(self, server_id: str, server_config: Dict, size: int = 1):
+        """Set the config and target size for a server's pool and start filling it"""
+        fingerprint = ToolCatalog.fingerprint(server_config)
+        stale = []
+        with self._lock:
+            if self._closed:
+                return
+            pool = self._pools.setdefault(server_id, {'idle': [], 'filling': False})
+            if pool.get('fingerprint') != fingerprint:
+                # Clients started from an older config must not be handed out
+                stale, pool['idle'] = pool['idle'], []
+            pool.update(config=dict(server_config), fingerprint=fingerprint, size=max(0, int(size)))
+            while len(pool['idle']) > pool['size']:
+                stale.append(pool['idle'].pop(0))
+        self._stop_entries(stale)
+        self.replenish(server_id)
+
+    def acquire(self, server_id: str, server_config: Dict) -> Optional[Tuple[Any, List[Any]]]:
+        """Take a ready client built from this config, or None if none is available"""
+        fingerprint = ToolCatalog.fingerprint(server_config)
+        entry, dead = None, []
+        with self._lock:
+            pool = self._pools.get(server_id)
+            if pool is not None and pool['fingerprint'] == fingerprint:
+                while pool['idle']:
+                    candidate = pool['idle'].pop(0)
+                    if self._is_alive(candidate['client']):
+                        entry = candidate
+                        break
+                    dead.append(candidate)
+            if entry is None:
+                self.cold_misses += 1
+            else:
+                self.handed_over += 1
+        self._stop_entries(dead)
+
+        if pool is not None:
+            self.replenish(server_id)
+        if entry is None:
+            return None
+        logger.info(f"Handed over warm client for {server_id}")
+        return entry['client'], entry['tools']
+
+    def replenish(self, server_id: str):
+        """Top the server's pool back up to its target size in a background thread"""
+        with self._lock:
+            pool = self._pools.get(server_id)
+            if self._closed or pool is None or pool['filling'] or len(pool['idle']) >= pool['size']:
+                return
+            pool['filling'] = True
+        threading.Thread(
+            target=self._fill, args=(server_id, pool), name=f"mcp-warm-{server_id}", daemon=True
+        ).start()
+
+    def _fill(self, server_id: str, pool: Dict[str, Any]):
+        try:
+            while True:
+                with self._lock:
+                    if self._closed or self._pools.get(server_id) is not pool or len(pool['idle']) >= pool['size']:
+                        return
+                    config, fingerprint = pool['config'], pool['fingerprint']
+
+                started = time.monotonic()
+                try:
+                    client, tools = self._spawn(server_id, config)
+                except Exception as e:
+                    # Don't retry a failing server in a tight loop; the next acquire tries again
+                    logger.warning(f"Failed to pre-start warm client for {server_id}: {str(e)}")
+                    return
+
+                with self._lock:
+                    keep = (
+                        not self._closed
+                        and self._pools.get(server_id) is pool
+                        and pool['fingerprint'] == fingerprint
+                        and len(pool['idle']) < pool['size']
+                    )
+                    if keep:
+                        pool['idle'].append({'client': client, 'tools': tools, 'started_at': time.time()})
+                if not keep:
+                    self._stop_entries([{'client': client}])
+                    return
+                logger.info(f"Warm client ready for {server_id} in {time.monotonic() - started:.2f}s")
+        finally:
+            with self._lock:
+                pool['filling'] = False
+
+    def remove(self, server_id: str):
+        """Drop a server's pool and stop its idle clients"""
+        with self._lock:
+            pool = self._pools.pop(server_id, None)
+        if pool is not None:
+            self._stop_entries(pool['idle'])
+
+    def server_ids(self) -> List[str]:
+        with self._lock:
+            return list(self._pools.keys())
+
+    def shutdown(self):
+        """Stop all idle clients and refuse further replenishment"""
+        with self._lock:
+            self._closed = True
+            pools, self._pools = self._pools, {}
+        for pool in pools.values():
+            self._stop_entries(pool['idle'])
+
+    @staticmethod
+    def _is_alive(client: Any) -> bool:
+        """Whether a pooled client's session is still usable"""
+        if getattr(client, 'connection_failed', False):
+            return False
+        thread = getattr(client, '_background_thread', None)
+        return thread is None or thread.is_alive()
+
+    def _stop_entries(self, entries: List[Dict[str, Any]]):
+        for entry in entries:
+            try:
+                self._stop(entry['client'])
+            except Exception as e:
+                logger.warning(f"Error stopping warm client: {str(e)}")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get idle counts per server and hand-over statistics"""
+        with self._lock:
+            return {
+                'servers': {
+                    server_id: {'idle': len(pool['idle']), 'size': pool['size'], 'filling': pool['filling']}
+                    for server_id, pool in self._pools.items()
+                },
+                'handed_over': self.handed_over,
+                'cold_misses': self.cold_misses
+            }